@@ -66,7 +66,7 @@ class AnalyzerAgent(BaseAgent):
 
         try:
             current_section = None
-            for line in response.split('\n'):
+            for line in self.iter_lines(response):
                 line = line.strip()
                 if not line:
                     continue
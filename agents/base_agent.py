@@ -1,18 +1,45 @@
-import subprocess
+import contextlib
+import contextvars
 import logging
-import os
+import time
+from .cache import get_llm_cache, llm_cache_key
+from .metrics import record_llm_request
+from .ollama_client import OllamaError, get_default_client
+from .scheduler import get_scheduler
+
+_line_listener = contextvars.ContextVar("line_listener", default=None)
+
+
+@contextlib.contextmanager
+def stream_lines_to(listener):
+    """
+    Within this block, agents stream their LLM responses and call listener(agent, line, lines)
+    for every completed line as it arrives.
+    :param listener: Callable receiving the agent, one line of model output, and the list of
+        lines received so far for the same request (a new list for every request)
+    """
+    token = _line_listener.set(listener)
+    try:
+        yield
+    finally:
+        _line_listener.reset(token)
+
 
 class BaseAgent:
     """
     Base class for AI agents in the recruiter agency app.
     Provides shared functionality such as logging and interaction with Ollama (Llama3).
     """
+    # Set to False on an agent (or subclass) to always query the model.
+    use_cache = True
+
     def __init__(self, name):
         """
         Initialize the agent with a name and set up logging.
         :param name: Name of the agent (e.g., 'ExtractorAgent')
         """
         self.name = name
+        self._client = None
         self.logger = self._setup_logger()
 
     def _setup_logger(self):
@@ -22,9 +49,12 @@ class BaseAgent:
         """
         logger = logging.getLogger(self.name)
         logger.setLevel(logging.DEBUG)
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter('[%(name)s] %(levelname)s: %(message)s'))
-        logger.addHandler(handler)
+        # Loggers are process-wide; only the first agent with this name attaches a handler,
+        # otherwise every new instance would print each message once more.
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('[%(name)s] %(levelname)s: %(message)s'))
+            logger.addHandler(handler)
         return logger
 
     def log(self, message, level="info"):
@@ -49,33 +79,185 @@ class BaseAgent:
         """
         self.logger.error(f"An error occurred: {error}")
 
-    def ollama_request(self, prompt):
+    def log_generation_stats(self, stats):
+        """
+        Log prompt prefill statistics reported by the server for a finished generation.
+        A prompt whose prefix was reused from the previous request shows far fewer evaluated tokens.
+        :param stats: Final /api/generate response or stream chunk
+        """
+        duration = stats.get("prompt_eval_duration")
+        if duration is not None:
+            self.log(
+                f"Prefill: {stats.get('prompt_eval_count', 0)} prompt tokens in {duration / 1e6:.1f} ms",
+                "debug"
+            )
+
+    def record_request(self, start, prompt, system, response=None, stats=None, cache_hit=False, failed=False):
+        """
+        Add one finished LLM request to the pipeline metrics (see agents/metrics.py).
+        :param start: time.perf_counter() when the request began
+        :param stats: Final /api/generate response or stream chunk, when the server answered
+        """
+        record_llm_request(
+            self.name,
+            time.perf_counter() - start,
+            len(prompt) + len(system or ""),
+            len(response or ""),
+            stats,
+            cache_hit=cache_hit,
+            failed=failed,
+        )
+
+    @property
+    def client(self):
+        """
+        LLM client used by this agent. Defaults to the shared pooled Ollama client.
+        """
+        return self._client if self._client is not None else get_default_client()
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    def cache_lookups(self):
+        """
+        Whether cached results may be served instead of asking the model. Not while the client
+        records a cassette (agents/cassette.py), which must see every request; results are
+        still stored, as with LLM_CACHE_BYPASS.
+        """
+        return not getattr(self.client, "recording", False)
+
+    @staticmethod
+    def iter_lines(response):
+        """
+        Lines of a model response, which is either the full text or an iterable of lines
+        (such as ollama_request_stream) consumed as they arrive.
+        """
+        return response.split('\n') if isinstance(response, str) else response
+
+    def ollama_request(self, prompt, options=None, format=None, system=None):
         """
         Send a prompt to the Ollama Llama3 model and return the response.
+        Responses are served from the shared LLM cache when the same model, prompt
+        and options were seen before; other requests wait for a slot from the LLM
+        scheduler. Inside stream_lines_to(), the response is streamed and each line is
+        passed to the listener before the full text is returned.
         :param prompt: The prompt to be processed by the Ollama model
+        :param options: Optional Ollama generation options
+        :param format: Optional output format constraint, e.g. 'json'
+        :param system: Optional system prompt; keep it identical across calls so the server can
+            reuse its evaluated prefix
         :return: Response from Ollama
         """
-        try:
-            env = os.environ.copy()
-            env["PYTHONIOENCODING"] = "utf-8"
-            
-            process = subprocess.Popen(
-                ['ollama', 'run', 'llama3', prompt],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=env,
-                text=True,
-                encoding='utf-8'
-            )
-            
-            stdout, stderr = process.communicate()
-            
-            if process.returncode != 0:
-                self.handle_error(f"Ollama error: {stderr}")
+        listener = _line_listener.get()
+        if listener is not None:
+            lines = []
+            try:
+                for line in self._stream_response(prompt, options, format, system):
+                    lines.append(line)
+                    listener(self, line, lines)
+            except OllamaError as e:
+                self.handle_error(f"Ollama error: {str(e)}")
                 return None
-            
-            return stdout
-            
+            except Exception as e:
+                self.handle_error(f"Error while calling Ollama Llama3: {str(e)}")
+                return None
+            return "\n".join(lines) if lines else None
+
+        start = time.perf_counter()
+        try:
+            client = self.client
+            cache = get_llm_cache() if self.use_cache else None
+            cache_key = None
+            if cache is not None:
+                cache_key = llm_cache_key(
+                    getattr(client, "model", None), prompt, options, format=format, system=system
+                )
+                cached = cache.get(cache_key) if self.cache_lookups() else None
+                if cached is not None:
+                    self.log("LLM cache hit", "debug")
+                    self.record_request(start, prompt, system, cached, cache_hit=True)
+                    return cached
+
+            with get_scheduler().slot(self.name):
+                result = client.generate(prompt, options=options, format=format, system=system)
+            self.log_generation_stats(result)
+            response = result.get("response")
+            self.record_request(start, prompt, system, response, result)
+            if cache is not None and response:
+                cache.set(cache_key, response)
+            return response
+
+        except OllamaError as e:
+            self.record_request(start, prompt, system, failed=True)
+            self.handle_error(f"Ollama error: {str(e)}")
+            return None
         except Exception as e:
+            self.record_request(start, prompt, system, failed=True)
             self.handle_error(f"Error while calling Ollama Llama3: {str(e)}")
             return None
+
+    def ollama_request_stream(self, prompt, options=None, format=None, system=None):
+        """
+        Stream the response to a prompt line by line as the model generates it.
+        Cached responses are replayed instantly; complete streamed responses are cached.
+        Errors are logged and end the stream early.
+        :param prompt: The prompt to be processed by the Ollama model
+        :param options: Optional Ollama generation options
+        :param format: Optional output format constraint, e.g. 'json'
+        :param system: Optional system prompt; keep it identical across calls so the server can
+            reuse its evaluated prefix
+        :return: Generator of response lines
+        """
+        try:
+            yield from self._stream_response(prompt, options, format, system)
+        except OllamaError as e:
+            self.handle_error(f"Ollama error: {str(e)}")
+        except Exception as e:
+            self.handle_error(f"Error while calling Ollama Llama3: {str(e)}")
+
+    def _stream_response(self, prompt, options=None, format=None, system=None):
+        """
+        Generator behind ollama_request_stream. A failed request is recorded in the metrics
+        and its exception raised to the consumer, so a truncated response is never taken
+        for a complete one.
+        """
+        start = time.perf_counter()
+        try:
+            client = self.client
+            cache = get_llm_cache() if self.use_cache else None
+            cache_key = None
+            if cache is not None:
+                cache_key = llm_cache_key(
+                    getattr(client, "model", None), prompt, options, format=format, system=system
+                )
+                cached = cache.get(cache_key) if self.cache_lookups() else None
+                if cached is not None:
+                    self.log("LLM cache hit", "debug")
+                    self.record_request(start, prompt, system, cached, cache_hit=True)
+                    yield from cached.split('\n')
+                    return
+
+            parts = []
+            pending = ""
+            # The slot is held until the stream ends or its consumer abandons it.
+            with get_scheduler().slot(self.name):
+                for chunk in client.generate_stream(prompt, options=options, format=format, system=system):
+                    if chunk.get("done"):
+                        self.log_generation_stats(chunk)
+                        self.record_request(start, prompt, system, "".join(parts) + chunk.get("response", ""), chunk)
+                    piece = chunk.get("response", "")
+                    parts.append(piece)
+                    pending += piece
+                    *complete, pending = pending.split('\n')
+                    yield from complete
+            if pending:
+                yield pending
+
+            response = "".join(parts)
+            if cache is not None and response:
+                cache.set(cache_key, response)
+
+        except Exception:
+            self.record_request(start, prompt, system, failed=True)
+            raise
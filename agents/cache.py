@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+
+class SQLiteDatabase:
+    """
+    SQLite file shared by the threads of a process. The connection is opened in WAL mode
+    and reopened in forked worker processes; subclasses create their tables in create_schema().
+    """
+    def __init__(self, path):
+        """
+        Open (and create if needed) the database file.
+        :param path: SQLite database path; parent directories are created
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._db()
+
+    def _db(self):
+        """
+        Return the SQLite connection, reopening it in forked worker processes.
+        """
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self.create_schema(conn)
+            conn.commit()
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def create_schema(self, conn):
+        """
+        Create the tables and indexes the file needs; called for every new connection.
+        """
+
+
+class SQLiteCache(SQLiteDatabase):
+    """
+    Small key/value cache stored in a local SQLite file.
+    Entries are evicted least-recently-used once the cache exceeds max_entries,
+    and expire after ttl seconds when a TTL is configured.
+    """
+    def __init__(self, path, table="cache", max_entries=10000, ttl=None, bypass=False):
+        """
+        Open (and create if needed) the cache file.
+        :param path: SQLite database path; parent directories are created
+        :param table: Table name, so several caches can share one file
+        :param max_entries: Maximum number of entries kept before LRU eviction (None for unbounded)
+        :param ttl: Seconds after which an entry expires (None to keep entries forever)
+        :param bypass: When True, lookups always miss but fresh values are still stored
+        """
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        super().__init__(path)
+
+    def create_schema(self, conn):
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed_idx ON {self.table} (accessed_at)")
+
+    def get(self, key):
+        """
+        Look up a value, refreshing its LRU position on a hit.
+        :param key: Cache key
+        :return: Stored value, or None on a miss
+        """
+        if self.bypass:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                db.commit()
+                self.misses += 1
+                return None
+            db.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Store a value and evict the least recently used entries beyond max_entries.
+        :param key: Cache key
+        :param value: Text value to store
+        """
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.max_entries is not None:
+                count = db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+                if count > self.max_entries:
+                    excess = count - self.max_entries
+                    db.execute(
+                        f"DELETE FROM {self.table} WHERE key IN "
+                        f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                        (excess,),
+                    )
+                    self.evictions += excess
+            db.commit()
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            db = self._db()
+            db.execute(f"DELETE FROM {self.table}")
+            db.commit()
+
+    def stats(self):
+        """
+        Return hit/miss counters and the current number of entries.
+        """
+        with self._lock:
+            size = self._db().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": size,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def llm_cache_key(model, prompt, options=None, **fields):
+    """
+    Content-addressed key for an LLM generation.
+    :param model: Model name
+    :param prompt: Prompt text
+    :param options: Generation options that affect the output
+    :param fields: Other request fields that affect the output (format, system, ...); unset ones are ignored
+    :return: Hex SHA-256 digest
+    """
+    key = {"model": model, "prompt": prompt, "options": options or {}}
+    key.update({name: value for name, value in fields.items() if value})
+    payload = json.dumps(key, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_directory(cache_dir, source, version, build, load):
+    """
+    Load what was saved to cache_dir for a version of a source, building and saving it on
+    first use. It is saved under a private name and renamed, so concurrent builders never see
+    a partial directory, and directories saved for other versions of the same source are removed.
+    :param cache_dir: Root directory for saved objects
+    :param source: Identifier of what is saved, e.g. a digest of a file path; None keeps every version
+    :param version: Version of the source's contents
+    :param build: Callable returning an object with a save(directory) method; only called on a miss
+    :param load: Callable reading a saved directory back
+    :return: Loaded or freshly built object
+    """
+    name = f"{source}-{version}" if source else version
+    directory = os.path.join(cache_dir, name)
+    if os.path.exists(os.path.join(directory, "meta.json")):
+        return load(directory)
+    built = build()
+    staging = f"{directory}.tmp{os.getpid()}"
+    built.save(staging)
+    try:
+        os.rename(staging, directory)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+    if source:
+        for entry in os.listdir(cache_dir):
+            if entry.startswith(f"{source}-") and entry != name and ".tmp" not in entry:
+                shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+    return built
+
+
+def _env_flag(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _cache_from_env(prefix, default_path, table):
+    """
+    Return a process-wide SQLiteCache configured from <prefix>_PATH, <prefix>_MAX_ENTRIES,
+    <prefix>_TTL and <prefix>_BYPASS environment variables.
+    :return: SQLiteCache instance, or None when <prefix>_PATH is set to an empty string
+    """
+    if prefix not in _caches:
+        with _caches_lock:
+            if prefix not in _caches:
+                path = os.environ.get(f"{prefix}_PATH", default_path)
+                ttl = os.environ.get(f"{prefix}_TTL")
+                _caches[prefix] = SQLiteCache(
+                    path,
+                    table=table,
+                    max_entries=int(os.environ.get(f"{prefix}_MAX_ENTRIES", 10000)),
+                    ttl=float(ttl) if ttl else None,
+                    bypass=_env_flag(f"{prefix}_BYPASS"),
+                ) if path else None
+    return _caches[prefix]
+
+
+def get_llm_cache():
+    """
+    Return the process-wide LLM response cache configured from the environment.
+    LLM_CACHE_PATH (default .cache/llm_responses.sqlite3; empty disables the cache),
+    LLM_CACHE_MAX_ENTRIES (default 10000), LLM_CACHE_TTL (seconds, default none)
+    and LLM_CACHE_BYPASS (skip lookups but keep storing responses).
+    :return: SQLiteCache instance, or None when caching is disabled
+    """
+    return _cache_from_env("LLM_CACHE", os.path.join(".cache", "llm_responses.sqlite3"), "llm_responses")
+
+
+def get_extraction_cache():
+    """
+    Return the process-wide cache of structured resume extractions, configured like the
+    LLM cache through EXTRACTION_CACHE_PATH (default .cache/extractions.sqlite3),
+    EXTRACTION_CACHE_MAX_ENTRIES, EXTRACTION_CACHE_TTL and EXTRACTION_CACHE_BYPASS.
+    :return: SQLiteCache instance, or None when caching is disabled
+    """
+    return _cache_from_env("EXTRACTION_CACHE", os.path.join(".cache", "extractions.sqlite3"), "extractions")
+
+
+def set_cache(prefix, cache):
+    """
+    Replace a process-wide cache, e.g. set_cache("LLM_CACHE", None) after changing the environment.
+    :param prefix: Environment prefix of the cache ('LLM_CACHE' or 'EXTRACTION_CACHE')
+    :param cache: SQLiteCache instance, or None to rebuild it from the environment on next use
+    :return: The previously installed cache
+    """
+    with _caches_lock:
+        previous = _caches.pop(prefix, None)
+        if cache is not None:
+            _caches[prefix] = cache
+    return previous
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import mmap
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from .cache import cached_directory
+from .job_index import normalize_skill, tokenize
+
+
+def candidate_from_result(result, candidate_id=None):
+    """
+    Flatten a pipeline result into the candidate profile used for reverse matching.
+    :param result: Orchestrator output with 'extracted_data' and 'analysis_results'
+    :param candidate_id: Identifier to report, e.g. the resume path or hash
+    :return: Candidate dictionary
+    """
+    extracted = result.get("extracted_data") or {}
+    analysis = result.get("analysis_results") or {}
+    return {
+        "id": candidate_id if candidate_id is not None else extracted.get("name"),
+        "name": extracted.get("name"),
+        "skills": extracted.get("skills", []),
+        "education": extracted.get("education", []),
+        "experience": extracted.get("experience", []),
+        "strengths": analysis.get("strengths", []),
+        "confidence_score": analysis.get("confidence_score", 0.0),
+    }
+
+
+def load_candidates(paths):
+    """
+    Read processed candidates from JSON lines files, either batch_screen.py records
+    (only successful ones are kept) or bare Orchestrator results.
+    :param paths: Iterable of file paths
+    :return: List of candidate dictionaries
+    """
+    candidates = []
+    for path in paths:
+        with open(path) as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "status" in record:
+                    if record["status"] != "ok":
+                        continue
+                    candidates.append(candidate_from_result(record["result"], record.get("resume")))
+                else:
+                    candidates.append(candidate_from_result(record, f"{path}:{line_number}"))
+    return candidates
+
+
+def candidates_from_store(store):
+    """
+    Read every processed candidate from a ProfileStore, identified by resume hash.
+    :return: List of candidate dictionaries
+    """
+    return [candidate_from_result(result, resume_hash) for resume_hash, result in store.iter_results()]
+
+
+class SavedCandidates:
+    """
+    Read-only list of the candidates saved with a pool, one JSON line each.
+    Only the line offsets are read on load; the file is memory-mapped and a candidate is
+    parsed when it is accessed, so ranking a large pool decodes just the returned top K.
+    """
+    def __init__(self, path, offsets):
+        """
+        :param path: JSON lines file written by CandidatePool.save
+        :param offsets: int64 array of len(candidates) + 1 byte offsets into the file
+        """
+        self.path = path
+        self.offsets = offsets
+        self._data = None
+        if len(self) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("candidate index out of range")
+        return json.loads(self._data[int(self.offsets[index]):int(self.offsets[index + 1])])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class CandidatePool:
+    """
+    Precomputed skill and term index over processed candidates, for ranking the pool
+    against one job. A query touches only the posting lists of the job's skills and terms
+    and scores every candidate at once with NumPy, so it stays fast on large pools.
+
+    The score mirrors the deterministic screener: skills match (exact skill credit 1,
+    token-subset partial credit 0.5, see scoring.skill_overlap) combined with the share of
+    the job's title, description and skill terms found in the candidate's experience,
+    skills and strengths (see scoring.term_relevance).
+    """
+    SKILL_WEIGHT = 0.7
+    TERM_WEIGHT = 0.3
+    PARTIAL_CREDIT = 0.5
+
+    def __init__(self, candidates, skill_postings=None, term_postings=None):
+        """
+        Build the index, or wrap posting lists loaded from disk (see load).
+        :param candidates: List of candidate dictionaries (see candidate_from_result), or
+            SavedCandidates of a saved pool
+        :param skill_postings: Dictionary of normalized skill to int32 array of candidate positions
+        :param term_postings: Dictionary of profile term to int32 array of candidate positions
+        """
+        self.candidates = candidates
+        # True when the index was read from a saved pool instead of built
+        self.loaded = False
+        if skill_postings is None or term_postings is None:
+            skill_postings, term_postings = self.build_postings(candidates)
+        self.skill_postings = skill_postings
+        self.term_postings = term_postings
+        # Skill token -> skills containing it, to find partial matches without scanning every skill.
+        self.skills_by_token = defaultdict(list)
+        for skill in self.skill_postings:
+            for token in set(skill.split()):
+                self.skills_by_token[token].append(skill)
+
+    @staticmethod
+    def build_postings(candidates):
+        """
+        Index candidates by normalized skill and by profile term.
+        :return: Tuple of (skill postings, term postings)
+        """
+        skill_postings = defaultdict(list)
+        term_postings = defaultdict(list)
+        for position, candidate in enumerate(candidates):
+            skills = {normalize_skill(s) for s in candidate.get("skills", []) if s}
+            skills.discard("")
+            for skill in skills:
+                skill_postings[skill].append(position)
+            terms = set(tokenize(" ".join(
+                list(candidate.get("experience", []))
+                + list(candidate.get("skills", []))
+                + list(candidate.get("strengths", []))
+            )))
+            for skill in skills:
+                terms.update(skill.split())
+            for term in terms:
+                term_postings[term].append(position)
+
+        return (
+            {s: np.array(ids, dtype=np.int32) for s, ids in skill_postings.items()},
+            {t: np.array(ids, dtype=np.int32) for t, ids in term_postings.items()},
+        )
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def save(self, directory):
+        """
+        Persist the candidates and posting lists to a directory. Each posting table is saved
+        as one concatenated .npy array plus offsets, so loading it is a memory map rather than
+        re-reading every stored result.
+        """
+        os.makedirs(directory, exist_ok=True)
+        # Candidates go to a JSON lines sidecar indexed by byte offsets, so loading the pool
+        # does not parse every profile (see SavedCandidates).
+        offsets = [0]
+        with open(os.path.join(directory, "candidates.jsonl"), "wb") as f:
+            for candidate in self.candidates:
+                line = json.dumps(candidate).encode("utf-8") + b"\n"
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        np.save(os.path.join(directory, "candidates_offsets.npy"), np.array(offsets, dtype=np.int64))
+        meta = {}
+        for name, postings in (("skills", self.skill_postings), ("terms", self.term_postings)):
+            keys = list(postings)
+            offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(postings[key]) for key in keys])
+            ids = np.concatenate([postings[key] for key in keys]) if keys else np.zeros(0, dtype=np.int32)
+            np.save(os.path.join(directory, f"{name}_ids.npy"), ids.astype(np.int32))
+            np.save(os.path.join(directory, f"{name}_offsets.npy"), offsets)
+            meta[name] = keys
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Load a saved pool with its posting arrays memory-mapped read-only. Candidate
+        profiles are read lazily (see SavedCandidates).
+        """
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        postings = []
+        for name in ("skills", "terms"):
+            # Slices of a plain ndarray view of the map are far cheaper than memmap slices.
+            ids = np.load(os.path.join(directory, f"{name}_ids.npy"), mmap_mode="r").view(np.ndarray)
+            offsets = np.load(os.path.join(directory, f"{name}_offsets.npy")).tolist()
+            postings.append({key: ids[offsets[i]:offsets[i + 1]] for i, key in enumerate(meta[name])})
+        candidates = SavedCandidates(
+            os.path.join(directory, "candidates.jsonl"),
+            np.load(os.path.join(directory, "candidates_offsets.npy"), mmap_mode="r"),
+        )
+        pool = cls(candidates, *postings)
+        pool.loaded = True
+        return pool
+
+    @classmethod
+    def cached(cls, source, version, candidates, cache_dir=None):
+        """
+        Load the saved pool for a version of a candidate source, building and saving it on
+        first use. Pools saved for older versions of the same source are removed.
+        :param source: Identifier of the candidate source, e.g. a digest of the store path
+        :param version: Version of the source's contents
+        :param candidates: Callable returning the candidate list; only called to build the pool
+        :param cache_dir: Root directory for saved pools (CANDIDATE_POOL_DIR, default
+            .cache/candidate_pools); empty disables saving
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get("CANDIDATE_POOL_DIR", os.path.join(".cache", "candidate_pools"))
+        if not cache_dir:
+            return cls(candidates())
+        return cached_directory(cache_dir, source, version, lambda: cls(candidates()), cls.load)
+
+    @classmethod
+    def for_store(cls, store, cache_dir=None):
+        """
+        Pool of every candidate in a ProfileStore, rebuilt only after results were saved or deleted.
+        """
+        source = hashlib.sha256(os.path.abspath(store.path).encode("utf-8")).hexdigest()[:16]
+        return cls.cached(source, store.version(), lambda: candidates_from_store(store), cache_dir)
+
+    @classmethod
+    def for_files(cls, paths, cache_dir=None):
+        """
+        Pool of the candidates in JSON lines files (see load_candidates), rebuilt only when a file changes.
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        source = hashlib.sha256("\n".join(paths).encode("utf-8")).hexdigest()[:16]
+        stats = [(os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in paths]
+        version = hashlib.sha256(json.dumps(stats).encode("utf-8")).hexdigest()[:16]
+        return cls.cached(source, version, lambda: load_candidates(paths), cache_dir)
+
+    def skill_scores(self, required_skills):
+        """
+        Share of the job's required skills each candidate covers.
+        :return: float32 array with one score per candidate
+        """
+        required = {normalize_skill(s) for s in required_skills if s} - {""}
+        credit = np.zeros(len(self.candidates), dtype=np.float32)
+        if not required:
+            return credit
+        for skill in required:
+            exact = np.zeros(len(self.candidates), dtype=bool)
+            partial = np.zeros(len(self.candidates), dtype=bool)
+            if skill in self.skill_postings:
+                exact[self.skill_postings[skill]] = True
+            tokens = set(skill.split())
+            related = {s for token in tokens for s in self.skills_by_token.get(token, ())}
+            for other in related:
+                other_tokens = set(other.split())
+                if other != skill and (tokens <= other_tokens or other_tokens <= tokens):
+                    partial[self.skill_postings[other]] = True
+            credit += exact + self.PARTIAL_CREDIT * (partial & ~exact)
+        return credit / len(required)
+
+    def term_scores(self, job):
+        """
+        Share of the job's terms found in each candidate's profile; a handful of shared
+        terms already counts as fully relevant.
+        :return: float32 array with one score per candidate
+        """
+        job_terms = set(tokenize(f"{job.get('title', '')} {job.get('description', '')}"))
+        job_terms.update(t for s in job.get("required_skills", []) for t in normalize_skill(s).split())
+        hits = np.zeros(len(self.candidates), dtype=np.float32)
+        if not job_terms:
+            return hits
+        for term in job_terms:
+            if term in self.term_postings:
+                hits[self.term_postings[term]] += 1.0
+        return np.minimum(hits / min(len(job_terms), 8), 1.0)
+
+    def rank(self, job, top_k=20):
+        """
+        Rank the pool for a job.
+        :param job: Job dictionary with 'title', 'description' and 'required_skills'
+        :param top_k: Number of candidates to return
+        :return: List of (candidate, score, skills match, term relevance) tuples, best first
+        """
+        if not self.candidates:
+            return []
+        skills = self.skill_scores(job.get("required_skills", []))
+        terms = self.term_scores(job)
+        scores = self.SKILL_WEIGHT * skills + self.TERM_WEIGHT * terms
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (self.candidates[i], float(scores[i]), float(skills[i]), float(terms[i]))
+            for i in top
+        ]
@@ -0,0 +1,223 @@
+import atexit
+import collections
+import gzip
+import json
+import os
+import threading
+import time
+
+from .cache import _env_flag, llm_cache_key
+from .ollama_client import OllamaError
+
+# Server statistics kept from each generation, so replayed requests report the same prefill,
+# generation and load figures to the pipeline metrics.
+STAT_FIELDS = (
+    "load_duration", "prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration",
+)
+
+
+def _open(path, mode):
+    return gzip.open(path, mode + "t", encoding="utf-8") if path.endswith(".gz") else open(path, mode, encoding="utf-8")
+
+
+def request_key(model, prompt, options=None, format=None, system=None):
+    """
+    Cassette key of a generation: the same content hash as the LLM response cache.
+    """
+    return llm_cache_key(model, prompt, options, format=format, system=system)
+
+
+class CassetteClient:
+    """
+    LLM client wrapper that records generations to a cassette file or replays them.
+
+    In 'record' mode every generation goes to the wrapped client and one JSON line is
+    appended per request: the request key, prompt size, response, server statistics,
+    wall time, time to first chunk and start time. Prompts are stored only as their hash,
+    so a cassette recorded on real resumes holds no resume text besides the responses.
+    A '.gz' path is gzip-compressed.
+
+    In 'replay' mode responses are served from the cassette by request key, with no server.
+    A key recorded several times is replayed in recording order, wrapping around. With
+    realtime set, each replayed request takes as long as the recorded one.
+    """
+    def __init__(self, path, mode="replay", client=None, realtime=False):
+        """
+        :param path: Cassette file (.jsonl or .jsonl.gz)
+        :param mode: 'record' or 'replay'
+        :param client: Client to record from; required in record mode
+        :param realtime: In replay mode, sleep for the recorded latencies
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == "record" and client is None:
+            raise ValueError("Recording needs a client to record from")
+        self.path = path
+        self.mode = mode
+        # Agents skip their response and extraction cache lookups while recording, so that
+        # every request reaches the cassette.
+        self.recording = mode == "record"
+        self.client = client
+        self.realtime = realtime
+        self.model = getattr(client, "model", None)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._entries = {}
+        self._positions = collections.Counter()
+
+        if mode == "replay":
+            self._load()
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _load(self):
+        """
+        Index the cassette's entries by request key.
+        """
+        with _open(self.path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+                    self.model = self.model or entry.get("model")
+
+    def _write(self, entry):
+        with self._lock:
+            if self._file is None:
+                self._file = _open(self.path, "a")
+                atexit.register(self.close)
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+
+    def _record(self, key, model, prompt, system, response, stats, started_at, elapsed, first_chunk_s):
+        self._write({
+            "key": key,
+            "model": model,
+            "prompt_chars": len(prompt) + len(system or ""),
+            "response": response,
+            "stats": {field: stats[field] for field in STAT_FIELDS if field in stats},
+            "elapsed_s": round(elapsed, 6),
+            "first_chunk_s": round(first_chunk_s, 6),
+            "started_at": round(started_at, 3),
+        })
+
+    def _replay(self, key):
+        """
+        Next recorded entry for a request key.
+        :raises OllamaError: When the cassette never saw this request
+        """
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                raise OllamaError(f"Request {key[:12]} is not in cassette {self.path}")
+            self.hits += 1
+            position = self._positions[key]
+            self._positions[key] += 1
+        return entries[position % len(entries)]
+
+    def generate(self, prompt, model=None, options=None, format=None, system=None, **kwargs):
+        model = model or self.model
+        key = request_key(model, prompt, options, format, system)
+        if self.mode == "replay":
+            entry = self._replay(key)
+            if self.realtime:
+                time.sleep(entry["elapsed_s"])
+            return {"model": model, "response": entry["response"], "done": True, **entry["stats"]}
+
+        started_at = time.time()
+        start = time.perf_counter()
+        result = self.client.generate(prompt, model=model, options=options, format=format, system=system, **kwargs)
+        elapsed = time.perf_counter() - start
+        self._record(key, model, prompt, system, result.get("response", ""), result, started_at, elapsed, elapsed)
+        return result
+
+    def generate_stream(self, prompt, model=None, options=None, format=None, system=None, **kwargs):
+        model = model or self.model
+        key = request_key(model, prompt, options, format, system)
+        if self.mode == "replay":
+            yield from self._replay_stream(model, self._replay(key))
+            return
+
+        started_at = time.time()
+        start = time.perf_counter()
+        first_chunk_s = None
+        parts = []
+        for chunk in self.client.generate_stream(
+            prompt, model=model, options=options, format=format, system=system, **kwargs
+        ):
+            if first_chunk_s is None:
+                first_chunk_s = time.perf_counter() - start
+            parts.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                elapsed = time.perf_counter() - start
+                self._record(key, model, prompt, system, "".join(parts), chunk, started_at, elapsed, first_chunk_s)
+            yield chunk
+
+    def _replay_stream(self, model, entry):
+        """
+        Stream a recorded response line by line; in realtime mode the first line arrives after
+        the recorded time to first chunk and the rest are spread over the remaining time.
+        """
+        lines = entry["response"].split("\n")
+        pause = 0.0
+        if self.realtime:
+            time.sleep(entry["first_chunk_s"])
+            pause = max(entry["elapsed_s"] - entry["first_chunk_s"], 0.0) / max(len(lines), 1)
+        for i, line in enumerate(lines):
+            if i:
+                time.sleep(pause)
+            yield {"model": model, "response": line + ("\n" if i < len(lines) - 1 else ""), "done": False}
+        yield {"model": model, "response": "", "done": True, **entry["stats"]}
+
+    def preload(self, model=None):
+        if self.mode == "replay":
+            return {"model": model or self.model, "done": True, "load_duration": 0}
+        return self.client.preload(model)
+
+    def loaded_models(self):
+        if self.mode == "replay":
+            return {self.model}
+        return self.client.loaded_models()
+
+    def is_loaded(self, model=None):
+        if self.mode == "replay":
+            return True
+        return self.client.is_loaded(model)
+
+    def latency_stats(self):
+        if self.mode == "replay" or not hasattr(self.client, "latency_stats"):
+            return {}
+        return self.client.latency_stats()
+
+    def close(self):
+        """
+        Flush and close the cassette file (recording), and the wrapped client's connections.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self.client is not None and hasattr(self.client, "close"):
+            self.client.close()
+
+
+def cassette_from_env(client):
+    """
+    Wrap a client according to LLM_CASSETTE_MODE ('record' or 'replay'; unset disables it),
+    LLM_CASSETTE_PATH (default .cache/llm_cassette.jsonl.gz) and LLM_CASSETTE_REALTIME
+    (replay with the recorded latencies).
+    :param client: Client to record from, unused in replay mode
+    :return: CassetteClient, or the client unchanged when no cassette mode is set
+    """
+    mode = os.environ.get("LLM_CASSETTE_MODE", "").strip().lower()
+    if not mode:
+        return client
+    path = os.environ.get("LLM_CASSETTE_PATH", os.path.join(".cache", "llm_cassette.jsonl.gz"))
+    return CassetteClient(path, mode, client if mode == "record" else None, _env_flag("LLM_CASSETTE_REALTIME"))
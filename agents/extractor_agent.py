@@ -1,97 +1,318 @@
 from .base_agent import BaseAgent
+from .cache import get_extraction_cache
+from .metrics import propagate_context, record_pdf_parse
+import concurrent.futures
+import hashlib
+import inspect
+import io
+import json
 import pdfplumber
 import os
+import time
+
+# Rough characters-per-token ratio for English text with Llama tokenizers.
+CHARS_PER_TOKEN = 4
+
+PROMPT_TEMPLATE = (
+    "You are an expert resume parser. Extract the following information from this resume text.\n"
+    "Format your response EXACTLY as shown below:\n\n"
+    "Name: [Full Name]\n\n"
+    "Skills: [List all technical and professional skills, separated by commas]\n\n"
+    "Education:\n"
+    "- [Degree/Certificate] from [Institution], [Year]\n"
+    "- [Add more education entries if present]\n\n"
+    "Experience:\n"
+    "- [Job Title] at [Company], [Duration]\n"
+    "- [Add more experience entries if present]\n\n"
+    "Important: Ensure each section is properly formatted and includes all relevant information.\n\n"
+    "Resume text:\n{text}"
+)
+
 
 class ExtractorAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, char_budget=None, token_budget=None, chunk_size=None, chunk_overlap=None, chunk_workers=None):
+        """
+        :param char_budget: Maximum resume characters sent to the LLM (EXTRACTOR_CHAR_BUDGET, default 2000,
+            or 16000 in chunked mode)
+        :param token_budget: Alternative budget in tokens, converted at roughly 4 characters per token
+            (EXTRACTOR_TOKEN_BUDGET)
+        :param chunk_size: Enables chunked mode: text longer than this many characters is split into
+            overlapping chunks extracted concurrently and merged (EXTRACTOR_CHUNK_SIZE, default off)
+        :param chunk_overlap: Characters shared by consecutive chunks (EXTRACTOR_CHUNK_OVERLAP, default 200)
+        :param chunk_workers: Maximum chunks extracted in parallel (EXTRACTOR_CHUNK_WORKERS, default 4)
+        """
         super().__init__("ExtractorAgent")
+        self.chunk_size = int(chunk_size or os.environ.get("EXTRACTOR_CHUNK_SIZE", 0))
+        self.chunk_overlap = int(chunk_overlap or os.environ.get("EXTRACTOR_CHUNK_OVERLAP", 200))
+        self.chunk_workers = int(chunk_workers or os.environ.get("EXTRACTOR_CHUNK_WORKERS", 4))
+        token_budget = token_budget or os.environ.get("EXTRACTOR_TOKEN_BUDGET")
+        if token_budget:
+            self.char_budget = int(token_budget) * CHARS_PER_TOKEN
+        else:
+            default_budget = 16000 if self.chunk_size else 2000
+            self.char_budget = int(char_budget or os.environ.get("EXTRACTOR_CHAR_BUDGET", default_budget))
+        self._version = None
+
+    @property
+    def version(self):
+        """
+        Fingerprint of everything that shapes the extraction output: the prompt template and
+        text budget, the text and response parsing code, the pdfplumber version and the model.
+        Cached extractions are keyed by it, so editing any of them invalidates the cache.
+        """
+        if self._version is None:
+            parts = [
+                PROMPT_TEMPLATE,
+                f"{self.char_budget}:{self.chunk_size}:{self.chunk_overlap}",
+                inspect.getsource(ExtractorAgent.iter_page_text),
+                inspect.getsource(ExtractorAgent.split_chunks),
+                inspect.getsource(ExtractorAgent.merge_extractions),
+                inspect.getsource(ExtractorAgent.extract_text),
+                inspect.getsource(ExtractorAgent.build_prompt),
+                inspect.getsource(ExtractorAgent.parse_llama_response),
+                getattr(pdfplumber, "__version__", ""),
+            ]
+            self._version = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+        return f"{self._version}:{getattr(self.client, 'model', '')}"
+
+    def open_pdf(self, input_data):
+        """
+        Fingerprint a resume and open it as a binary stream for pdfplumber, without touching
+        the disk for in-memory input.
+        :param input_data: Path, bytes, bytearray, memoryview or binary file-like object
+        :return: Tuple of (SHA-256 hex digest of the PDF bytes, seekable binary stream)
+        """
+        if isinstance(input_data, (bytes, bytearray, memoryview)):
+            return hashlib.sha256(input_data).hexdigest(), io.BytesIO(input_data)
+        if hasattr(input_data, "getbuffer"):
+            # In-memory streams (io.BytesIO, Streamlit uploads) are hashed in place and read directly.
+            with input_data.getbuffer() as view:
+                digest = hashlib.sha256(view).hexdigest()
+            input_data.seek(0)
+            return digest, input_data
+        if hasattr(input_data, "read"):
+            pdf_bytes = input_data.read()
+        else:
+            with open(input_data, "rb") as f:
+                pdf_bytes = f.read()
+        return hashlib.sha256(pdf_bytes).hexdigest(), io.BytesIO(pdf_bytes)
+
+    def iter_page_text(self, pdf_source):
+        """
+        Lazily yield the text of each non-empty PDF page.
+        Pages are parsed one at a time, so a consumer that stops early never pays for the rest.
+        :param pdf_source: Path or binary file-like object
+        :return: Generator of (page number, text, seconds spent parsing the page) tuples
+        """
+        with pdfplumber.open(pdf_source) as pdf:
+            for page_number, page in enumerate(pdf.pages, start=1):
+                start = time.perf_counter()
+                page_text = page.extract_text() or ""
+                elapsed = time.perf_counter() - start
+                # Drop the page's parsed layout objects once its text is out.
+                if hasattr(page, "close"):
+                    page.close()
+                if page_text.strip():
+                    yield page_number, page_text, elapsed
+                else:
+                    self.log(f"Skipping empty page {page_number} ({elapsed * 1000:.1f} ms)", "debug")
+
+    def extract_text(self, pdf_source, char_budget=None):
+        """
+        Extract PDF text page by page until the character budget is reached.
+        :param pdf_source: Path or binary file-like object
+        :param char_budget: Maximum number of characters to keep, defaults to self.char_budget
+        :return: Document text, at most char_budget characters long
+        """
+        char_budget = char_budget or self.char_budget
+        parts = []
+        length = 0
+        pages = self.iter_page_text(pdf_source)
+        try:
+            for page_number, page_text, elapsed in pages:
+                self.log(f"Parsed page {page_number}: {len(page_text)} chars in {elapsed * 1000:.1f} ms", "debug")
+                parts.append(page_text)
+                length += len(page_text) + 1
+                if length >= char_budget:
+                    self.log(f"Character budget of {char_budget} reached after page {page_number}", "debug")
+                    break
+        finally:
+            pages.close()
+        return "\n".join(parts)[:char_budget]
+
+    def build_prompt(self, text):
+        """
+        Build the extraction prompt for a resume's text.
+        """
+        return PROMPT_TEMPLATE.format(text=text[:self.char_budget])
+
+    def split_chunks(self, text):
+        """
+        Split text into chunks of at most chunk_size characters that overlap by chunk_overlap,
+        preferring to break at line boundaries so entries are not cut in half.
+        :param text: Resume text
+        :return: List of chunks
+        """
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_size, len(text))
+            if end < len(text):
+                newline = text.rfind("\n", start + self.chunk_size // 2, end)
+                if newline != -1:
+                    end = newline
+            chunks.append(text[start:end])
+            if end >= len(text):
+                break
+            start = max(end - self.chunk_overlap, start + 1)
+        return chunks
+
+    def merge_extractions(self, results):
+        """
+        Merge per-chunk extractions: the first name found wins and list entries are
+        deduplicated case-insensitively in document order.
+        :param results: List of extraction dictionaries in chunk order
+        :return: Merged extraction dictionary
+        """
+        merged = {
+            "name": None,
+            "skills": [],
+            "education": [],
+            "experience": []
+        }
+        seen = {key: set() for key in ['skills', 'education', 'experience']}
+        for result in results:
+            if not merged['name'] and result.get('name'):
+                merged['name'] = result['name']
+            for key in ['skills', 'education', 'experience']:
+                for item in result.get(key, []):
+                    normalized = " ".join(item.lower().split())
+                    if normalized and normalized not in seen[key]:
+                        seen[key].add(normalized)
+                        merged[key].append(item)
+        return merged
+
+    def extract_chunked(self, text):
+        """
+        Map-reduce extraction: extract every chunk concurrently, then merge the results.
+        :param text: Resume text
+        :return: Merged extraction, or None when no chunk got an LLM response
+        """
+        chunks = self.split_chunks(text)
+        self.log(f"Extracting {len(chunks)} chunks with up to {self.chunk_workers} in parallel")
+
+        def extract_chunk(chunk):
+            response = self.ollama_request(self.build_prompt(chunk))
+            return self.parse_llama_response(response) if response else None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.chunk_workers) as pool:
+            results = [r for r in pool.map(propagate_context(extract_chunk), chunks) if r is not None]
+        if not results:
+            return None
+        return self.merge_extractions(results)
 
     def process(self, input_data):
         """
         Extracts relevant data from a resume PDF using Llama2.
-        :param input_data: Path to the resume PDF
+        Results are cached by the SHA-256 of the PDF bytes and the extractor version,
+        so a repeated resume skips both PDF parsing and the LLM.
+        :param input_data: Path to the resume PDF, or its content as bytes, a memoryview or a
+            binary file-like object
         :return: Extracted information as a dictionary
         """
         self.log("Starting extraction process")
-        
+
         extracted_data = {
             "name": None,
             "skills": [],
             "education": [],
             "experience": []
         }
-        
+
         try:
-            # Extract text from all pages to capture complete information
-            with pdfplumber.open(input_data) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-
-            # Create a more detailed and structured prompt
-            prompt = (
-                "You are an expert resume parser. Extract the following information from this resume text.\n"
-                "Format your response EXACTLY as shown below:\n\n"
-                "Name: [Full Name]\n\n"
-                "Skills: [List all technical and professional skills, separated by commas]\n\n"
-                "Education:\n"
-                "- [Degree/Certificate] from [Institution], [Year]\n"
-                "- [Add more education entries if present]\n\n"
-                "Experience:\n"
-                "- [Job Title] at [Company], [Duration]\n"
-                "- [Add more experience entries if present]\n\n"
-                "Important: Ensure each section is properly formatted and includes all relevant information.\n\n"
-                f"Resume text:\n{text[:2000]}"  # Increased text limit to capture more content
-            )
-
-            llama_response = self.ollama_request(prompt)
-            
-            if llama_response:
-                current_section = None
-                
-                for line in llama_response.split('\n'):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    if line.lower().startswith('name:'):
-                        extracted_data['name'] = line.split(':', 1)[1].strip()
-                    
-                    elif line.lower().startswith('skills:'):
-                        skills = line.split(':', 1)[1].strip()
-                        # Clean and deduplicate skills
-                        skills_list = [s.strip() for s in skills.split(',')]
-                        extracted_data['skills'] = list(dict.fromkeys(filter(None, skills_list)))
-                    
-                    elif line.lower().startswith('education:'):
-                        current_section = 'education'
-                        continue
-                    
-                    elif line.lower().startswith('experience:'):
-                        current_section = 'experience'
-                        continue
-                    
-                    elif line.startswith('-') and current_section:
-                        # Remove the leading dash and clean the entry
-                        entry = line[1:].strip()
-                        if entry:
-                            extracted_data[current_section].append(entry)
-                    
-                    elif current_section and line:
-                        # Handle entries without dashes
-                        if not any(line.lower().startswith(x) for x in ['name:', 'skills:', 'education:', 'experience:']):
-                            extracted_data[current_section].append(line)
-
-            # Clean up the extracted data
-            for key in ['skills', 'education', 'experience']:
-                # Remove duplicates and empty entries
-                extracted_data[key] = list(dict.fromkeys(filter(None, extracted_data[key])))
-                # Clean up any remaining formatting issues
-                extracted_data[key] = [item.strip(' -•') for item in extracted_data[key]]
+            digest, pdf_stream = self.open_pdf(input_data)
+
+            cache = get_extraction_cache() if self.use_cache else None
+            cache_key = f"{digest}:{self.version}"
+            if cache is not None and self.cache_lookups():
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    self.log("Extraction cache hit")
+                    return json.loads(cached)
+
+            # Parse pages lazily until the text budget is filled
+            parse_start = time.perf_counter()
+            text = self.extract_text(pdf_stream)
+            record_pdf_parse(time.perf_counter() - parse_start)
+
+            if self.chunk_size and len(text) > self.chunk_size:
+                result = self.extract_chunked(text)
+            else:
+                llama_response = self.ollama_request(self.build_prompt(text))
+                result = self.parse_llama_response(llama_response) if llama_response else None
+
+            if result is not None:
+                extracted_data = result
+                if cache is not None:
+                    cache.set(cache_key, json.dumps(extracted_data))
 
             self.log(f"Extraction completed: {extracted_data}")
             return extracted_data
-                
+
         except Exception as e:
             self.log(f"Error during extraction: {str(e)}", "error")
-            return extracted_data
\ No newline at end of file
+            return extracted_data
+
+    def parse_llama_response(self, response):
+        """
+        Parse the response from Llama into structured resume data.
+        """
+        extracted_data = {
+            "name": None,
+            "skills": [],
+            "education": [],
+            "experience": []
+        }
+        current_section = None
+
+        for line in self.iter_lines(response):
+            line = line.strip()
+            if not line:
+                continue
+
+            if line.lower().startswith('name:'):
+                extracted_data['name'] = line.split(':', 1)[1].strip()
+
+            elif line.lower().startswith('skills:'):
+                skills = line.split(':', 1)[1].strip()
+                # Clean and deduplicate skills
+                skills_list = [s.strip() for s in skills.split(',')]
+                extracted_data['skills'] = list(dict.fromkeys(filter(None, skills_list)))
+
+            elif line.lower().startswith('education:'):
+                current_section = 'education'
+                continue
+
+            elif line.lower().startswith('experience:'):
+                current_section = 'experience'
+                continue
+
+            elif line.startswith('-') and current_section:
+                # Remove the leading dash and clean the entry
+                entry = line[1:].strip()
+                if entry:
+                    extracted_data[current_section].append(entry)
+
+            elif current_section and line:
+                # Handle entries without dashes
+                if not any(line.lower().startswith(x) for x in ['name:', 'skills:', 'education:', 'experience:']):
+                    extracted_data[current_section].append(line)
+
+        # Clean up the extracted data
+        for key in ['skills', 'education', 'experience']:
+            # Remove duplicates and empty entries
+            extracted_data[key] = list(dict.fromkeys(filter(None, extracted_data[key])))
+            # Clean up any remaining formatting issues
+            extracted_data[key] = [item.strip(' -•') for item in extracted_data[key]]
+
+        return extracted_data
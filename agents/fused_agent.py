@@ -0,0 +1,135 @@
+import json
+from .base_agent import BaseAgent
+
+# Expected type of every field in the fused output, per section.
+FUSED_SCHEMA = {
+    "analysis_results": {
+        "strengths": list,
+        "weaknesses": list,
+        "suggestions": list,
+        "confidence_score": float,
+    },
+    "screening_results": {
+        "qualification_alignment_score": float,
+        "experience_relevance_score": float,
+        "skills_match_score": float,
+        "potential_red_flags_score": float,
+    },
+    "recommendations": {
+        "recommendation_summary": str,
+        "top_matched_job": str,
+        "additional_notes": str,
+    },
+}
+
+
+def validate_section(section, data):
+    """
+    Validate and normalize one section of the fused output against FUSED_SCHEMA.
+    Scores must be numbers between 0 and 1, lists must hold strings and text must be non-empty.
+    :param section: Section name, e.g. 'screening_results'
+    :param data: Parsed section value
+    :return: Normalized section dictionary, or None when it does not match the schema
+    """
+    if not isinstance(data, dict):
+        return None
+    normalized = {}
+    for field, expected in FUSED_SCHEMA[section].items():
+        value = data.get(field)
+        if expected is float:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0.0 <= value <= 1.0:
+                return None
+            normalized[field] = float(value)
+        elif expected is list:
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                return None
+            normalized[field] = [item.strip() for item in value if item.strip()]
+        else:
+            if not isinstance(value, str) or not value.strip():
+                return None
+            normalized[field] = value.strip()
+    return normalized
+
+
+class FusedAgent(BaseAgent):
+    """
+    Produces analysis, screening and recommendation in a single structured generation,
+    replacing three separate AnalyzerAgent / ScreenerAgent / RecommenderAgent calls.
+    """
+    def __init__(self):
+        super().__init__("FusedAgent")
+
+    def process(self, extracted_data, matched_jobs):
+        """
+        Analyze, screen and recommend in one LLM call.
+        :param extracted_data: Dictionary containing extracted resume details.
+        :param matched_jobs: List of matched jobs from MatcherAgent.
+        :return: Dictionary keyed by section name; sections that failed validation are None.
+        """
+        self.log("Starting fused analysis, screening and recommendation")
+
+        prompt = (
+            "You are an AI recruiter. Analyze the candidate, score them against their job matches and give a "
+            "final recommendation. Respond with a single JSON object with exactly this structure:\n"
+            "{\n"
+            '  "analysis": {"strengths": [3 key strengths], "weaknesses": [2 areas for improvement], '
+            '"suggestions": [2 career development suggestions], "confidence_score": profile completeness 0.0-1.0},\n'
+            '  "screening": {"qualification_alignment_score": 0.0-1.0, "experience_relevance_score": 0.0-1.0, '
+            '"skills_match_score": 0.0-1.0, "potential_red_flags_score": 0.0-1.0},\n'
+            '  "recommendation": {"recommendation_summary": "2-3 sentences on fit for the matched roles", '
+            '"top_matched_job": "exact title of the most suitable job", "additional_notes": "observations"}\n'
+            "}\n\n"
+            f"Candidate Profile:\n"
+            f"- Name: {extracted_data.get('name', 'N/A')}\n"
+            f"- Skills: {', '.join(extracted_data.get('skills', []))}\n"
+            f"- Education: {'; '.join(extracted_data.get('education', []))}\n"
+            f"- Experience: {'; '.join(extracted_data.get('experience', []))}\n\n"
+            "Matched Jobs:\n"
+            + "\n".join(
+                f"- {job.get('title', 'Unknown')} ({job.get('confidence_score', 0.0)}): {job.get('reasoning', 'N/A')}"
+                for job in matched_jobs
+            )
+        )
+
+        try:
+            llama_response = self.ollama_request(prompt, format="json")
+
+            if llama_response:
+                return self.parse_llama_response(llama_response)
+            else:
+                self.log("No response from Llama", "error")
+                return self.default_response()
+
+        except Exception as e:
+            self.log(f"Fused processing error: {str(e)}", "error")
+            return self.default_response()
+
+    def parse_llama_response(self, response):
+        """
+        Parse and validate the fused JSON output.
+        :param response: Raw response text from Llama, or an iterable of its lines
+        :return: Dictionary keyed by section name; invalid or missing sections are None
+        """
+        text = "\n".join(self.iter_lines(response))
+        start, end = text.find("{"), text.rfind("}")
+        try:
+            data = json.loads(text[start:end + 1]) if start != -1 else {}
+        except ValueError as e:
+            self.log(f"Fused response is not valid JSON: {str(e)}", "error")
+            data = {}
+
+        sections = {
+            "analysis_results": validate_section("analysis_results", data.get("analysis")),
+            "screening_results": validate_section("screening_results", data.get("screening")),
+            "recommendations": validate_section("recommendations", data.get("recommendation")),
+        }
+        invalid = [name for name, value in sections.items() if value is None]
+        if invalid:
+            self.log(f"Fused sections failed validation: {', '.join(invalid)}", "error")
+        return sections
+
+    def default_response(self):
+        """
+        Return a response with every section invalid, so callers fall back to per-agent calls.
+        """
+        return {section: None for section in FUSED_SCHEMA}
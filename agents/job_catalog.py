@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+
+from .job_index import normalize_skill
+
+
+def render_job(job):
+    """
+    Prompt text describing one job, without its position in the list.
+    """
+    return (
+        f"Title: {job['title']}\n"
+        f"Description: {job['description']}\n"
+        f"Required Skills: {', '.join(job.get('required_skills', []))}\n"
+    )
+
+
+def job_version(job):
+    """
+    Content hash of one job, used to tell which jobs changed between catalog versions.
+    """
+    return hashlib.sha256(json.dumps(job, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class JobCatalog:
+    """
+    A job list file loaded once and reloaded only when its content changes.
+    The file is checked by mtime and size on every refresh and re-read only when those
+    change; the content hash is the catalog version, so touching a file without editing it
+    keeps the same version and the same job list object.
+
+    Both a JSON array (.json) and JSON Lines (.jsonl, one job per line) are supported.
+    JSON Lines files are streamed line by line, so a large catalog is never held in memory
+    as raw text next to its parsed jobs.
+    """
+    def __init__(self, path):
+        """
+        Load the catalog.
+        :param path: Path to a .json or .jsonl job list
+        """
+        self.path = path
+        # (jobs, normalized required skills per job, version), published as one tuple so a
+        # reader never sees the jobs of one version with the skills or version of another
+        self.snapshot = ([], [], None)
+        # (id(job) -> position, rendered prompt fragments), replaced together on reload
+        self._compiled = ({}, [])
+        self._job_versions = None
+        self._stat = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    @property
+    def jobs(self):
+        return self.snapshot[0]
+
+    @property
+    def skills(self):
+        return self.snapshot[1]
+
+    @property
+    def version(self):
+        return self.snapshot[2]
+
+    def refresh(self):
+        """
+        Reload the file if it changed since the last check.
+        :return: True when a new version was loaded
+        """
+        stat = os.stat(self.path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key == self._stat:
+                return False
+            digest, jobs = self._read()
+            self._stat = key
+            if digest == self.version:
+                return False
+            self._compile(jobs, digest)
+            self._job_versions = None
+            return True
+
+    def _read(self):
+        """
+        Parse the file and hash its content in the same pass.
+        :return: Tuple of (version digest, list of jobs)
+        """
+        digest = hashlib.sha256()
+        if self.path.endswith(".jsonl"):
+            jobs = []
+            with open(self.path, "rb") as f:
+                for line in f:
+                    digest.update(line)
+                    if line.strip():
+                        jobs.append(json.loads(line))
+        else:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            digest.update(data)
+            jobs = json.loads(data)
+        return digest.hexdigest()[:16], jobs
+
+    def _compile(self, jobs, version):
+        """
+        Precompute what every request needs from the jobs. Skill strings are interned, so
+        a skill listed by thousands of jobs is stored once.
+        """
+        skills = []
+        # The same few thousand skills repeat across jobs; normalize each distinct one once.
+        normalized_names = {}
+        for job in jobs:
+            required = [sys.intern(s) for s in job.get("required_skills", []) if isinstance(s, str)]
+            if "required_skills" in job:
+                job["required_skills"] = required
+            normalized = set()
+            for skill in required:
+                name = normalized_names.get(skill)
+                if name is None:
+                    name = normalized_names[skill] = sys.intern(normalize_skill(skill))
+                if name:
+                    normalized.add(name)
+            skills.append(frozenset(normalized))
+        # Swap everything at once; readers holding the previous snapshot keep a consistent view.
+        self._compiled = ({id(job): position for position, job in enumerate(jobs)}, [None] * len(jobs))
+        self.snapshot = (jobs, skills, version)
+
+    def job_versions(self, snapshot=None):
+        """
+        Version of every job keyed by title, computed once per catalog version.
+        :param snapshot: Catalog snapshot to describe; the current one by default
+        :return: Dictionary of job title to job_version()
+        """
+        jobs, _, version = snapshot or self.snapshot
+        versions = self._job_versions
+        if versions is None or versions[0] != version:
+            versions = self._job_versions = (version, {job.get("title"): job_version(job) for job in jobs})
+        return versions[1]
+
+    def position(self, job):
+        """
+        Position of a job in the catalog, or None when it is not part of this version.
+        """
+        return self._compiled[0].get(id(job))
+
+    def fragment(self, job):
+        """
+        Prompt text for a job. Fragments are rendered on first use and kept until the
+        catalog changes; jobs outside the catalog are rendered every time.
+        """
+        positions, fragments = self._compiled
+        position = positions.get(id(job))
+        if position is None:
+            return render_job(job)
+        if fragments[position] is None:
+            fragments[position] = render_job(job)
+        return fragments[position]
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_job_catalog(path):
+    """
+    Return the process-wide catalog for a job list file, refreshed if the file changed.
+    :param path: Path to a .json or .jsonl job list
+    :return: JobCatalog instance
+    """
+    key = os.path.abspath(path)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _catalogs[key] = JobCatalog(path)
+            return catalog
+    catalog.refresh()
+    return catalog
@@ -0,0 +1,134 @@
+import heapq
+import math
+import re
+from collections import defaultdict
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or our such that the their this "
+    "to using we with will you your experience required plus like work build strong knowledge ability "
+    "skills years including across other".split()
+)
+
+
+def normalize_skill(skill):
+    """
+    Normalize a skill name for exact matching ('  Machine-Learning ' -> 'machine learning').
+    """
+    return " ".join(_TOKEN_RE.findall(skill.lower().replace("-", " ").replace("/", " "))).strip(".")
+
+
+def tokenize(text):
+    """
+    Split free text into lower-case terms, dropping stopwords and very short tokens.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.rstrip(".")
+        if len(token) > 1 and token not in STOPWORDS:
+            terms.append(token)
+    return terms
+
+
+def profile_terms(profile):
+    """
+    Collect normalized skills and free-text terms from a candidate profile.
+    :param profile: Dictionary with extracted data and optionally analysis results
+    :return: Tuple of (set of normalized skills, set of terms)
+    """
+    skills = {normalize_skill(s) for s in profile.get("skills", []) if s}
+    skills.discard("")
+    text = " ".join(
+        list(profile.get("skills", []))
+        + list(profile.get("experience", []))
+        + list(profile.get("strengths", []))
+    )
+    terms = set(tokenize(text))
+    for skill in skills:
+        terms.update(skill.split())
+    return skills, terms
+
+
+class JobIndex:
+    """
+    Inverted index from normalized required skills and description terms to job IDs.
+    Used to shortlist the jobs worth sending to the LLM matcher. Job IDs are the job's
+    'id' field when present, otherwise its position in the catalog.
+    """
+    # Relative weight of an exact required-skill hit versus a shared description term.
+    SKILL_WEIGHT = 3.0
+    TERM_WEIGHT = 1.0
+    # Description terms found in more than this share of jobs carry almost no signal
+    # and are dropped, which keeps posting lists short on large catalogs.
+    MAX_TERM_DF = 0.25
+
+    def __init__(self, jobs, skills=None):
+        """
+        Build the index.
+        :param jobs: List of job dictionaries with 'title', 'description' and 'required_skills'
+        :param skills: Already normalized required skills per job, in job order (see JobCatalog)
+        """
+        self.jobs = {}
+        skill_postings = defaultdict(list)
+        term_postings = defaultdict(list)
+
+        for position, job in enumerate(jobs):
+            job_id = job.get("id", position)
+            self.jobs[job_id] = job
+            if skills is not None:
+                job_skills = skills[position]
+            else:
+                job_skills = {normalize_skill(s) for s in job.get("required_skills", []) if s}
+                job_skills.discard("")
+            for skill in job_skills:
+                skill_postings[skill].append(job_id)
+            terms = set(tokenize(f"{job.get('title', '')} {job.get('description', '')}"))
+            for skill in job_skills:
+                terms.update(skill.split())
+            for term in terms:
+                term_postings[term].append(job_id)
+
+        total = max(len(self.jobs), 1)
+        self.skill_postings = dict(skill_postings)
+        max_df = max(1, int(self.MAX_TERM_DF * total))
+        self.term_postings = {t: ids for t, ids in term_postings.items() if len(ids) <= max_df or total < 100}
+        self.skill_idf = {s: math.log(1 + total / len(ids)) for s, ids in self.skill_postings.items()}
+        self.term_idf = {t: math.log(1 + total / len(ids)) for t, ids in self.term_postings.items()}
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def score(self, profile):
+        """
+        Score every job that shares at least one skill or term with the profile.
+        :param profile: Candidate profile dictionary
+        :return: Dictionary of job ID to relevance score
+        """
+        skills, terms = profile_terms(profile)
+        scores = defaultdict(float)
+        for skill in skills:
+            weight = self.SKILL_WEIGHT * self.skill_idf.get(skill, 0.0)
+            for job_id in self.skill_postings.get(skill, ()):
+                scores[job_id] += weight
+        for term in terms:
+            weight = self.TERM_WEIGHT * self.term_idf.get(term, 0.0)
+            for job_id in self.term_postings.get(term, ()):
+                scores[job_id] += weight
+        return scores
+
+    def shortlist(self, profile, top_k=20):
+        """
+        Return the top-K jobs for a candidate profile.
+        :param profile: Candidate profile dictionary
+        :param top_k: Number of jobs to return
+        :return: List of (job_id, score) tuples, best first
+        """
+        scores = self.score(profile)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+    def shortlist_jobs(self, profile, top_k=20):
+        """
+        Same as shortlist but returns the job dictionaries.
+        """
+        return [self.jobs[job_id] for job_id, _ in self.shortlist(profile, top_k)]
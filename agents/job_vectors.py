@@ -0,0 +1,197 @@
+import hashlib
+import json
+import math
+import os
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from .cache import cached_directory
+from .job_index import tokenize
+
+
+def catalog_fingerprint(jobs):
+    """
+    Stable fingerprint of a job catalog, used to name persisted vector stores.
+    """
+    digest = hashlib.sha256()
+    for job in jobs:
+        digest.update(json.dumps(job, sort_keys=True).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()[:16]
+
+
+def profile_text(profile):
+    """
+    Text used to embed a candidate: skills, experience and analysis strengths.
+    """
+    return " ".join(
+        list(profile.get("skills", []))
+        + list(profile.get("experience", []))
+        + list(profile.get("strengths", []))
+    )
+
+
+def job_text(job):
+    """
+    Text used to embed a job: its title and description.
+    """
+    return f"{job.get('title', '')} {job.get('description', '')}"
+
+
+class HashedEmbedder:
+    """
+    Offline hashed embedding. Every term (and adjacent-term bigram) maps to a fixed
+    pseudo-random +/-1 vector seeded by its CRC32, and a text is the TF-IDF weighted
+    sum of its term vectors, L2-normalized. This is a random projection of the sparse
+    TF-IDF vector, so cosine similarity is approximately preserved at a small dimension.
+    """
+    def __init__(self, dim=256, idf=None, default_idf=None):
+        """
+        :param dim: Embedding dimension
+        :param idf: Dictionary of term to inverse document frequency
+        :param default_idf: IDF used for terms not seen in the catalog
+        """
+        self.dim = dim
+        self.idf = idf or {}
+        self.default_idf = default_idf if default_idf is not None else (max(self.idf.values()) if self.idf else 1.0)
+        self._term_vectors = {}
+
+    @staticmethod
+    def terms(text):
+        """
+        Unigrams plus adjacent bigrams of a text.
+        """
+        tokens = tokenize(text)
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def term_vector(self, term):
+        vector = self._term_vectors.get(term)
+        if vector is None:
+            rng = np.random.default_rng(zlib.crc32(term.encode("utf-8")))
+            vector = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=self.dim)
+            self._term_vectors[term] = vector
+        return vector
+
+    def embed(self, text):
+        """
+        Embed one text.
+        :return: float32 vector of length dim with unit norm (or all zeros for empty text)
+        """
+        counts = Counter(self.terms(text))
+        if not counts:
+            return np.zeros(self.dim, dtype=np.float32)
+        weights = np.array(
+            [(1.0 + math.log(count)) * self.idf.get(term, self.default_idf) for term, count in counts.items()],
+            dtype=np.float32,
+        )
+        vector = weights @ np.stack([self.term_vector(term) for term in counts])
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @classmethod
+    def fit(cls, texts, dim=256):
+        """
+        Learn IDF weights from a corpus.
+        """
+        document_frequency = Counter()
+        for text in texts:
+            document_frequency.update(set(cls.terms(text)))
+        total = max(len(texts), 1)
+        idf = {term: math.log((1 + total) / (1 + df)) + 1.0 for term, df in document_frequency.items()}
+        return cls(dim=dim, idf=idf, default_idf=math.log(1 + total) + 1.0)
+
+
+class JobVectorStore:
+    """
+    Precomputed job embedding matrix for semantic top-K retrieval.
+    The matrix is saved as a .npy file and memory-mapped on load, so large catalogs
+    are shared through the page cache instead of being copied into every process.
+    """
+    def __init__(self, matrix, job_ids, embedder):
+        """
+        :param matrix: (n_jobs, dim) float32 array of unit-norm job embeddings
+        :param job_ids: Job ID for each matrix row
+        :param embedder: HashedEmbedder used for queries
+        """
+        self.matrix = matrix
+        self.job_ids = job_ids
+        self.embedder = embedder
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    @classmethod
+    def build(cls, jobs, dim=256):
+        """
+        Embed every job in a catalog.
+        :param jobs: List of job dictionaries
+        :param dim: Embedding dimension
+        """
+        texts = [job_text(job) for job in jobs]
+        embedder = HashedEmbedder.fit(texts, dim=dim)
+        matrix = np.empty((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = embedder.embed(text)
+        job_ids = [job.get("id", position) for position, job in enumerate(jobs)]
+        return cls(matrix, job_ids, embedder)
+
+    def save(self, directory):
+        """
+        Persist the matrix and query metadata to a directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "matrix.npy"), np.ascontiguousarray(self.matrix))
+        meta = {
+            "dim": self.embedder.dim,
+            "idf": self.embedder.idf,
+            "default_idf": self.embedder.default_idf,
+            "job_ids": self.job_ids,
+        }
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Load a persisted store with the matrix memory-mapped read-only.
+        """
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        matrix = np.load(os.path.join(directory, "matrix.npy"), mmap_mode="r")
+        embedder = HashedEmbedder(dim=meta["dim"], idf=meta["idf"], default_idf=meta["default_idf"])
+        return cls(matrix, meta["job_ids"], embedder)
+
+    @classmethod
+    def for_catalog(cls, jobs, cache_dir=None, dim=256, fingerprint=None, source=None):
+        """
+        Load the store for a catalog from cache_dir, building and saving it on first use.
+        :param jobs: List of job dictionaries
+        :param cache_dir: Root directory for persisted stores (JOB_VECTORS_DIR, default .cache/job_vectors)
+        :param fingerprint: Known catalog version (e.g. JobCatalog.version); computed from jobs when omitted
+        :param source: Where the catalog comes from, e.g. its file path; stores saved for older
+            versions of the same source are removed
+        """
+        cache_dir = cache_dir or os.environ.get("JOB_VECTORS_DIR", os.path.join(".cache", "job_vectors"))
+        source = hashlib.sha256(os.path.abspath(source).encode("utf-8")).hexdigest()[:16] if source else None
+        return cached_directory(
+            cache_dir, source, f"{fingerprint or catalog_fingerprint(jobs)}-{dim}",
+            lambda: cls.build(jobs, dim=dim), cls.load,
+        )
+
+    def search(self, profile, top_k=20):
+        """
+        Rank jobs by cosine similarity to a candidate profile with one matrix-vector product.
+        :param profile: Candidate profile dictionary
+        :param top_k: Number of jobs to return
+        :return: List of (job_id, similarity) tuples, best first
+        """
+        if not len(self.job_ids):
+            return []
+        query = self.embedder.embed(profile_text(profile))
+        scores = self.matrix @ query
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.job_ids[i], float(scores[i])) for i in top]
@@ -1,40 +1,206 @@
 from .base_agent import BaseAgent
-import json
+from .job_catalog import get_job_catalog, render_job
+from .job_index import JobIndex
+from .metrics import propagate_context, record_retry
+import concurrent.futures
+import heapq
 import os
+import re
 import subprocess
+import threading
 
 class MatcherAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, shortlist_size=None, retrieval=None, prompt_layout=None, batch_size=None,
+                 max_in_flight=None, top_k=None, retries=None):
+        """
+        :param shortlist_size: Maximum number of jobs sent to the LLM; larger catalogs are
+            shortlisted first (MATCHER_SHORTLIST_SIZE, default 20)
+        :param retrieval: How the shortlist is built: 'skills' for the inverted skill index or
+            'semantic' for NumPy similarity search over job embeddings (MATCHER_RETRIEVAL, default 'skills')
+        :param prompt_layout: 'catalog_first' sends the job catalog as a stable system prompt ahead of the
+            candidate; 'candidate_first' keeps the original single prompt with the candidate first
+            (MATCHER_PROMPT_LAYOUT, default 'catalog_first')
+        :param batch_size: Enables batched mode: jobs are split into batches of this size, scored by
+            concurrent LLM calls and merged (MATCHER_BATCH_SIZE, default off)
+        :param max_in_flight: Maximum concurrent batch requests (MATCHER_MAX_IN_FLIGHT, default 4)
+        :param top_k: Number of matches kept in batched mode (MATCHER_TOP_K, default all)
+        :param retries: Rounds of re-requesting jobs a batch response left out (MATCHER_RETRIES, default 1)
+        """
         super().__init__("MatcherAgent")
+        self.shortlist_size = int(shortlist_size or os.environ.get("MATCHER_SHORTLIST_SIZE", 20))
+        self.retrieval = retrieval or os.environ.get("MATCHER_RETRIEVAL", "skills")
+        self.prompt_layout = prompt_layout or os.environ.get("MATCHER_PROMPT_LAYOUT", "catalog_first")
+        self.batch_size = int(batch_size or os.environ.get("MATCHER_BATCH_SIZE", 0))
+        self.max_in_flight = int(max_in_flight or os.environ.get("MATCHER_MAX_IN_FLIGHT", 4))
+        self.top_k = int(top_k or os.environ.get("MATCHER_TOP_K", 0))
+        self.retries = int(retries if retries is not None else os.environ.get("MATCHER_RETRIES", 1))
+        # Per-catalog caches, each a tuple keyed by the job list it was built for. Sessions
+        # share the agent, so rebuilds are serialised and readers take each tuple only once.
+        self._cache_lock = threading.Lock()
+        self._job_index = None
+        self._job_vectors = None
+        self._jobs_by_id = None
+        self.catalog = None
+        self._catalog_block = None
+
+    def _catalog_snapshot(self, job_list):
+        """
+        The loaded catalog's (jobs, skills, version) snapshot, read once, or None when
+        job_list is not the catalog's current job list.
+        """
+        catalog = self.catalog
+        snapshot = catalog.snapshot if catalog is not None else None
+        return snapshot if snapshot is not None and snapshot[0] is job_list else None
+
+    def get_job_index(self, job_list):
+        """
+        Return the inverted index for a job list, rebuilding it only when the list changes.
+        :param job_list: List of job descriptions
+        :return: JobIndex instance
+        """
+        cached = self._job_index
+        if cached is None or cached[0] is not job_list:
+            with self._cache_lock:
+                cached = self._job_index
+                if cached is None or cached[0] is not job_list:
+                    snapshot = self._catalog_snapshot(job_list)
+                    skills = snapshot[1] if snapshot is not None else None
+                    cached = self._job_index = (job_list, JobIndex(job_list, skills))
+        return cached[1]
+
+    def get_job_vectors(self, job_list):
+        """
+        Return the memory-mapped embedding store for a job list, loading it only when the list changes.
+        :param job_list: List of job descriptions
+        :return: JobVectorStore instance
+        """
+        cached = self._job_vectors
+        if cached is None or cached[0] is not job_list:
+            # NumPy is only needed for semantic retrieval.
+            from .job_vectors import JobVectorStore
+            with self._cache_lock:
+                cached = self._job_vectors
+                if cached is None or cached[0] is not job_list:
+                    catalog = self.catalog
+                    snapshot = catalog.snapshot if catalog is not None else None
+                    if snapshot is not None and snapshot[0] is job_list:
+                        store = JobVectorStore.for_catalog(job_list, fingerprint=snapshot[2], source=catalog.path)
+                    else:
+                        store = JobVectorStore.for_catalog(job_list)
+                    cached = self._job_vectors = (job_list, store)
+        return cached[1]
+
+    def _job_lookup(self, job_list):
+        """
+        Lookup tables for a job list, rebuilt only when the list changes.
+        :return: Tuple of (job list, job id -> job, id(job) -> catalog position)
+        """
+        cached = self._jobs_by_id
+        if cached is None or cached[0] is not job_list:
+            with self._cache_lock:
+                cached = self._jobs_by_id
+                if cached is None or cached[0] is not job_list:
+                    cached = self._jobs_by_id = (
+                        job_list,
+                        {job.get("id", position): job for position, job in enumerate(job_list)},
+                        {id(job): position for position, job in enumerate(job_list)},
+                    )
+        return cached
+
+    def rank_jobs(self, combined_data, job_list, top_k):
+        """
+        Rank jobs for a candidate without calling the LLM.
+        :param combined_data: Candidate profile and analysis results
+        :param job_list: List of job descriptions
+        :param top_k: Number of jobs to return
+        :return: List of (job, retrieval score) tuples, best first
+        """
+        if self.retrieval == "semantic":
+            ranked = self.get_job_vectors(job_list).search(combined_data, top_k)
+        else:
+            ranked = self.get_job_index(job_list).shortlist(combined_data, top_k)
+        jobs_by_id = self._job_lookup(job_list)[1]
+        return [(jobs_by_id[job_id], score) for job_id, score in ranked]
+
+    def shortlist_jobs(self, combined_data, job_list):
+        """
+        Narrow the job list down to the shortlist_size most relevant jobs.
+        :param combined_data: Candidate profile and analysis results
+        :param job_list: List of job descriptions
+        :return: Jobs worth sending to the LLM
+        """
+        if len(job_list) <= self.shortlist_size:
+            return job_list
+        shortlist = [job for job, _ in self.rank_jobs(combined_data, job_list, self.shortlist_size)]
+        self.log(f"Shortlisted {len(shortlist)} of {len(job_list)} jobs ({self.retrieval} retrieval)")
+        if not shortlist:
+            return job_list[:self.shortlist_size]
+        # Keep catalog order rather than score order, so candidates with the same shortlist
+        # produce the same prompt prefix.
+        positions = self._job_lookup(job_list)[2]
+        return sorted(shortlist, key=lambda job: positions[id(job)])
 
     def load_job_data(self, file_path):
         """
-        Load job descriptions from a JSON file.
+        Load job descriptions from a JSON or JSON Lines file.
+        The file is parsed once per version and shared process-wide (see JobCatalog); the same
+        list object is returned until the file changes, so indexes built on it stay valid.
         :param file_path: Path to the JSON file containing job descriptions.
         :return: List of job descriptions.
         """
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            self.catalog = get_job_catalog(file_path)
+            return self.catalog.jobs
         except FileNotFoundError:
             self.log(f"Job file not found at: {file_path}", "error")
             return []
 
-    def process(self, combined_data, job_list_path):
+    def catalog_block(self, job_list):
         """
-        Match the resume data with job descriptions using both extracted and analyzed data.
-        :param combined_data: Dictionary containing both extracted resume details and analysis results
-        :param job_list_path: Path to the JSON file containing job descriptions
-        :return: List of matched jobs and their respective confidence scores
+        Instructions, job descriptions and answer format for a job list.
+        The text of the most recent job list is kept, so a catalog is rendered once per version
+        rather than once per candidate, and its bytes stay identical for prefix reuse.
+        :param job_list: List of job descriptions
+        :return: Prompt text
         """
-        job_list = self.load_job_data(job_list_path)
+        cached = self._catalog_block
+        if cached is not None and cached[0] is job_list:
+            return cached[1]
 
-        self.log("Starting job matching process")
+        with self._cache_lock:
+            cached = self._catalog_block
+            if cached is None or cached[0] is not job_list:
+                cached = self._catalog_block = (job_list, self._render_catalog_block(job_list))
+        return cached[1]
+
+    def _render_catalog_block(self, job_list):
+        """
+        Render the catalog block of a job list (see catalog_block).
+        """
+        block = (
+            "As an AI recruiter, match the candidate with the following jobs. Consider both the candidate's "
+            "profile and the analysis of their strengths and weaknesses.\n\n"
+            "Available Jobs:\n"
+        )
+        # Per-job text is precompiled by the catalog; lists from elsewhere are rendered here.
+        catalog = self.catalog
+        render = catalog.fragment if catalog is not None else render_job
+        block += "".join(f"\nJob {i}:\n{render(job)}" for i, job in enumerate(job_list, start=1))
+        block += (
+            "\nFor each job, provide a match score and brief explanation in this format:\n"
+            "Job Title: [exact title from list]\n"
+            "Match Score: [0.0 to 1.0]\n"
+            "Reasoning: [brief explanation of the match]\n"
+        )
+        return block
 
-        # Prepare a more comprehensive prompt using both extracted and analyzed data
-        prompt = (
-            f"As an AI recruiter, match this candidate with the following jobs. Consider both the candidate's "
-            f"profile and the analysis of their strengths and weaknesses.\n\n"
+    def candidate_block(self, combined_data):
+        """
+        Candidate profile and analysis section of the matching prompt.
+        :param combined_data: Dictionary containing both extracted resume details and analysis results
+        :return: Prompt text
+        """
+        return (
             f"Candidate Profile:\n"
             f"- Name: {combined_data.get('name', 'N/A')}\n"
             f"- Skills: {', '.join(combined_data.get('skills', []))}\n"
@@ -43,44 +209,145 @@ class MatcherAgent(BaseAgent):
             f"Candidate Analysis:\n"
             f"- Strengths: {', '.join(combined_data.get('strengths', []))}\n"
             f"- Profile Confidence: {combined_data.get('confidence_score', 0.0)}\n\n"
-            f"Available Jobs:\n"
         )
 
-        # Add job descriptions to the prompt
-        for i, job in enumerate(job_list, start=1):
-            prompt += (
-                f"\nJob {i}:\n"
-                f"Title: {job['title']}\n"
-                f"Description: {job['description']}\n"
-                f"Required Skills: {', '.join(job.get('required_skills', []))}\n"
-            )
+    def process(self, combined_data, job_list_path, job_list=None):
+        """
+        Match the resume data with job descriptions using both extracted and analyzed data.
+        :param combined_data: Dictionary containing both extracted resume details and analysis results
+        :param job_list_path: Path to the JSON file containing job descriptions
+        :param job_list: Already loaded job descriptions; skips reading job_list_path when given
+        :return: List of matched jobs and their respective confidence scores
+        """
+        if job_list is None:
+            job_list = self.load_job_data(job_list_path)
 
-        prompt += (
-            "\nFor each job, provide a match score and brief explanation in this format:\n"
-            "Job Title: [exact title from list]\n"
-            "Match Score: [0.0 to 1.0]\n"
-            "Reasoning: [brief explanation of the match]\n"
-        )
+        self.log("Starting job matching process")
+        job_list = self.shortlist_jobs(combined_data, job_list)
 
-        llama_response = self.ollama_request(prompt)
+        if self.batch_size and len(job_list) > self.batch_size:
+            return self.match_batched(combined_data, job_list)
 
-        if llama_response:
-            return self.parse_llama_response(llama_response)
-        else:
+        matches = self.request_matches(combined_data, job_list)
+        if matches is None:
             self.log("No response from matching process", "error")
             return []
+        return matches
+
+    def request_matches(self, combined_data, job_list):
+        """
+        Score a list of jobs for a candidate with one LLM call.
+        :param combined_data: Dictionary containing both extracted resume details and analysis results
+        :param job_list: Jobs to include in the prompt
+        :return: Parsed matches, best first, or None when the model did not respond
+        """
+        if self.prompt_layout == "candidate_first":
+            system, prompt = None, self.candidate_block(combined_data) + self.catalog_block(job_list)
+        else:
+            # The catalog goes first and is identical for every candidate, so the server only
+            # prefills the short candidate section once the catalog prefix has been evaluated.
+            # Catalogs above shortlist_size are shortlisted per candidate and rarely share it.
+            system = self.catalog_block(job_list)
+            prompt = self.candidate_block(combined_data) + "Score every job listed above for this candidate.\n"
+
+        llama_response = self.ollama_request(prompt, system=system)
+        return self.parse_llama_response(llama_response) if llama_response else None
+
+    def assign_matches(self, matches, batch):
+        """
+        Attribute parsed matches to the jobs of the batch they were requested for.
+        Titles are matched case-insensitively, then by whole-word containment (so 'Senior
+        Data Scientist' is 'Data Scientist' but 'Job 99' is not 'Job 9'); matches for jobs
+        outside the batch are dropped and every job is scored at most once.
+        :param matches: Parsed matches from one response
+        :param batch: Jobs the response was asked to score
+        :return: Tuple of (matches renamed to the exact job titles, jobs left unscored)
+        """
+        pending = {job["title"].strip().lower(): job for job in batch}
+        words = {title: set(re.findall(r"\w+", title)) for title in pending}
+        assigned = []
+        for match in matches:
+            title = match.get("title", "").strip().lower()
+            if title in pending:
+                key = title
+            else:
+                title_words = set(re.findall(r"\w+", title))
+                key = next((t for t in pending if title_words and words[t] and (
+                    words[t] <= title_words or title_words <= words[t])), None)
+            if key is None:
+                continue
+            job = pending.pop(key)
+            assigned.append({**match, "title": job["title"]})
+        return assigned, list(pending.values())
+
+    def score_jobs(self, combined_data, job_list):
+        """
+        Score every given job for a candidate, without shortlisting. Lists longer than the
+        batch size (or the shortlist size when batching is off) are scored in batches.
+        :param combined_data: Dictionary containing both extracted resume details and analysis results
+        :param job_list: Jobs to score
+        :return: Matches named by their exact job titles, best first, or None when the model did not respond
+        """
+        batch_size = self.batch_size or self.shortlist_size
+        if len(job_list) > batch_size:
+            return self.match_batched(combined_data, job_list, batch_size=batch_size, top_k=0)
+        matches = self.request_matches(combined_data, job_list)
+        if matches is None:
+            return None
+        assigned, _ = self.assign_matches(matches, job_list)
+        assigned.sort(key=lambda match: match.get("confidence_score", 0), reverse=True)
+        return assigned
+
+    def match_batched(self, combined_data, job_list, batch_size=None, top_k=None):
+        """
+        Fan-out matching: score fixed-size batches of jobs concurrently, with at most
+        max_in_flight requests at a time, re-request only the jobs a response left out, and
+        merge everything through a top-K heap. Latency follows the batch size rather than the
+        number of jobs.
+        :param combined_data: Dictionary containing both extracted resume details and analysis results
+        :param job_list: Jobs to score
+        :param batch_size: Jobs per request, default batch_size
+        :param top_k: Number of matches kept, default top_k; 0 keeps all
+        :return: Top matches, best first
+        """
+        batch_size = batch_size or self.batch_size
+        top_k = self.top_k if top_k is None else top_k
+        batches = [job_list[i:i + batch_size] for i in range(0, len(job_list), batch_size)]
+        self.log(f"Scoring {len(job_list)} jobs in {len(batches)} batches, up to {self.max_in_flight} in flight")
+
+        def score_batch(batch):
+            matches = self.request_matches(combined_data, batch)
+            return self.assign_matches(matches or [], batch)
+
+        scored = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            for attempt in range(self.retries + 1):
+                missing = []
+                for assigned, left_out in pool.map(propagate_context(score_batch), batches):
+                    scored.extend(assigned)
+                    missing.extend(left_out)
+                if not missing:
+                    break
+                if attempt < self.retries:
+                    self.log(f"Re-requesting {len(missing)} jobs missing from the responses")
+                    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+                    record_retry(self.name, len(batches))
+                else:
+                    self.log(f"{len(missing)} jobs were never scored", "error")
+
+        return heapq.nlargest(top_k or len(scored), scored, key=lambda match: match.get("confidence_score", 0))
 
     def parse_llama_response(self, response):
         """
         Parse the response into structured job match results.
-        :param response: Raw response text from Llama
+        :param response: Raw response text from Llama, or an iterable of its lines
         :return: List of matched jobs with scores and reasoning
         """
         matches = []
         current_job = {}
 
         try:
-            for line in response.split('\n'):
+            for line in self.iter_lines(response):
                 line = line.strip()
                 if not line:
                     continue
@@ -0,0 +1,433 @@
+import contextlib
+import contextvars
+import http.server
+import json
+import math
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds, Prometheus style (a +Inf bucket is always added).
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+METRIC_HELP = {
+    "pipeline_runs_total": ("counter", "Resumes processed, by outcome"),
+    "pipeline_stage_seconds": ("histogram", "Wall time of each pipeline stage"),
+    "pipeline_stage_failures_total": ("counter", "Pipeline stages that produced no result"),
+    "pdf_parse_seconds": ("histogram", "Time spent reading resume text with pdfplumber"),
+    "llm_requests_total": ("counter", "LLM requests, including cache hits"),
+    "llm_cache_hits_total": ("counter", "LLM requests answered from the LLM cache"),
+    "llm_failures_total": ("counter", "LLM requests that raised an error"),
+    "llm_retries_total": ("counter", "LLM requests repeated after an incomplete or invalid answer"),
+    "llm_request_seconds": ("histogram", "Wall time of LLM requests"),
+    "llm_prefill_seconds": ("histogram", "Prompt evaluation time reported by the server"),
+    "llm_generation_seconds": ("histogram", "Token generation time reported by the server"),
+    "llm_prompt_chars": ("histogram", "Prompt size in characters, system prompt included"),
+    "llm_prompt_tokens": ("histogram", "Prompt tokens evaluated by the server"),
+    "llm_response_chars": ("histogram", "Response size in characters"),
+    "llm_queue_wait_seconds": ("histogram", "Time LLM requests waited for a scheduler slot"),
+    "llm_in_flight": ("gauge", "LLM requests currently holding a scheduler slot"),
+    "llm_queued": ("gauge", "LLM requests waiting for a scheduler slot"),
+}
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket bounds, a running sum and a count.
+    """
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+        :param q: Quantile between 0 and 1
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                if math.isinf(bound):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return lower
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters, gauges and histograms keyed by metric name and labels.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+
+    def inc(self, name, amount=1, **labels):
+        """
+        Add to a counter.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        """
+        Set a gauge to its current value.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, buckets=SECONDS_BUCKETS, **labels):
+        """
+        Record one value in a histogram, created with the given buckets on first use.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def reset(self):
+        """
+        Drop every recorded value.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self):
+        """
+        All metrics in the Prometheus text exposition format.
+        :return: Text with one sample per line
+        """
+        def label_text(labels, extra=()):
+            pairs = [f'{k}="{_escape(v)}"' for k, v in tuple(labels) + tuple(extra)]
+            return "{" + ",".join(pairs) + "}" if pairs else ""
+
+        with self._lock:
+            counters = sorted(list(self._counters.items()) + list(self._gauges.items()))
+            histograms = sorted(
+                (key, (histogram.buckets, list(histogram.counts), histogram.sum, histogram.count))
+                for key, histogram in self._histograms.items()
+            )
+
+        lines = []
+        described = set()
+        for (name, labels), value in counters:
+            if name not in described:
+                lines.extend(_header(name))
+                described.add(name)
+            lines.append(f"{name}{label_text(labels)} {_number(value)}")
+        for (name, labels), (buckets, counts, total, count) in histograms:
+            if name not in described:
+                lines.extend(_header(name))
+                described.add(name)
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                le = "+Inf" if math.isinf(bound) else _number(bound)
+                lines.append(f"{name}_bucket{label_text(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{label_text(labels)} {_number(total)}")
+            lines.append(f"{name}_count{label_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """
+        All metrics as a JSON-serialisable dictionary. Histograms report count, sum, mean and
+        estimated p50/p95/p99.
+        :return: Dictionary with 'counters', 'gauges' and 'histograms', each keyed by metric name
+        """
+        counters = {}
+        gauges = {}
+        histograms = {}
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+            for (name, labels), value in sorted(self._gauges.items()):
+                gauges.setdefault(name, []).append({"labels": dict(labels), "value": value})
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                histograms.setdefault(name, []).append({
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum": round(histogram.sum, 6),
+                    "mean": round(histogram.sum / histogram.count, 6) if histogram.count else 0.0,
+                    "p50": round(histogram.quantile(0.5), 6),
+                    "p95": round(histogram.quantile(0.95), 6),
+                    "p99": round(histogram.quantile(0.99), 6),
+                })
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _header(name):
+    kind, text = METRIC_HELP.get(name, ("untyped", name))
+    return [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+
+
+class RunMetrics:
+    """
+    Per-resume instrumentation: stage wall times and per-agent LLM totals for one
+    process_resume call, summarised into the JSON attached to its result.
+    Everything recorded here is also added to the process-wide registry.
+    """
+    def __init__(self, registry):
+        self.registry = registry
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.llm = {}
+        self.failed_stage = None
+        self._open = {}
+        self._mark = self.started
+        self._lock = threading.Lock()
+
+    def stage_started(self, stage):
+        with self._lock:
+            self._open[stage] = time.perf_counter()
+
+    def stage_completed(self, stage):
+        """
+        Close a stage. A stage that was never started explicitly is timed from the previous
+        stage's completion.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            elapsed = now - self._open.pop(stage, self._mark)
+            self._mark = now
+            self.stages[stage] = round(self.stages.get(stage, 0.0) + elapsed, 6)
+        self.registry.observe("pipeline_stage_seconds", elapsed, stage=stage)
+
+    def add_time(self, stage, elapsed):
+        """
+        Add time spent in a sub-stage, such as PDF parsing, to the summary.
+        """
+        with self._lock:
+            self.stages[stage] = round(self.stages.get(stage, 0.0) + elapsed, 6)
+
+    def stage_failed(self, stage=None):
+        """
+        Record the stage that stopped the run; defaults to the stage still open, or 'pipeline'
+        when the run failed outside any stage.
+        """
+        with self._lock:
+            if stage is None:
+                stage = next(iter(self._open), "pipeline")
+            self.failed_stage = stage
+        self.registry.inc("pipeline_stage_failures_total", stage=stage)
+
+    def add_llm(self, agent, **fields):
+        with self._lock:
+            totals = self.llm.setdefault(agent, {
+                "requests": 0, "cache_hits": 0, "failures": 0, "retries": 0, "wall_s": 0.0,
+                "prefill_s": 0.0, "generation_s": 0.0, "queue_wait_s": 0.0, "prompt_chars": 0,
+                "prompt_tokens": 0, "response_chars": 0,
+            })
+            for field, value in fields.items():
+                totals[field] += value
+
+    def summary(self):
+        """
+        JSON-serialisable summary of this run.
+        :return: Dictionary with total_s, per-stage wall times, per-agent LLM totals and the
+            failed stage, if any
+        """
+        with self._lock:
+            llm = {
+                agent: {k: round(v, 6) if isinstance(v, float) else v for k, v in totals.items()}
+                for agent, totals in self.llm.items()
+            }
+            summary = {
+                "total_s": round(time.perf_counter() - self.started, 6),
+                "stages": dict(self.stages),
+                "llm": llm,
+            }
+            if self.failed_stage is not None:
+                summary["failed_stage"] = self.failed_stage
+        return summary
+
+
+_registry = MetricsRegistry()
+_current_run = contextvars.ContextVar("current_run", default=None)
+
+
+def get_metrics():
+    """
+    Return the process-wide metrics registry.
+    """
+    return _registry
+
+
+def current_run():
+    """
+    The RunMetrics of the process_resume call in progress in this context, or None.
+    """
+    return _current_run.get()
+
+
+@contextlib.contextmanager
+def track_run():
+    """
+    Collect a RunMetrics for the work done in this block (and in threads started with
+    propagate_context), and count the run in pipeline_runs_total.
+    :return: Context manager yielding the RunMetrics
+    """
+    run = RunMetrics(_registry)
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        _registry.inc("pipeline_runs_total", status="error" if run.failed_stage else "ok")
+
+
+def propagate_context(func):
+    """
+    Wrap a function submitted to a thread pool so it runs in a copy of the caller's context,
+    keeping the current run (and stream listeners) visible in worker threads.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+def record_llm_request(agent, elapsed, prompt_chars, response_chars=0, stats=None, cache_hit=False, failed=False):
+    """
+    Record one LLM request.
+    :param agent: Agent name
+    :param elapsed: Wall time in seconds
+    :param prompt_chars: Prompt size, system prompt included
+    :param response_chars: Response size
+    :param stats: Final /api/generate response or stream chunk, for the server's token counts
+        and prefill / generation durations
+    :param cache_hit: The response came from the LLM cache
+    :param failed: The request raised an error
+    """
+    stats = stats or {}
+    prompt_tokens = stats.get("prompt_eval_count") or 0
+    prefill = (stats.get("prompt_eval_duration") or 0) / 1e9
+    generation = (stats.get("eval_duration") or 0) / 1e9
+
+    _registry.inc("llm_requests_total", agent=agent)
+    if cache_hit:
+        _registry.inc("llm_cache_hits_total", agent=agent)
+    if failed:
+        _registry.inc("llm_failures_total", agent=agent)
+    _registry.observe("llm_request_seconds", elapsed, agent=agent)
+    _registry.observe("llm_prompt_chars", prompt_chars, SIZE_BUCKETS, agent=agent)
+    _registry.observe("llm_response_chars", response_chars, SIZE_BUCKETS, agent=agent)
+    if "prompt_eval_count" in stats:
+        _registry.observe("llm_prompt_tokens", prompt_tokens, SIZE_BUCKETS, agent=agent)
+    if "prompt_eval_duration" in stats:
+        _registry.observe("llm_prefill_seconds", prefill, agent=agent)
+    if "eval_duration" in stats:
+        _registry.observe("llm_generation_seconds", generation, agent=agent)
+
+    run = _current_run.get()
+    if run is not None:
+        run.add_llm(
+            agent, requests=1, cache_hits=int(cache_hit), failures=int(failed), wall_s=elapsed,
+            prefill_s=prefill, generation_s=generation, prompt_chars=prompt_chars,
+            prompt_tokens=prompt_tokens, response_chars=response_chars,
+        )
+
+
+def record_retry(agent, count=1):
+    """
+    Record LLM requests repeated because an earlier answer was incomplete or invalid.
+    """
+    _registry.inc("llm_retries_total", count, agent=agent)
+    run = _current_run.get()
+    if run is not None:
+        run.add_llm(agent, retries=count)
+
+
+def record_queue_wait(priority, elapsed, agent=None):
+    """
+    Record how long an LLM request waited for a scheduler slot.
+    """
+    _registry.observe("llm_queue_wait_seconds", elapsed, priority=priority)
+    run = _current_run.get()
+    if run is not None and agent is not None:
+        run.add_llm(agent, queue_wait_s=elapsed)
+
+
+def record_pdf_parse(elapsed):
+    """
+    Record the time spent extracting text from a resume PDF.
+    """
+    _registry.observe("pdf_parse_seconds", elapsed)
+    run = _current_run.get()
+    if run is not None:
+        run.add_time("pdf_parse", elapsed)
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            body = _registry.render_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            body = json.dumps(_registry.snapshot()).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host=None):
+    """
+    Serve /metrics (Prometheus text) and /metrics.json from a background thread, once per process.
+    :param port: TCP port (METRICS_PORT)
+    :param host: Interface to bind (METRICS_HOST, default 127.0.0.1)
+    :return: The running HTTP server
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            port = int(port if port is not None else os.environ["METRICS_PORT"])
+            host = host or os.environ.get("METRICS_HOST", "127.0.0.1")
+            _server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
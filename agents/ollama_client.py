@@ -0,0 +1,312 @@
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+# A generation whose reported load_duration exceeds this many seconds paid for loading the
+# model, and is recorded as a cold start rather than a warm request.
+COLD_LOAD_SECONDS = float(os.environ.get("OLLAMA_COLD_LOAD_SECONDS", 0.5))
+
+
+class OllamaError(Exception):
+    """Raised when the Ollama HTTP API cannot be reached or returns an error."""
+
+
+class OllamaClient:
+    """
+    Thin client for the Ollama HTTP API backed by a pool of keep-alive connections.
+    A single instance is shared by every agent in the process, so concurrent agents
+    reuse open sockets instead of spawning an `ollama run` process per prompt.
+    """
+    def __init__(self, host=None, model=None, connect_timeout=None, read_timeout=None, pool_size=None,
+                 keep_alive=None):
+        """
+        Configure the client. Unset values fall back to environment variables.
+        :param host: Base URL of the Ollama server (OLLAMA_HOST, default http://127.0.0.1:11434)
+        :param model: Default model name (OLLAMA_MODEL, default llama3)
+        :param connect_timeout: Seconds to wait for a TCP connection (OLLAMA_CONNECT_TIMEOUT, default 5)
+        :param read_timeout: Seconds to wait for a response (OLLAMA_READ_TIMEOUT, default 300)
+        :param pool_size: Maximum number of idle connections kept open (OLLAMA_POOL_SIZE, default 8)
+        :param keep_alive: How long the server keeps the model and its prompt cache loaded after a
+            request, e.g. '30m' or -1 for forever (OLLAMA_KEEP_ALIVE, default server setting)
+        """
+        host = host or os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+        if "://" not in host:
+            host = f"http://{host}"
+        parts = urlsplit(host)
+        self.host = host.rstrip("/")
+        self.scheme = parts.scheme or "http"
+        self.hostname = parts.hostname or "127.0.0.1"
+        self.port = parts.port or (443 if self.scheme == "https" else 11434)
+        self.base_path = parts.path.rstrip("/")
+
+        self.model = model or os.environ.get("OLLAMA_MODEL", "llama3")
+        self.connect_timeout = float(connect_timeout or os.environ.get("OLLAMA_CONNECT_TIMEOUT", 5))
+        self.read_timeout = float(read_timeout or os.environ.get("OLLAMA_READ_TIMEOUT", 300))
+        self.pool_size = int(pool_size or os.environ.get("OLLAMA_POOL_SIZE", 8))
+        keep_alive = keep_alive if keep_alive is not None else os.environ.get("OLLAMA_KEEP_ALIVE")
+        # Ollama takes a duration string ('30m') or a number of seconds (-1 keeps the model loaded).
+        if isinstance(keep_alive, str) and keep_alive.lstrip("-").isdigit():
+            keep_alive = int(keep_alive)
+        self.keep_alive = keep_alive
+
+        self._pool = queue.LifoQueue(maxsize=self.pool_size)
+        self._pid = os.getpid()
+        self._latency_lock = threading.Lock()
+        self._latency = {"cold": [0, 0.0, 0.0], "warm": [0, 0.0, 0.0]}
+
+    def _new_connection(self):
+        """
+        Open a new HTTP(S) connection to the Ollama server.
+        :return: http.client connection instance
+        """
+        conn_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        conn = conn_class(self.hostname, self.port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        return conn
+
+    def _acquire(self):
+        """
+        Take an idle connection from the pool or open a new one.
+        """
+        if self._pid != os.getpid():
+            # Forked worker: never share the parent's sockets.
+            self._pool = queue.LifoQueue(maxsize=self.pool_size)
+            self._pid = os.getpid()
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn):
+        """
+        Return a connection to the pool, closing it if the pool is full.
+        """
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _send(self, method, path, payload):
+        """
+        Send a request on a pooled connection, retrying once on a stale socket.
+        :return: Tuple of (connection, response)
+        """
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request(method, self.base_path + path, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed an idle keep-alive socket; retry on a fresh one.
+                conn.close()
+                if attempt:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+    def request(self, method, path, payload=None):
+        """
+        Perform a non-streaming JSON request against the Ollama API.
+        :param method: HTTP method ('GET' or 'POST')
+        :param path: API path such as '/api/generate'
+        :param payload: JSON-serialisable request body
+        :return: Decoded JSON response
+        """
+        try:
+            conn, response = self._send(method, path, payload)
+        except OSError as e:
+            raise OllamaError(f"Cannot reach Ollama at {self.host}: {e}") from e
+
+        try:
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+
+        if response.status != 200:
+            raise OllamaError(f"Ollama returned HTTP {response.status}: {data.decode('utf-8', 'replace')}")
+        return json.loads(data) if data else {}
+
+    def generate(self, prompt, model=None, options=None, **kwargs):
+        """
+        Generate a completion for a prompt.
+        :param prompt: The prompt text
+        :param model: Model name, defaults to the client's configured model
+        :param options: Ollama generation options (temperature, num_ctx, ...)
+        :param kwargs: Extra top-level /api/generate fields (system, keep_alive, ...)
+        :return: Decoded /api/generate response; the completion text is under 'response'
+        """
+        payload = {"model": model or self.model, "prompt": prompt, "stream": False}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if options:
+            payload["options"] = options
+        payload.update({k: v for k, v in kwargs.items() if v is not None})
+        start = time.perf_counter()
+        result = self.request("POST", "/api/generate", payload)
+        self._record_latency(result, time.perf_counter() - start)
+        return result
+
+    def generate_stream(self, prompt, model=None, options=None, **kwargs):
+        """
+        Generate a completion and yield it as it is produced.
+        :param prompt: The prompt text
+        :param model: Model name, defaults to the client's configured model
+        :param options: Ollama generation options
+        :param kwargs: Extra top-level /api/generate fields
+        :return: Generator of decoded stream chunks; each holds a 'response' text fragment and
+            the last one has 'done' set along with the generation statistics
+        """
+        payload = {"model": model or self.model, "prompt": prompt, "stream": True}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if options:
+            payload["options"] = options
+        payload.update({k: v for k, v in kwargs.items() if v is not None})
+
+        start = time.perf_counter()
+        try:
+            conn, response = self._send("POST", "/api/generate", payload)
+        except OSError as e:
+            raise OllamaError(f"Cannot reach Ollama at {self.host}: {e}") from e
+
+        if response.status != 200:
+            data = response.read()
+            conn.close()
+            raise OllamaError(f"Ollama returned HTTP {response.status}: {data.decode('utf-8', 'replace')}")
+
+        finished = False
+        try:
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise OllamaError(chunk["error"])
+                if chunk.get("done"):
+                    self._record_latency(chunk, time.perf_counter() - start)
+                yield chunk
+                if chunk.get("done"):
+                    # Drain the terminating chunk so the connection can be reused.
+                    response.read()
+                    finished = True
+                    break
+        finally:
+            if finished and not response.will_close:
+                self._release(conn)
+            else:
+                # Abandoned or broken stream: the socket may still carry unread data.
+                conn.close()
+
+    def preload(self, model=None):
+        """
+        Load a model into memory without generating anything, so the next request skips the load.
+        The model stays resident for the client's keep_alive.
+        :param model: Model name, defaults to the client's configured model
+        :return: Decoded /api/generate response; 'load_duration' holds the load time in nanoseconds
+        """
+        payload = {"model": model or self.model}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return self.request("POST", "/api/generate", payload)
+
+    def loaded_models(self):
+        """
+        Names of the models currently loaded by the server.
+        :return: Set of model names, e.g. {'llama3:latest'}
+        """
+        return {m.get("name") or m.get("model") for m in self.request("GET", "/api/ps").get("models", [])}
+
+    def is_loaded(self, model=None):
+        """
+        Whether a model is loaded and ready to answer without a cold start.
+        :param model: Model name, defaults to the client's configured model
+        """
+        model = model or self.model
+        names = self.loaded_models()
+        return model in names or (":" not in model and f"{model}:latest" in names)
+
+    def _record_latency(self, stats, elapsed):
+        """
+        Add a finished generation's wall time to the cold or warm latency totals.
+        :param stats: Final /api/generate response or stream chunk
+        :param elapsed: Seconds from sending the request to the final chunk
+        """
+        kind = "cold" if stats.get("load_duration", 0) / 1e9 > COLD_LOAD_SECONDS else "warm"
+        with self._latency_lock:
+            totals = self._latency[kind]
+            totals[0] += 1
+            totals[1] += elapsed
+            totals[2] = max(totals[2], elapsed)
+
+    def latency_stats(self):
+        """
+        Request latency split into cold starts (the model had to be loaded) and warm requests.
+        :return: Dictionary with 'cold' and 'warm' entries of count, mean_s and max_s
+        """
+        with self._latency_lock:
+            return {
+                kind: {
+                    "count": count,
+                    "mean_s": round(total / count, 4) if count else 0.0,
+                    "max_s": round(worst, 4),
+                }
+                for kind, (count, total, worst) in self._latency.items()
+            }
+
+    def close(self):
+        """
+        Close every idle pooled connection.
+        """
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Return the process-wide client shared by all agents, creating it on first use.
+    With LLM_CASSETTE_MODE set, the client records to or replays from a cassette
+    (see agents/cassette.py).
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                from .cassette import cassette_from_env
+                _default_client = cassette_from_env(OllamaClient())
+    return _default_client
+
+
+def set_default_client(client):
+    """
+    Replace the process-wide client, e.g. to point agents at a different server or a stub.
+    :param client: Object exposing the OllamaClient interface, or None to reset
+    :return: The previously installed client
+    """
+    global _default_client
+    with _default_client_lock:
+        previous, _default_client = _default_client, client
+    return previous
@@ -1,76 +1,737 @@
-from .base_agent import BaseAgent
+from .base_agent import stream_lines_to
+from .cache import _env_flag
 from .extractor_agent import ExtractorAgent
 from .analyzer_agent import AnalyzerAgent
 from .matcher_agent import MatcherAgent
 from .screener_agent import ScreenerAgent
 from .recommender_agent import RecommenderAgent
+from .fused_agent import FusedAgent
+from .job_catalog import get_job_catalog
+from .metrics import current_run, propagate_context, record_retry, start_metrics_server, track_run
+from .profile_store import get_profile_store
+from .scheduler import llm_priority
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import json
 import os
+import queue
+import threading
+import time
+
+
+# Number of best job matches that feed screening and recommendation. Incremental re-matching
+# recomputes those stages only when these matches change.
+TOP_MATCHES = 3
+
+
+class StageFailed(Exception):
+    """Raised when a pipeline stage produces no result."""
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def top_matches(matched_jobs):
+    """
+    The matches screening and recommendation depend on, as comparable (title, score) pairs.
+    """
+    return [(m.get("title", "").strip().lower(), m.get("confidence_score")) for m in matched_jobs[:TOP_MATCHES]]
+
 
 class Orchestrator:
-    def __init__(self):
-        """Initialize all agents and set up logging."""
+    def __init__(self, pipeline_mode=None, warmup=None):
+        """
+        Initialize all agents and set up logging.
+        :param pipeline_mode: 'staged' runs one LLM call per agent; 'fused' matches on the extracted
+            profile and then produces analysis, screening and recommendation in a single call,
+            falling back to the per-agent calls only for sections that fail validation
+            (PIPELINE_MODE, default 'staged')
+        :param warmup: Preload the agents' models in a background thread so the first resume does
+            not pay the model load (OLLAMA_WARMUP, default off)
+
+        When METRICS_PORT is set, pipeline metrics are served on it in Prometheus text format
+        (see agents/metrics.py).
+        """
+        self.pipeline_mode = pipeline_mode or os.environ.get("PIPELINE_MODE", "staged")
         self.extractor_agent = ExtractorAgent()
         self.analyzer_agent = AnalyzerAgent()
         self.matcher_agent = MatcherAgent()
         self.screener_agent = ScreenerAgent()
         self.recommender_agent = RecommenderAgent()
+        self.fused_agent = FusedAgent()
+        self._catalog_snapshots = set()
+
+        if os.environ.get("METRICS_PORT"):
+            try:
+                start_metrics_server()
+            except OSError as e:
+                # Another process (e.g. a sibling batch worker) already serves this port.
+                self.extractor_agent.log(f"Metrics server not started: {str(e)}", "error")
+
+        if warmup is None:
+            warmup = _env_flag("OLLAMA_WARMUP")
+        self.warmup_status = "pending" if warmup else "disabled"
+        self.warmup_load_s = {}
+        self._warmup_thread = None
+        if warmup:
+            self._warmup_thread = threading.Thread(target=self.warm_up, name="model-warmup", daemon=True)
+            self._warmup_thread.start()
+
+    def agents(self):
+        """
+        All agents used by the pipeline.
+        """
+        return [
+            self.extractor_agent, self.analyzer_agent, self.matcher_agent,
+            self.screener_agent, self.recommender_agent, self.fused_agent,
+        ]
 
-    def process_resume(self, resume_path, job_list_path):
+    def models(self):
+        """
+        Map each model used by the agents to the client that serves it.
+        """
+        models = {}
+        for agent in self.agents():
+            models.setdefault(getattr(agent.client, "model", None), agent.client)
+        return models
+
+    def warm_up(self):
+        """
+        Load every configured model into the server so later requests start warm.
+        Models stay resident for the client's keep_alive (OLLAMA_KEEP_ALIVE).
+        :return: True when every model loaded
+        """
+        self.warmup_status = "running"
+        try:
+            for model, client in self.models().items():
+                start = time.perf_counter()
+                result = client.preload(model)
+                self.warmup_load_s[model] = round(result.get("load_duration", 0) / 1e9, 3)
+                self.extractor_agent.log(
+                    f"Preloaded {model} in {time.perf_counter() - start:.2f}s "
+                    f"(load {self.warmup_load_s[model]:.2f}s)"
+                )
+        except Exception as e:
+            self.warmup_status = "failed"
+            self.extractor_agent.log(f"Model warm-up failed: {str(e)}", "error")
+            return False
+        self.warmup_status = "done"
+        return True
+
+    def readiness(self):
+        """
+        Readiness check for health probes: the server is reachable and every model is loaded.
+        :return: Dictionary with 'ready', per-model 'models' flags, 'warmup' status and load
+            times, and the client's cold-start vs warm 'latency' statistics
+        """
+        report = {"ready": False, "models": {}, "warmup": self.warmup_status, "warmup_load_s": self.warmup_load_s}
+        latency = {}
+        try:
+            for model, client in self.models().items():
+                report["models"][model] = client.is_loaded(model)
+                if hasattr(client, "latency_stats"):
+                    latency[model] = client.latency_stats()
+            report["ready"] = all(report["models"].values())
+        except Exception as e:
+            report["error"] = str(e)
+        report["latency"] = latency
+        return report
+
+    def fingerprint_resume(self, resume_path):
+        """
+        Hash a resume for the profile store, reading it only once.
+        :param resume_path: Path, bytes or binary file-like object
+        :return: Tuple of (SHA-256 hex digest or None, resume input to pass on to the extractor)
+        """
+        if get_profile_store() is None:
+            return None, resume_path
+        try:
+            return self.extractor_agent.open_pdf(resume_path)
+        except OSError:
+            # Unreadable input: the extractor reports it.
+            return None, resume_path
+
+    def matching_profile(self, extracted_data, analysis_results):
+        """
+        The candidate profile the matcher sees in this pipeline mode.
+        """
+        if self.pipeline_mode == "fused":
+            return extracted_data
+        return {**extracted_data, **analysis_results}
+
+    def stage_dependencies(self, final_output, job_list_path=None):
+        """
+        Record what each stage of a result was computed from: extraction from the PDF (the
+        profile store key) and the extractor version, analysis from the extraction, matching
+        from the profile and the catalog version, and screening and recommendation from the
+        top matches.
+        :return: Dictionary of stage name to its inputs' fingerprint
+        """
+        extracted = final_output.get("extracted_data") or {}
+        analysis = final_output.get("analysis_results") or {}
+        catalog_version = None
+        if job_list_path is not None:
+            catalog = get_job_catalog(job_list_path)
+            snapshot = catalog.snapshot
+            catalog_version = snapshot[2]
+            store = get_profile_store()
+            if (id(store), catalog_version) not in self._catalog_snapshots:
+                store.save_catalog_snapshot(catalog_version, catalog.job_versions(snapshot))
+                self._catalog_snapshots.add((id(store), catalog_version))
+        return {
+            "extraction": self.extractor_agent.version,
+            "analysis": _digest(extracted),
+            "matching": {
+                "profile": _digest(self.matching_profile(extracted, analysis)),
+                "catalog": catalog_version,
+            },
+            "screening": _digest(top_matches(final_output.get("matched_jobs") or [])),
+        }
+
+    def save_profile(self, resume_hash, final_output, job_list_path=None):
+        """
+        Persist a successful result and its stage dependencies in the profile store, when one
+        is configured.
+        """
+        store = get_profile_store()
+        if store is None or resume_hash is None:
+            return
+        try:
+            store.save(resume_hash, final_output, self.stage_dependencies(final_output, job_list_path))
+        except Exception as e:
+            self.extractor_agent.log(f"Could not store candidate profile: {str(e)}", "error")
+
+    def stored_result(self, resume_hash, job_list_path):
+        """
+        Return the profile store's result for a resume if it is still current: extracted by
+        the current extractor and matched against the current version of the job list.
+        :param resume_hash: SHA-256 hex digest of the resume PDF
+        :param job_list_path: Path to the job listings file
+        :return: Stored result, or None when none is stored, it is outdated or no store is configured
+        """
+        store = get_profile_store()
+        profile = store.get_profile(resume_hash) if store is not None else None
+        if profile is None:
+            return None
+        result, deps = profile
+        if deps.get("extraction") != self.extractor_agent.version:
+            return None
+        if (deps.get("matching") or {}).get("catalog") != get_job_catalog(job_list_path).version:
+            return None
+        return result
+
+    def process_resume(self, resume_path, job_list_path, on_event=None):
         """
         Orchestrates the entire resume processing workflow.
-        :param resume_path: Path to the uploaded resume (PDF)
+        :param resume_path: Path to the uploaded resume (PDF), or its bytes / binary file-like object
         :param job_list_path: Path to the job listings JSON file
+        :param on_event: Optional callback receiving stage_started / stage_completed events
+        :return: Final output containing results from all agents, with a JSON summary of stage
+            timings and LLM usage under 'metrics'
+        """
+        with track_run() as run:
+            def emit(event_type, stage, result=None):
+                if event_type == "stage_started":
+                    run.stage_started(stage)
+                else:
+                    run.stage_completed(stage)
+                if on_event is not None:
+                    event = {"type": event_type, "stage": stage}
+                    if event_type == "stage_completed":
+                        event["result"] = result
+                    on_event(event)
+
+            try:
+                resume_hash, resume_path = self.fingerprint_resume(resume_path)
+
+                # Step 1: Extract data from resume
+                self.extractor_agent.log("Starting resume extraction")
+                emit("stage_started", "extracted_data")
+                extracted_data = self.extractor_agent.process(resume_path)
+                if not extracted_data:
+                    final_output = {"error": "Failed to extract data from resume"}
+                else:
+                    emit("stage_completed", "extracted_data", extracted_data)
+                    if self.pipeline_mode == "fused":
+                        final_output = self._process_fused(extracted_data, job_list_path, emit)
+                    else:
+                        final_output = self._process_staged(extracted_data, job_list_path, emit)
+                    if "error" not in final_output:
+                        self.save_profile(resume_hash, final_output, job_list_path)
+
+            except Exception as e:
+                error_message = f"Error in Orchestrator: {str(e)}"
+                self.extractor_agent.log(error_message, "error")
+                final_output = {"error": error_message}
+
+            if "error" in final_output:
+                run.stage_failed()
+            final_output["metrics"] = run.summary()
+            return final_output
+
+    def _process_staged(self, extracted_data, job_list_path, emit):
+        """
+        Staged workflow after extraction: one agent and one LLM call per stage.
         :return: Final output containing results from all agents
         """
-        try:
-            # Step 1: Extract data from resume
+        # Step 2: Analyze extracted data
+        self.analyzer_agent.log("Starting resume analysis")
+        emit("stage_started", "analysis_results")
+        analysis_results = self.analyzer_agent.process(extracted_data)
+        if not analysis_results:
+            return {"error": "Failed to analyze resume data"}
+        emit("stage_completed", "analysis_results", analysis_results)
+
+        # Step 3: Match with job listings
+        self.matcher_agent.log("Starting job matching")
+        emit("stage_started", "matched_jobs")
+        combined_data = {**extracted_data, **analysis_results}
+        matched_jobs = self.matcher_agent.process(combined_data, job_list_path)
+        if not matched_jobs:
+            return {"error": "Failed to match jobs"}
+        emit("stage_completed", "matched_jobs", matched_jobs)
+
+        # Step 4: Screen candidate
+        self.screener_agent.log("Starting candidate screening")
+        emit("stage_started", "screening_results")
+        screening_results = self.screener_agent.process(
+            analysis_results, matched_jobs, extracted_data, self.matcher_agent.load_job_data(job_list_path)
+        )
+        if not screening_results:
+            return {"error": "Failed to screen candidate"}
+        emit("stage_completed", "screening_results", screening_results)
+
+        # Step 5: Generate recommendations
+        self.recommender_agent.log("Starting recommendation generation")
+        emit("stage_started", "recommendations")
+        recommendations = self.recommender_agent.recommend(
+            analysis_results, screening_results, matched_jobs
+        )
+        if not recommendations:
+            return {"error": "Failed to generate recommendations"}
+        emit("stage_completed", "recommendations", recommendations)
+
+        # Aggregate all results
+        final_output = {
+            "extracted_data": extracted_data,
+            "analysis_results": analysis_results,
+            "matched_jobs": matched_jobs,
+            "screening_results": screening_results,
+            "recommendations": recommendations,
+        }
+
+        return final_output
+
+    def _process_fused(self, extracted_data, job_list_path, emit):
+        """
+        Fused workflow after extraction: match on the extracted profile, then one LLM call for
+        analysis, screening and recommendation, re-running individual agents only for sections
+        of the fused output that failed validation.
+        :return: Final output containing results from all agents
+        """
+        # Step 2: Match with job listings on the extracted profile
+        self.matcher_agent.log("Starting job matching")
+        emit("stage_started", "matched_jobs")
+        job_list = self.matcher_agent.load_job_data(job_list_path)
+        matched_jobs = self.matcher_agent.process(extracted_data, job_list_path, job_list)
+        if not matched_jobs:
+            return {"error": "Failed to match jobs"}
+        emit("stage_completed", "matched_jobs", matched_jobs)
+
+        # Step 3: Analysis, screening and recommendation in one generation
+        emit("stage_started", "analysis_results")
+        fused = self.fused_agent.process(extracted_data, matched_jobs)
+        analysis_results, screening_results, recommendations = self._resolve_fused(
+            fused, extracted_data, matched_jobs, job_list, emit
+        )
+        if not analysis_results:
+            return {"error": "Failed to analyze resume data"}
+        if not screening_results:
+            return {"error": "Failed to screen candidate"}
+        if not recommendations:
+            return {"error": "Failed to generate recommendations"}
+
+        return {
+            "extracted_data": extracted_data,
+            "analysis_results": analysis_results,
+            "matched_jobs": matched_jobs,
+            "screening_results": screening_results,
+            "recommendations": recommendations,
+        }
+
+    def _resolve_fused(self, fused, extracted_data, matched_jobs, job_list, emit=None):
+        """
+        Take each section from the fused output, or compute it with its own agent when invalid.
+        A section that is still missing is not reported as completed, and the sections after
+        it are left as None.
+        :return: Tuple of (analysis results, screening results, recommendations)
+        """
+        emit = emit or (lambda *args: None)
+
+        analysis_results = fused["analysis_results"]
+        if analysis_results is None:
+            self.analyzer_agent.log("Fused analysis invalid, falling back to AnalyzerAgent")
+            record_retry(self.analyzer_agent.name)
+            analysis_results = self.analyzer_agent.process(extracted_data)
+        if not analysis_results:
+            return analysis_results, None, None
+        emit("stage_completed", "analysis_results", analysis_results)
+
+        screening_results = fused["screening_results"]
+        if screening_results is None:
+            self.screener_agent.log("Fused screening invalid, falling back to ScreenerAgent")
+            record_retry(self.screener_agent.name)
+            screening_results = self.screener_agent.process(
+                analysis_results, matched_jobs, extracted_data, job_list
+            )
+        if not screening_results:
+            return analysis_results, screening_results, None
+        emit("stage_completed", "screening_results", screening_results)
+
+        recommendations = fused["recommendations"]
+        if recommendations is None:
+            self.recommender_agent.log("Fused recommendation invalid, falling back to RecommenderAgent")
+            record_retry(self.recommender_agent.name)
+            recommendations = self.recommender_agent.recommend(analysis_results, screening_results, matched_jobs)
+        if recommendations:
+            emit("stage_completed", "recommendations", recommendations)
+
+        return analysis_results, screening_results, recommendations
+
+    def process_resume_events(self, resume_path, job_list_path):
+        """
+        Run process_resume with streamed LLM output and expose its progress as events.
+        Events are dictionaries with a 'type' of:
+        - 'stage_started': a stage (e.g. 'analysis_results') began
+        - 'partial': the stage's result parsed from the model output received so far
+        - 'stage_completed': the stage's final result
+        - 'completed': the final output of process_resume (which may hold an 'error')
+        :param resume_path: Path to the uploaded resume (PDF), or its bytes / binary file-like object
+        :param job_list_path: Path to the job listings JSON file
+        :return: Generator of events, ending with the 'completed' event
+        """
+        events = queue.Queue()
+        stages = {
+            self.extractor_agent: "extracted_data",
+            self.analyzer_agent: "analysis_results",
+            self.matcher_agent: "matched_jobs",
+            self.screener_agent: "screening_results",
+            self.recommender_agent: "recommendations",
+        }
+
+        def on_line(agent, line, lines):
+            # lines belongs to this one LLM request, so concurrent requests of an agent
+            # (extraction chunks, matcher batches) never mix and each request starts empty.
+            stage = stages.get(agent)
+            if stage is None:
+                return
+            if not line.strip():
+                return
+            try:
+                partial = agent.parse_llama_response(list(lines))
+            except Exception:
+                return
+            events.put({"type": "partial", "stage": stage, "result": partial})
+
+        def run():
+            try:
+                with stream_lines_to(on_line):
+                    result = self.process_resume(resume_path, job_list_path, on_event=events.put)
+            except Exception as e:
+                result = {"error": f"Error in Orchestrator: {str(e)}"}
+            events.put({"type": "completed", "result": result})
+
+        # The worker thread keeps the caller's LLM priority and session.
+        threading.Thread(target=propagate_context(run), daemon=True).start()
+        while True:
+            event = events.get()
+            yield event
+            if event["type"] == "completed":
+                break
+
+    def _resume_stages(self, resume_path, job_list_path, job_list=None):
+        """
+        Describe the resume workflow as a dependency graph.
+        Each stage is (name, dependencies, function, error message); the function receives
+        a dictionary of the results of its dependencies. Stages whose dependencies are
+        satisfied run concurrently, so job loading overlaps with extraction and analysis.
+        :return: List of stage tuples in topological order
+        """
+        def load_jobs(deps):
+            if job_list is not None:
+                return job_list
+            return self.matcher_agent.load_job_data(job_list_path)
+
+        def extract(deps):
             self.extractor_agent.log("Starting resume extraction")
-            extracted_data = self.extractor_agent.process(resume_path)
-            if not extracted_data:
-                return {"error": "Failed to extract data from resume"}
+            return self.extractor_agent.process(resume_path)
 
-            # Step 2: Analyze extracted data
+        def analyze(deps):
             self.analyzer_agent.log("Starting resume analysis")
-            analysis_results = self.analyzer_agent.process(extracted_data)
-            if not analysis_results:
-                return {"error": "Failed to analyze resume data"}
+            return self.analyzer_agent.process(deps["extracted_data"])
 
-            # Step 3: Match with job listings
+        def match(deps):
             self.matcher_agent.log("Starting job matching")
-            combined_data = {**extracted_data, **analysis_results}
-            matched_jobs = self.matcher_agent.process(combined_data, job_list_path)
-            if not matched_jobs:
-                return {"error": "Failed to match jobs"}
+            combined_data = {**deps["extracted_data"], **deps["analysis_results"]}
+            return self.matcher_agent.process(combined_data, job_list_path, deps["job_list"])
 
-            # Step 4: Screen candidate
+        def screen(deps):
             self.screener_agent.log("Starting candidate screening")
-            screening_results = self.screener_agent.process(analysis_results, matched_jobs)
-            if not screening_results:
-                return {"error": "Failed to screen candidate"}
+            return self.screener_agent.process(
+                deps["analysis_results"], deps["matched_jobs"], deps["extracted_data"], deps["job_list"]
+            )
 
-            # Step 5: Generate recommendations
+        def recommend(deps):
             self.recommender_agent.log("Starting recommendation generation")
-            recommendations = self.recommender_agent.recommend(
-                analysis_results, screening_results, matched_jobs
+            return self.recommender_agent.recommend(
+                deps["analysis_results"], deps["screening_results"], deps["matched_jobs"]
             )
-            if not recommendations:
-                return {"error": "Failed to generate recommendations"}
-
-            # Aggregate all results
-            final_output = {
-                "extracted_data": extracted_data,
-                "analysis_results": analysis_results,
-                "matched_jobs": matched_jobs,
-                "screening_results": screening_results,
-                "recommendations": recommendations,
-            }
 
+        if self.pipeline_mode == "fused":
+            def match_profile(deps):
+                self.matcher_agent.log("Starting job matching")
+                return self.matcher_agent.process(deps["extracted_data"], job_list_path, deps["job_list"])
+
+            def fuse(deps):
+                fused = self.fused_agent.process(deps["extracted_data"], deps["matched_jobs"])
+                return self._resolve_fused(fused, deps["extracted_data"], deps["matched_jobs"], deps["job_list"])
+
+            return [
+                ("job_list", [], load_jobs, None),
+                ("extracted_data", [], extract, "Failed to extract data from resume"),
+                ("matched_jobs", ["extracted_data", "job_list"], match_profile, "Failed to match jobs"),
+                ("fused", ["extracted_data", "matched_jobs", "job_list"], fuse, None),
+                ("analysis_results", ["fused"], lambda deps: deps["fused"][0], "Failed to analyze resume data"),
+                ("screening_results", ["fused"], lambda deps: deps["fused"][1], "Failed to screen candidate"),
+                ("recommendations", ["fused"], lambda deps: deps["fused"][2], "Failed to generate recommendations"),
+            ]
+
+        return [
+            ("job_list", [], load_jobs, None),
+            ("extracted_data", [], extract, "Failed to extract data from resume"),
+            ("analysis_results", ["extracted_data"], analyze, "Failed to analyze resume data"),
+            ("matched_jobs", ["extracted_data", "analysis_results", "job_list"], match, "Failed to match jobs"),
+            ("screening_results", ["extracted_data", "analysis_results", "matched_jobs", "job_list"], screen,
+             "Failed to screen candidate"),
+            ("recommendations", ["analysis_results", "screening_results", "matched_jobs"], recommend,
+             "Failed to generate recommendations"),
+        ]
+
+    async def _run_stage_graph(self, stages):
+        """
+        Run a stage graph on the event loop, executing each blocking stage in a worker thread.
+        :param stages: Stage tuples as returned by _resume_stages
+        :return: Dictionary of stage results
+        :raises StageFailed: When a stage returns an empty result
+        """
+        tasks = {}
+
+        run_metrics = current_run()
+
+        async def run(name, deps, func, error_message):
+            results = {dep: await tasks[dep] for dep in deps}
+            if run_metrics is not None:
+                run_metrics.stage_started(name)
+            result = await asyncio.to_thread(func, results)
+            if error_message and not result:
+                if run_metrics is not None:
+                    run_metrics.stage_failed(name)
+                raise StageFailed(error_message)
+            if run_metrics is not None:
+                run_metrics.stage_completed(name)
+            return result
+
+        for name, deps, func, error_message in stages:
+            tasks[name] = asyncio.ensure_future(run(name, deps, func, error_message))
+
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        # Stages are in topological order, so the first failure is the root cause.
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return dict(zip(tasks, outcomes))
+
+    async def process_resume_async(self, resume_path, job_list_path, job_list=None):
+        """
+        Asynchronous variant of process_resume that schedules stages by their dependencies.
+        :param resume_path: Path to the uploaded resume (PDF), or its bytes / binary file-like object
+        :param job_list_path: Path to the job listings JSON file
+        :param job_list: Already loaded job descriptions, shared when screening many resumes
+        :return: Final output containing results from all agents, with a JSON summary of stage
+            timings and LLM usage under 'metrics'
+        """
+        with track_run() as run:
+            try:
+                resume_hash, resume_path = await asyncio.to_thread(self.fingerprint_resume, resume_path)
+                results = await self._run_stage_graph(self._resume_stages(resume_path, job_list_path, job_list))
+                final_output = {
+                    "extracted_data": results["extracted_data"],
+                    "analysis_results": results["analysis_results"],
+                    "matched_jobs": results["matched_jobs"],
+                    "screening_results": results["screening_results"],
+                    "recommendations": results["recommendations"],
+                }
+                await asyncio.to_thread(self.save_profile, resume_hash, final_output, job_list_path)
+
+            except StageFailed as e:
+                final_output = {"error": str(e)}
+            except Exception as e:
+                error_message = f"Error in Orchestrator: {str(e)}"
+                self.extractor_agent.log(error_message, "error")
+                run.stage_failed()
+                final_output = {"error": error_message}
+
+            final_output["metrics"] = run.summary()
             return final_output
 
-        except Exception as e:
-            error_message = f"Error in Orchestrator: {str(e)}"
-            self.extractor_agent.log(error_message, "error")
-            return {"error": error_message}
+    async def process_resumes_async(self, resume_paths, job_list_path, max_concurrency=4):
+        """
+        Process many resumes on one event loop with bounded concurrency.
+        The job list is loaded once and shared by every resume.
+        :param resume_paths: Iterable of resume PDF paths
+        :param job_list_path: Path to the job listings JSON file
+        :param max_concurrency: Maximum number of resumes in flight at once
+        :return: List of final outputs in the same order as resume_paths
+        """
+        job_list = await asyncio.to_thread(self.matcher_agent.load_job_data, job_list_path)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(resume_path):
+            async with semaphore:
+                return await self.process_resume_async(resume_path, job_list_path, job_list)
+
+        return await asyncio.gather(*(bounded(path) for path in resume_paths))
+
+    def catalog_diff(self, old_version, catalog):
+        """
+        Jobs that changed between a recorded catalog version and the current catalog.
+        :param old_version: Catalog version a stored result was matched against
+        :param catalog: Current JobCatalog
+        :return: Tuple of (jobs to score again, lower-cased titles whose old matches are stale);
+            the stale titles are None when the old version is unknown and every match is stale
+        """
+        catalog_snapshot = catalog.snapshot
+        jobs = catalog_snapshot[0]
+        recorded = get_profile_store().get_catalog_snapshot(old_version) if old_version else None
+        if recorded is None:
+            return list(jobs), None
+        current = catalog.job_versions(catalog_snapshot)
+        changed = [job for job in jobs if recorded.get(job.get("title")) != current.get(job.get("title"))]
+        stale = {title.strip().lower() for title in set(recorded) - set(current) if title}
+        stale.update(job.get("title", "").strip().lower() for job in changed)
+        return changed, stale
+
+    def rematch_profile(self, resume_hash, result, changed_jobs, stale_titles, job_list_path):
+        """
+        Bring one stored result up to date with the catalog: score only the changed jobs, keep
+        every other match, and rerun screening and recommendation only if the top matches moved.
+        Extraction and analysis are reused as stored.
+        :return: 'rescored', 'rescreened' or 'failed'
+        """
+        extracted = result.get("extracted_data") or {}
+        analysis = result.get("analysis_results") or {}
+        old_matches = result.get("matched_jobs") or []
+        kept = [] if stale_titles is None else [
+            m for m in old_matches if m.get("title", "").strip().lower() not in stale_titles
+        ]
+
+        rescored = []
+        profile = self.matching_profile(extracted, analysis)
+        if changed_jobs and stale_titles is None:
+            # Unknown catalog version: match against the whole catalog like a new resume.
+            matches = self.matcher_agent.process(profile, job_list_path, changed_jobs)
+            if not matches:
+                return "failed"
+            rescored, _ = self.matcher_agent.assign_matches(matches, changed_jobs)
+        elif changed_jobs:
+            # Score every changed job; a shortlist would drop edited jobs that miss it.
+            rescored = self.matcher_agent.score_jobs(profile, changed_jobs)
+            if not rescored:
+                return "failed"
+
+        matched_jobs = sorted(kept + rescored, key=lambda m: m.get("confidence_score", 0), reverse=True)
+        updated = {**result, "matched_jobs": matched_jobs}
+        outcome = "rescored"
+        if top_matches(matched_jobs) != top_matches(old_matches):
+            screening_results = self.screener_agent.process(
+                analysis, matched_jobs, extracted, self.matcher_agent.load_job_data(job_list_path)
+            )
+            recommendations = self.recommender_agent.recommend(analysis, screening_results, matched_jobs)
+            if not screening_results or not recommendations:
+                return "failed"
+            updated["screening_results"] = screening_results
+            updated["recommendations"] = recommendations
+            outcome = "rescreened"
+
+        self.save_profile(resume_hash, updated, job_list_path)
+        return outcome
+
+    def rematch_catalog(self, job_list_path, workers=4):
+        """
+        Incrementally update every stored result after the job catalog changed.
+        Results already matched against the current catalog version are skipped; for the rest
+        only the (candidate, job) pairs whose job was added or edited are scored again.
+        Requests are scheduled with batch priority, behind interactive users.
+        :param job_list_path: Path to the job listings file
+        :param workers: Candidates updated concurrently
+        :return: Counters: candidates, unchanged, rescored, rescreened, failed, pairs_scored,
+            and stale_extraction (results from an older extractor, which need a full rerun)
+        """
+        store = get_profile_store()
+        stats = collections.Counter(candidates=0, unchanged=0, rescored=0, rescreened=0, failed=0,
+                                    pairs_scored=0, stale_extraction=0)
+        if store is None:
+            self.extractor_agent.log("No profile store configured; nothing to re-match", "error")
+            return dict(stats)
+
+        self.matcher_agent.load_job_data(job_list_path)
+        catalog = get_job_catalog(job_list_path)
+        # Compare every stored result against the same catalog version, even if the file
+        # changes while the run is in progress.
+        current_version = catalog.version
+        diffs = {}
+
+        def outcome(future):
+            try:
+                return future.result()
+            except Exception as e:
+                self.matcher_agent.log(f"Re-matching error: {str(e)}", "error")
+                return "failed"
+
+        with llm_priority("batch", session="rematch"), \
+                concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for resume_hash, result, deps in store.iter_profiles():
+                stats["candidates"] += 1
+                if deps.get("extraction") != self.extractor_agent.version:
+                    stats["stale_extraction"] += 1
+                old_version = (deps.get("matching") or {}).get("catalog")
+                if old_version == current_version:
+                    stats["unchanged"] += 1
+                    continue
+                if old_version not in diffs:
+                    diffs[old_version] = self.catalog_diff(old_version, catalog)
+                changed_jobs, stale_titles = diffs[old_version]
+                stats["pairs_scored"] += len(changed_jobs)
+                pending.add(pool.submit(
+                    propagate_context(self.rematch_profile), resume_hash, result, changed_jobs, stale_titles, job_list_path
+                ))
+                # Bound the number of stored results held in memory at once.
+                if len(pending) >= workers * 2:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        stats[outcome(future)] += 1
+            for future in concurrent.futures.as_completed(pending):
+                stats[outcome(future)] += 1
+
+        self.matcher_agent.log(
+            f"Re-matched {stats['candidates'] - stats['unchanged']} of {stats['candidates']} stored candidates: "
+            f"{stats['pairs_scored']} candidate-job pairs scored, {stats['rescreened']} re-screened"
+        )
+        return dict(stats)
 
 
 def main():
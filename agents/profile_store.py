@@ -0,0 +1,275 @@
+import json
+import os
+import threading
+import time
+
+from .cache import SQLiteDatabase
+from .job_index import normalize_skill
+
+SCORE_FIELDS = (
+    "qualification_alignment_score",
+    "experience_relevance_score",
+    "skills_match_score",
+    "potential_red_flags_score",
+)
+
+
+def top_matched_job(result):
+    """
+    Title of a result's best job match: the matcher's top job, or the recommender's pick.
+    """
+    matched = result.get("matched_jobs") or []
+    if matched and matched[0].get("title"):
+        return matched[0]["title"]
+    return (result.get("recommendations") or {}).get("top_matched_job") or None
+
+
+class ProfileStore(SQLiteDatabase):
+    """
+    Persistent store of full pipeline results, one row per resume keyed by the SHA-256 of
+    the PDF. Skills, top matched job and screening scores are kept in indexed columns, so
+    candidate queries are answered from SQLite indexes instead of reprocessing resumes.
+    """
+    def create_schema(self, conn):
+        scores = ", ".join(f"{field} REAL" for field in SCORE_FIELDS)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "resume_hash TEXT PRIMARY KEY, name TEXT, top_matched_job TEXT COLLATE NOCASE, "
+            f"{scores}, confidence_score REAL, result TEXT NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidate_skills ("
+            "skill TEXT NOT NULL, resume_hash TEXT NOT NULL, PRIMARY KEY (skill, resume_hash)) WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS candidates_job_idx ON candidates (top_matched_job, skills_match_score)"
+        )
+        for field in SCORE_FIELDS:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS candidates_{field}_idx ON candidates ({field})")
+        conn.execute("CREATE INDEX IF NOT EXISTS candidate_skills_hash_idx ON candidate_skills (resume_hash)")
+        # Stores created before stage dependencies were tracked lack the deps column.
+        if "deps" not in {row[1] for row in conn.execute("PRAGMA table_info(candidates)")}:
+            conn.execute("ALTER TABLE candidates ADD COLUMN deps TEXT")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS catalog_snapshots (version TEXT PRIMARY KEY, job_versions TEXT NOT NULL)"
+        )
+
+    def __len__(self):
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def version(self):
+        """
+        Token that changes whenever a result is saved or deleted, for indexes built from the store.
+        """
+        with self._lock:
+            count, updated_at = self._db().execute(
+                "SELECT COUNT(*), MAX(updated_at) FROM candidates"
+            ).fetchone()
+        return f"{count}-{updated_at or 0:.6f}"
+
+    def save(self, resume_hash, result, deps=None):
+        """
+        Insert or replace the result for a resume.
+        :param resume_hash: SHA-256 hex digest of the resume PDF
+        :param result: Orchestrator output with every stage's results
+        :param deps: Inputs each stage was computed from (see Orchestrator.stage_dependencies)
+        """
+        extracted = result.get("extracted_data") or {}
+        analysis = result.get("analysis_results") or {}
+        screening = result.get("screening_results") or {}
+        skills = {normalize_skill(s) for s in extracted.get("skills", []) if s} - {""}
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT INTO candidates (resume_hash, name, top_matched_job, "
+                f"{', '.join(SCORE_FIELDS)}, confidence_score, result, deps, created_at, updated_at) "
+                f"VALUES ({', '.join('?' * (len(SCORE_FIELDS) + 8))}) "
+                "ON CONFLICT(resume_hash) DO UPDATE SET name = excluded.name, "
+                "top_matched_job = excluded.top_matched_job, "
+                + "".join(f"{field} = excluded.{field}, " for field in SCORE_FIELDS)
+                + "confidence_score = excluded.confidence_score, result = excluded.result, "
+                "deps = excluded.deps, updated_at = excluded.updated_at",
+                (
+                    resume_hash,
+                    extracted.get("name"),
+                    top_matched_job(result),
+                    *(screening.get(field) for field in SCORE_FIELDS),
+                    analysis.get("confidence_score"),
+                    json.dumps(result),
+                    json.dumps(deps) if deps is not None else None,
+                    now,
+                    now,
+                ),
+            )
+            db.execute("DELETE FROM candidate_skills WHERE resume_hash = ?", (resume_hash,))
+            db.executemany(
+                "INSERT INTO candidate_skills (skill, resume_hash) VALUES (?, ?)",
+                [(skill, resume_hash) for skill in skills],
+            )
+            db.commit()
+
+    def get(self, resume_hash):
+        """
+        Return the stored result for a resume, or None.
+        """
+        with self._lock:
+            row = self._db().execute(
+                "SELECT result FROM candidates WHERE resume_hash = ?", (resume_hash,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_profile(self, resume_hash):
+        """
+        Return the stored (result, stage dependencies) pair for a resume, or None.
+        """
+        with self._lock:
+            row = self._db().execute(
+                "SELECT result, deps FROM candidates WHERE resume_hash = ?", (resume_hash,)
+            ).fetchone()
+        return (json.loads(row[0]), json.loads(row[1]) if row[1] else {}) if row else None
+
+    def delete(self, resume_hash):
+        """
+        Remove a resume from the store.
+        """
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM candidate_skills WHERE resume_hash = ?", (resume_hash,))
+            db.execute("DELETE FROM candidates WHERE resume_hash = ?", (resume_hash,))
+            db.commit()
+
+    def query(self, skills=None, top_matched_job=None, min_scores=None, max_scores=None,
+              limit=None, include_results=False):
+        """
+        Find candidates by skills, top matched job and screening score ranges, e.g.
+        query(top_matched_job="Data Scientist", min_scores={"skills_match_score": 0.7}).
+        :param skills: Skills every returned candidate must list (normalized before matching)
+        :param top_matched_job: Top matched job title (case-insensitive)
+        :param min_scores: Dictionary of score field to inclusive lower bound
+        :param max_scores: Dictionary of score field to inclusive upper bound
+        :param limit: Maximum number of rows
+        :param include_results: Also return each full stored result under 'result'
+        :return: List of dictionaries, best skills match first
+        """
+        columns = ["resume_hash", "name", "top_matched_job", *SCORE_FIELDS, "confidence_score", "updated_at"]
+        if include_results:
+            columns.append("result")
+        where, params = [], []
+        if top_matched_job:
+            where.append("top_matched_job = ?")
+            params.append(top_matched_job)
+        for bounds, operator in ((min_scores, ">="), (max_scores, "<=")):
+            for field, value in (bounds or {}).items():
+                if field not in SCORE_FIELDS:
+                    raise ValueError(f"Unknown score field: {field}")
+                where.append(f"{field} {operator} ?")
+                params.append(value)
+        wanted = sorted({normalize_skill(s) for s in skills or [] if s} - {""})
+        if wanted:
+            where.append(
+                "resume_hash IN (SELECT resume_hash FROM candidate_skills "
+                f"WHERE skill IN ({', '.join('?' * len(wanted))}) GROUP BY resume_hash HAVING COUNT(*) = ?)"
+            )
+            params.extend(wanted)
+            params.append(len(wanted))
+
+        sql = f"SELECT {', '.join(columns)} FROM candidates"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY skills_match_score DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._db().execute(sql, params).fetchall()
+        results = [dict(zip(columns, row)) for row in rows]
+        if include_results:
+            for row in results:
+                row["result"] = json.loads(row["result"])
+        return results
+
+    def iter_results(self):
+        """
+        Yield every stored (resume hash, result) pair.
+        """
+        for resume_hash, result, _ in self.iter_profiles():
+            yield resume_hash, result
+
+    def iter_profiles(self, batch_size=500):
+        """
+        Yield every stored (resume hash, result, stage dependencies) triple, reading the table
+        in batches so large stores are never loaded at once.
+        """
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._db().execute(
+                    "SELECT rowid, resume_hash, result, deps FROM candidates WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for rowid, resume_hash, result, deps in rows:
+                yield resume_hash, json.loads(result), json.loads(deps) if deps else {}
+            last = rows[-1][0]
+
+    def save_catalog_snapshot(self, version, job_versions):
+        """
+        Record the per-job versions of a catalog version, once.
+        :param version: JobCatalog.version
+        :param job_versions: Dictionary of job title to job version
+        """
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR IGNORE INTO catalog_snapshots (version, job_versions) VALUES (?, ?)",
+                (version, json.dumps(job_versions)),
+            )
+            db.commit()
+
+    def get_catalog_snapshot(self, version):
+        """
+        Per-job versions of an earlier catalog version, or None when it was never recorded.
+        """
+        with self._lock:
+            row = self._db().execute(
+                "SELECT job_versions FROM catalog_snapshots WHERE version = ?", (version,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+_store = None
+_store_configured = False
+_store_lock = threading.Lock()
+
+
+def get_profile_store():
+    """
+    Return the process-wide profile store at PROFILE_STORE_PATH
+    (default .cache/profiles.sqlite3; empty disables it).
+    :return: ProfileStore instance, or None when disabled
+    """
+    global _store, _store_configured
+    if not _store_configured:
+        with _store_lock:
+            if not _store_configured:
+                path = os.environ.get("PROFILE_STORE_PATH", os.path.join(".cache", "profiles.sqlite3"))
+                _store = ProfileStore(path) if path else None
+                _store_configured = True
+    return _store
+
+
+def set_profile_store(store):
+    """
+    Replace the process-wide profile store, e.g. after changing PROFILE_STORE_PATH.
+    :param store: ProfileStore instance, or None to rebuild it from the environment on next use
+    :return: The previously installed store
+    """
+    global _store, _store_configured
+    with _store_lock:
+        previous, _store, _store_configured = _store, store, store is not None
+    return previous
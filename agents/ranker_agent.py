@@ -0,0 +1,87 @@
+from .base_agent import BaseAgent
+
+
+class RankerAgent(BaseAgent):
+    """
+    Re-ranks a short list of candidates for one job with the LLM. Used after the
+    CandidatePool has narrowed a large pool down to its top N.
+    """
+    def __init__(self):
+        super().__init__("RankerAgent")
+
+    def process(self, job, candidates):
+        """
+        Score each candidate's fit for a job.
+        :param job: Job dictionary with 'title', 'description' and 'required_skills'
+        :param candidates: List of candidate dictionaries, in their current order
+        :return: Dictionary of candidate position to {'confidence_score', 'reasoning'};
+            candidates the model did not score are absent
+        """
+        self.log(f"Re-ranking {len(candidates)} candidates for {job.get('title', 'Unknown')}")
+
+        prompt = (
+            "As an AI recruiter, rank these candidates for the job below.\n\n"
+            f"Job:\n"
+            f"Title: {job.get('title', 'N/A')}\n"
+            f"Description: {job.get('description', 'N/A')}\n"
+            f"Required Skills: {', '.join(job.get('required_skills', []))}\n\n"
+            "Candidates:\n"
+        )
+        prompt += "".join(
+            f"\nCandidate {i}:\n"
+            f"- Skills: {', '.join(candidate.get('skills', []))}\n"
+            f"- Education: {'; '.join(candidate.get('education', []))}\n"
+            f"- Experience: {'; '.join(candidate.get('experience', []))}\n"
+            f"- Strengths: {', '.join(candidate.get('strengths', []))}\n"
+            for i, candidate in enumerate(candidates, start=1)
+        )
+        prompt += (
+            "\nFor each candidate, provide a match score and brief explanation in this format:\n"
+            "Candidate: [candidate number]\n"
+            "Match Score: [0.0 to 1.0]\n"
+            "Reasoning: [brief explanation of the fit]\n"
+        )
+
+        try:
+            llama_response = self.ollama_request(prompt)
+
+            if llama_response:
+                return self.parse_llama_response(llama_response, len(candidates))
+            else:
+                self.log("No response from Llama", "error")
+                return {}
+
+        except Exception as e:
+            self.log(f"Re-ranking error: {str(e)}", "error")
+            return {}
+
+    def parse_llama_response(self, response, count=None):
+        """
+        Parse per-candidate scores.
+        :param response: Raw response text from Llama, or an iterable of its lines
+        :param count: Number of candidates in the prompt; other numbers are ignored
+        :return: Dictionary of candidate position (0-based) to {'confidence_score', 'reasoning'}
+        """
+        scores = {}
+        current = None
+        for line in self.iter_lines(response):
+            line = line.strip()
+            lower = line.lower()
+            if lower.startswith("candidate:"):
+                digits = "".join(ch for ch in line.split(":", 1)[1] if ch.isdigit())
+                current = int(digits) - 1 if digits else None
+                if current is not None and (current < 0 or (count is not None and current >= count)):
+                    current = None
+                if current is not None:
+                    scores.setdefault(current, {"confidence_score": 0.0, "reasoning": ""})
+            elif current is None:
+                continue
+            elif lower.startswith("match score:") or lower.startswith("score:"):
+                try:
+                    score = float(line.split(":", 1)[1].strip().split()[0])
+                    scores[current]["confidence_score"] = min(max(score, 0.0), 1.0)
+                except (ValueError, IndexError):
+                    scores[current]["confidence_score"] = 0.0
+            elif lower.startswith("reasoning:"):
+                scores[current]["reasoning"] = line.split(":", 1)[1].strip()
+        return scores
@@ -63,7 +63,7 @@ class RecommenderAgent(BaseAgent):
 
         try:
             current_section = None
-            for line in response.split("\n"):
+            for line in self.iter_lines(response):
                 line = line.strip()
                 if not line:
                     continue
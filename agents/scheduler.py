@@ -0,0 +1,158 @@
+import collections
+import contextlib
+import contextvars
+import os
+import threading
+import time
+
+from .metrics import get_metrics, record_queue_wait
+
+# Priority classes, most urgent first. A free slot always goes to the most urgent class
+# with waiting requests.
+PRIORITIES = ("interactive", "batch", "background")
+
+_priority = contextvars.ContextVar("llm_priority", default=None)
+_session = contextvars.ContextVar("llm_session", default=None)
+
+
+@contextlib.contextmanager
+def llm_priority(priority, session=None):
+    """
+    Within this block, LLM requests are scheduled with this priority class and session.
+    The settings follow asyncio tasks, and thread pools that use metrics.propagate_context.
+    :param priority: One of PRIORITIES
+    :param session: Identifier requests are queued fairly by, e.g. a UI session or batch job;
+        None keeps the enclosing session
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    priority_token = _priority.set(priority)
+    session_token = _session.set(session if session is not None else _session.get())
+    try:
+        yield
+    finally:
+        _session.reset(session_token)
+        _priority.reset(priority_token)
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM requests. At most max_in_flight requests run at
+    once, matching the server's parallel slots, so a burst of batch work cannot queue
+    unbounded requests on the server ahead of interactive users.
+
+    Waiting requests are served strictly by priority class. Within a class, sessions take
+    turns: each freed slot goes to the next session in round-robin order, so one session
+    with many requests (a large batch, a chunked extraction) does not starve the others.
+    """
+    def __init__(self, max_in_flight=None, default_priority=None):
+        """
+        :param max_in_flight: Concurrent requests allowed, 0 for unlimited (LLM_MAX_IN_FLIGHT, default 4)
+        :param default_priority: Priority of requests made outside llm_priority()
+            (LLM_DEFAULT_PRIORITY, default 'interactive')
+        """
+        self.max_in_flight = int(
+            max_in_flight if max_in_flight is not None else os.environ.get("LLM_MAX_IN_FLIGHT", 4)
+        )
+        self.default_priority = default_priority or os.environ.get("LLM_DEFAULT_PRIORITY", "interactive")
+        if self.default_priority not in PRIORITIES:
+            raise ValueError(f"Unknown LLM priority: {self.default_priority}")
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        # Per priority: session -> waiting events, in round-robin order
+        self._queues = {priority: collections.OrderedDict() for priority in PRIORITIES}
+        self._queued = collections.Counter()
+
+    def queued(self):
+        """
+        Number of waiting requests per priority class.
+        """
+        with self._lock:
+            return {priority: self._queued[priority] for priority in PRIORITIES}
+
+    @contextlib.contextmanager
+    def slot(self, agent=None):
+        """
+        Hold one in-flight slot for the duration of the block, waiting for it if needed.
+        :param agent: Agent name the wait is attributed to in the run metrics
+        :return: Context manager yielding the seconds spent waiting
+        """
+        priority = _priority.get() or self.default_priority
+        start = time.perf_counter()
+        if self.max_in_flight <= 0:
+            yield 0.0
+            return
+
+        waiter = None
+        with self._lock:
+            if self.in_flight < self.max_in_flight and not any(self._queues.values()):
+                self.in_flight += 1
+            else:
+                waiter = threading.Event()
+                self._queues[priority].setdefault(_session.get(), collections.deque()).append(waiter)
+                self._queued[priority] += 1
+            self._publish()
+        if waiter is not None:
+            waiter.wait()
+
+        wait = time.perf_counter() - start
+        record_queue_wait(priority, wait, agent)
+        try:
+            yield wait
+        finally:
+            self._release()
+
+    def _release(self):
+        """
+        Hand the finished request's slot to the next waiter, or free it.
+        """
+        with self._lock:
+            for priority in PRIORITIES:
+                sessions = self._queues[priority]
+                if sessions:
+                    session, waiters = next(iter(sessions.items()))
+                    waiter = waiters.popleft()
+                    # Move the session to the back of the rotation, or drop it when drained.
+                    del sessions[session]
+                    if waiters:
+                        sessions[session] = waiters
+                    self._queued[priority] -= 1
+                    waiter.set()
+                    break
+            else:
+                self.in_flight -= 1
+            self._publish()
+
+    def _publish(self):
+        metrics = get_metrics()
+        metrics.set_gauge("llm_in_flight", self.in_flight)
+        for priority in PRIORITIES:
+            metrics.set_gauge("llm_queued", self._queued[priority], priority=priority)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    Return the process-wide scheduler every agent's LLM requests go through.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
+
+
+def set_scheduler(scheduler):
+    """
+    Replace the process-wide scheduler, e.g. after changing LLM_MAX_IN_FLIGHT.
+    :param scheduler: LLMScheduler instance, or None to rebuild it from the environment on next use
+    :return: The previously installed scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        previous, _scheduler = _scheduler, scheduler
+    return previous
@@ -0,0 +1,202 @@
+import datetime
+import re
+
+from .job_index import normalize_skill, tokenize
+
+DEFAULT_WEIGHTS = {
+    # Credit for a required skill the candidate lists exactly vs. only as a partial
+    # match (e.g. 'python' against 'python 3').
+    "skill_exact": 1.0,
+    "skill_partial": 0.5,
+    # qualification_alignment = level * degree level + relevance * field overlap with the job
+    "qualification_level": 0.6,
+    "qualification_relevance": 0.4,
+    # experience_relevance = relevance * term overlap with the job + years * seniority
+    "experience_relevance": 0.6,
+    "experience_years": 0.4,
+    "target_years": 5.0,
+    # Number of top matched jobs considered, weighted by their match confidence.
+    "top_jobs": 3,
+    # potential_red_flags = missing * share of missing profile sections
+    #   + weaknesses * recorded weaknesses (saturating at weakness_cap)
+    #   + confidence * (1 - profile confidence)
+    "red_flag_missing": 0.6,
+    "red_flag_weaknesses": 0.2,
+    "red_flag_confidence": 0.2,
+    "weakness_cap": 4,
+    # Fewer listed skills than this counts as a missing section.
+    "min_skills": 3,
+}
+
+DEGREE_LEVELS = [
+    (1.0, ("phd", "ph.d", "doctor", "doctorate")),
+    (0.85, ("master", "msc", "m.sc", "mba", "m.s", "meng", "magister")),
+    (0.7, ("bachelor", "bsc", "b.sc", "b.s", "beng", "b.tech", "sarjana", "undergraduate")),
+    (0.5, ("associate", "diploma", "certificate", "certification", "bootcamp")),
+    (0.3, ("high school", "secondary")),
+]
+
+_YEAR_RANGE_RE = re.compile(r"((?:19|20)\d{2})\s*(?:-|–|to)\s*((?:19|20)\d{2}|present|current|now)", re.I)
+_YEARS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)", re.I)
+_MONTHS_RE = re.compile(r"(\d+)\s*(?:months?|mos?)", re.I)
+
+
+def _clamp(value):
+    return max(0.0, min(float(value), 1.0))
+
+
+def skill_overlap(candidate_skills, required_skills, weights=DEFAULT_WEIGHTS):
+    """
+    Share of a job's required skills covered by the candidate.
+    :param candidate_skills: Skills extracted from the resume
+    :param required_skills: Skills listed by the job
+    :return: Score between 0 and 1
+    """
+    required = {normalize_skill(s) for s in required_skills if s} - {""}
+    if not required:
+        return 0.0
+    candidate = {normalize_skill(s) for s in candidate_skills if s} - {""}
+    candidate_tokens = [set(c.split()) for c in candidate]
+    credit = 0.0
+    for skill in required:
+        if skill in candidate:
+            credit += weights["skill_exact"]
+        else:
+            tokens = set(skill.split())
+            if any(tokens <= c or c <= tokens for c in candidate_tokens):
+                credit += weights["skill_partial"]
+    return _clamp(credit / (len(required) * weights["skill_exact"]))
+
+
+def degree_level(education):
+    """
+    Highest degree level found in the education entries (0 when none is recognised).
+    """
+    best = 0.0
+    for entry in education:
+        text = entry.lower()
+        for level, keywords in DEGREE_LEVELS:
+            if level > best and any(k in text for k in keywords):
+                best = level
+    return best
+
+
+def years_of_experience(experience, current_year=None):
+    """
+    Estimate total years of experience from durations like '3 years', '18 months' or '2019 - 2022'.
+    """
+    current_year = current_year or datetime.date.today().year
+    total = 0.0
+    for entry in experience:
+        ranges = _YEAR_RANGE_RE.findall(entry)
+        if ranges:
+            for start, end in ranges:
+                end_year = current_year if not end[:1].isdigit() else int(end)
+                total += max(end_year - int(start), 0)
+            continue
+        years = _YEARS_RE.findall(entry)
+        if years:
+            total += sum(float(y) for y in years)
+            continue
+        total += sum(int(m) for m in _MONTHS_RE.findall(entry)) / 12.0
+    return total
+
+
+def term_relevance(entries, job):
+    """
+    Share of a job's title and description terms that appear in the given resume entries.
+    """
+    job_terms = set(tokenize(f"{job.get('title', '')} {job.get('description', '')}"))
+    job_terms.update(t for s in job.get("required_skills", []) for t in normalize_skill(s).split())
+    if not job_terms:
+        return 0.0
+    entry_terms = set(tokenize(" ".join(entries)))
+    # A handful of shared terms already signals a relevant background.
+    return _clamp(len(job_terms & entry_terms) / min(len(job_terms), 8))
+
+
+class ScoringEngine:
+    """
+    Deterministic, sub-millisecond screening scores computed from structured resume data
+    and the job catalog, producing the same keys as the LLM-based ScreenerAgent.
+    """
+    def __init__(self, weights=None):
+        """
+        :param weights: Overrides for DEFAULT_WEIGHTS
+        """
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+    def resolve_jobs(self, matched_jobs, job_list):
+        """
+        Map the matcher's top results back to catalog entries by title.
+        :return: List of (catalog job, match confidence) tuples
+        """
+        by_title = {job.get("title", "").strip().lower(): job for job in job_list or []}
+        resolved = []
+        for match in matched_jobs[:int(self.weights["top_jobs"])]:
+            title = (match.get("title") or match.get("job_title") or "").strip().lower()
+            if not title:
+                # An empty title would be contained in every catalog title.
+                continue
+            job = by_title.get(title)
+            if job is None:
+                job = next((j for t, j in by_title.items() if t and (t in title or title in t)), None)
+            if job is not None:
+                resolved.append((job, match.get("confidence_score", 0.0) or 0.0))
+        return resolved
+
+    def score(self, extracted_data, analysis_results, matched_jobs, job_list):
+        """
+        Compute the four screening scores.
+        :param extracted_data: Output of ExtractorAgent
+        :param analysis_results: Output of AnalyzerAgent
+        :param matched_jobs: Output of MatcherAgent
+        :param job_list: Job catalog used for matching
+        :return: Screening results dictionary
+        """
+        w = self.weights
+        skills = extracted_data.get("skills", [])
+        education = extracted_data.get("education", [])
+        experience = extracted_data.get("experience", [])
+
+        jobs = self.resolve_jobs(matched_jobs, job_list)
+        total_confidence = sum(conf for _, conf in jobs)
+
+        def weighted(score_fn):
+            if not jobs:
+                return 0.0
+            if not total_confidence:
+                return sum(score_fn(job) for job, _ in jobs) / len(jobs)
+            return sum(score_fn(job) * conf for job, conf in jobs) / total_confidence
+
+        skills_match = weighted(lambda job: skill_overlap(skills, job.get("required_skills", []), w))
+
+        level = degree_level(education)
+        qualification = w["qualification_level"] * level + w["qualification_relevance"] * weighted(
+            lambda job: term_relevance(education, job)
+        )
+
+        seniority = _clamp(years_of_experience(experience) / w["target_years"]) if w["target_years"] else 0.0
+        relevance = weighted(lambda job: term_relevance(experience + skills, job))
+        experience_score = w["experience_relevance"] * relevance + w["experience_years"] * seniority
+
+        # Red flags grow with missing sections and recorded weaknesses, and shrink with profile confidence.
+        flags = [
+            not extracted_data.get("name"),
+            not education,
+            not experience,
+            len(skills) < w["min_skills"],
+        ]
+        weaknesses = len([weakness for weakness in analysis_results.get("weaknesses", []) if weakness])
+        red_flags = (
+            w["red_flag_missing"] * sum(flags) / len(flags)
+            + w["red_flag_weaknesses"] * (_clamp(weaknesses / w["weakness_cap"]) if w["weakness_cap"] else 0.0)
+            + w["red_flag_confidence"] * (1.0 - _clamp(analysis_results.get("confidence_score", 0.0) or 0.0))
+        )
+
+        return {
+            "qualification_alignment_score": round(_clamp(qualification), 3),
+            "experience_relevance_score": round(_clamp(experience_score), 3),
+            "skills_match_score": round(_clamp(skills_match), 3),
+            "potential_red_flags_score": round(_clamp(red_flags), 3),
+        }
@@ -1,20 +1,104 @@
+import json
 import logging
+import os
 from .base_agent import BaseAgent
+from .scoring import ScoringEngine
 
 class ScreenerAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, mode=None, weights=None, borderline=None):
+        """
+        :param mode: 'llm' to ask the model for every score, 'deterministic' to compute scores from
+            structured data only, or 'hybrid' to compute scores and consult the LLM only for
+            borderline candidates (SCREENER_MODE, default 'llm')
+        :param weights: Scoring weight overrides (SCREENER_WEIGHTS as a JSON object)
+        :param borderline: (low, high) band of the mean computed score that triggers the LLM in
+            hybrid mode (SCREENER_BORDERLINE as 'low,high', default 0.4,0.6)
+        """
         super().__init__("ScreenerAgent")
-
-    def process(self, analysis_results, matched_jobs):
+        self.mode = mode or os.environ.get("SCREENER_MODE", "llm")
+        if weights is None and os.environ.get("SCREENER_WEIGHTS"):
+            weights = json.loads(os.environ["SCREENER_WEIGHTS"])
+        self.scoring_engine = ScoringEngine(weights)
+        if borderline is None:
+            borderline = tuple(float(x) for x in os.environ.get("SCREENER_BORDERLINE", "0.4,0.6").split(","))
+        self.borderline = borderline
+
+    def process(self, analysis_results, matched_jobs, extracted_data=None, job_list=None):
         """
         Screen the candidate based on analysis results and matched jobs.
         :param analysis_results: Dictionary containing analysis results from AnalyzerAgent.
         :param matched_jobs: List of matched jobs from MatcherAgent.
+        :param extracted_data: Extracted resume data, required for deterministic and hybrid modes.
+        :param job_list: Job catalog used for matching, required for deterministic and hybrid modes.
+        :return: Screening results as a dictionary.
+        """
+        if self.mode in ("deterministic", "hybrid") and extracted_data is not None:
+            return self.score(analysis_results, matched_jobs, extracted_data, job_list)
+        return self.llm_screen(analysis_results, matched_jobs)
+
+    def score(self, analysis_results, matched_jobs, extracted_data, job_list):
+        """
+        Compute screening scores deterministically. In hybrid mode, borderline candidates are
+        also screened by the LLM and its judgement is averaged into every score except
+        skills_match_score, which is exact.
+        :return: Screening results as a dictionary.
+        """
+        self.log("Starting deterministic screening")
+        screening_results = self.scoring_engine.score(extracted_data, analysis_results, matched_jobs, job_list)
+        if self.mode != "hybrid":
+            return screening_results
+
+        positive = [
+            screening_results["qualification_alignment_score"],
+            screening_results["experience_relevance_score"],
+            screening_results["skills_match_score"],
+        ]
+        overall = sum(positive) / len(positive)
+        low, high = self.borderline
+        if not low <= overall <= high:
+            return screening_results
+
+        self.log(f"Borderline candidate (overall {overall:.2f}), consulting LLM")
+        try:
+            llama_response = self.ollama_request(self.build_prompt(analysis_results, matched_jobs))
+        except Exception as e:
+            self.log(f"Screening error: {str(e)}", "error")
+            llama_response = None
+        # Blend only the scores the model actually gave; a failed call keeps the computed scores.
+        llm_scores = self.parse_scores(llama_response) if llama_response else {}
+        if not llm_scores:
+            self.log("No LLM scores for borderline candidate, keeping deterministic scores", "error")
+        for key in ("qualification_alignment_score", "experience_relevance_score", "potential_red_flags_score"):
+            if key in llm_scores:
+                screening_results[key] = round((screening_results[key] + llm_scores[key]) / 2, 3)
+        return screening_results
+
+    def llm_screen(self, analysis_results, matched_jobs):
+        """
+        Ask the LLM to score the candidate.
+        :param analysis_results: Dictionary containing analysis results from AnalyzerAgent.
+        :param matched_jobs: List of matched jobs from MatcherAgent.
         :return: Screening results as a dictionary.
         """
         self.log("Starting screening process")
 
-        # Prepare a prompt to generate screening scores
+        try:
+            llama_response = self.ollama_request(self.build_prompt(analysis_results, matched_jobs))
+
+            if llama_response:
+                return self.parse_llama_response(llama_response)
+            else:
+                self.log("No response from Llama", "error")
+                return self.default_response()
+
+        except Exception as e:
+            self.log(f"Screening error: {str(e)}", "error")
+            return self.default_response()
+
+    def build_prompt(self, analysis_results, matched_jobs):
+        """
+        Prompt asking the LLM for the four screening scores.
+        """
         prompt = (
             "You are an AI recruiter. Based on the candidate's analysis and job matches, provide scores for the following categories on a scale of 0 to 1:\n"
             "- Qualification Alignment Score\n"
@@ -43,61 +127,53 @@ class ScreenerAgent(BaseAgent):
             "Skills Match Score: [0.0 to 1.0]\n"
             "Potential Red Flags Score: [0.0 to 1.0]\n"
         )
-
-        try:
-            llama_response = self.ollama_request(prompt)
-
-            if llama_response:
-                return self.parse_llama_response(llama_response)
-            else:
-                self.log("No response from Llama", "error")
-                return self.default_response()
-
-        except Exception as e:
-            self.log(f"Screening error: {str(e)}", "error")
-            return self.default_response()
+        return prompt
 
     def parse_llama_response(self, response):
         """
         Parse the response from Llama into structured screening results.
+        Scores missing from the response are 0.0.
         """
-        screening_results = {
-            "qualification_alignment_score": 0.0,
-            "experience_relevance_score": 0.0,
-            "skills_match_score": 0.0,
-            "potential_red_flags_score": 0.0,
-        }
+        return {**self.default_response(), **self.parse_scores(response)}
 
+    def parse_scores(self, response):
+        """
+        Parse only the scores present and valid in a response.
+        :return: Dictionary of score name to value; empty when nothing could be parsed
+        """
+        prefixes = {
+            "qualification alignment score:": "qualification_alignment_score",
+            "experience relevance score:": "experience_relevance_score",
+            "skills match score:": "skills_match_score",
+            "potential red flags score:": "potential_red_flags_score",
+        }
+        scores = {}
         try:
-            for line in response.split("\n"):
+            for line in self.iter_lines(response):
                 line = line.strip()
-                if not line:
-                    continue
-
-                if line.lower().startswith("qualification alignment score:"):
-                    screening_results["qualification_alignment_score"] = self.extract_score(line)
-                elif line.lower().startswith("experience relevance score:"):
-                    screening_results["experience_relevance_score"] = self.extract_score(line)
-                elif line.lower().startswith("skills match score:"):
-                    screening_results["skills_match_score"] = self.extract_score(line)
-                elif line.lower().startswith("potential red flags score:"):
-                    screening_results["potential_red_flags_score"] = self.extract_score(line)
+                for prefix, key in prefixes.items():
+                    if line.lower().startswith(prefix):
+                        score = self.extract_score(line)
+                        if score is not None:
+                            scores[key] = score
+                        break
 
         except Exception as e:
             self.log(f"Error parsing response: {str(e)}", "error")
 
-        return screening_results
+        return scores
 
     def extract_score(self, line):
         """
         Extract a numeric score from a line of text.
+        :return: Score clamped to 0-1, or None when the line holds no number
         """
         try:
             score = float(line.split(":")[1].strip())
             return max(0.0, min(score, 1.0))  # Ensure score is between 0 and 1
-        except ValueError:
+        except (ValueError, IndexError):
             self.log(f"Error extracting score from line: {line}", "error")
-            return 0.0
+            return None
 
     def default_response(self):
         """
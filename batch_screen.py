@@ -0,0 +1,177 @@
+"""
+Screen a directory or manifest of resume PDFs in bulk.
+
+Each candidate is written as one JSON line to the output file as soon as it finishes,
+so partial results survive interruptions. Failures are recorded and the run continues.
+
+Usage:
+    python batch_screen.py data/dummy_resumes -o results.jsonl --workers 8
+    python batch_screen.py --manifest resumes.txt -o results.jsonl --executor process
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+
+from agents.orchestrator import Orchestrator
+from agents.scheduler import llm_priority
+
+_orchestrator = None
+
+
+def _init_worker():
+    """
+    Build one Orchestrator per worker process.
+    """
+    global _orchestrator
+    _orchestrator = Orchestrator()
+
+
+def screen_resume(resume_path, job_list_path):
+    """
+    Run the full pipeline for one resume and wrap the outcome in a JSON-serialisable record.
+    :param resume_path: Path to the resume PDF
+    :param job_list_path: Path to the job listings JSON file
+    :return: Dictionary with the resume path, status, elapsed time and result or error
+    """
+    if _orchestrator is None:
+        _init_worker()
+
+    start = time.perf_counter()
+    try:
+        # Bulk work yields the LLM to interactive sessions sharing this process.
+        with llm_priority("batch", session="batch_screen"):
+            result = _orchestrator.process_resume(resume_path, job_list_path)
+        if "error" in result:
+            record = {"resume": resume_path, "status": "error", "error": result["error"]}
+        else:
+            record = {"resume": resume_path, "status": "ok", "result": result}
+    except Exception as e:
+        record = {"resume": resume_path, "status": "error", "error": str(e)}
+    record["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def collect_resumes(directory=None, manifest=None):
+    """
+    List the resumes to process.
+    :param directory: Directory searched recursively for PDF files
+    :param manifest: Text file with one path per line, or JSON lines with a 'path' field
+    :return: List of resume paths
+    """
+    paths = []
+    if directory:
+        for root, _, files in os.walk(directory):
+            for file_name in sorted(files):
+                if file_name.lower().endswith(".pdf"):
+                    paths.append(os.path.join(root, file_name))
+    if manifest:
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("{"):
+                    line = json.loads(line)["path"]
+                paths.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+    return paths
+
+
+def format_progress(done, failed, total, elapsed):
+    """
+    Format a one-line progress report with throughput and ETA.
+    """
+    rate = done / elapsed if elapsed else 0.0
+    eta = (total - done) / rate if rate else float("inf")
+    eta_text = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta != float("inf") else "--:--:--"
+    return f"[{done}/{total}] failed={failed} {rate:.2f} resumes/s elapsed={elapsed:.0f}s eta={eta_text}"
+
+
+def run_batch(resume_paths, job_list_path, output_path, workers=4, executor="thread", progress=sys.stderr):
+    """
+    Screen resumes with a bounded worker pool, streaming results to a JSON lines file.
+    :param resume_paths: List of resume paths
+    :param job_list_path: Path to the job listings JSON file
+    :param output_path: File receiving one JSON line per candidate
+    :param workers: Number of worker threads or processes
+    :param executor: 'thread' or 'process'
+    :param progress: Stream for progress output, or None to disable it
+    :return: Tuple of (processed count, failed count)
+    """
+    if executor == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    else:
+        # Worker threads share a single orchestrator and its pooled LLM client.
+        _init_worker()
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    total = len(resume_paths)
+    done = failed = 0
+    start = time.perf_counter()
+    # Future -> resume path, so a failed worker is still reported against its resume.
+    pending = {}
+    paths = iter(resume_paths)
+
+    with pool, open(output_path, "a", encoding="utf-8") as out:
+        while True:
+            # Keep at most two tasks per worker queued so memory stays flat for huge batches.
+            while len(pending) < workers * 2:
+                path = next(paths, None)
+                if path is None:
+                    break
+                pending[pool.submit(screen_resume, path, job_list_path)] = path
+            if not pending:
+                break
+
+            finished, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                path = pending.pop(future)
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # The worker itself failed, e.g. a worker process died.
+                    record = {"resume": path, "status": "error", "error": str(e)}
+                if record["status"] != "ok":
+                    failed += 1
+                done += 1
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                if progress:
+                    print(format_progress(done, failed, total, time.perf_counter() - start), file=progress)
+
+    return done, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", help="Directory searched recursively for PDF resumes")
+    parser.add_argument("--manifest", help="File listing resume paths, one per line")
+    parser.add_argument("--job-list", default=os.path.join("data", "job_list.json"))
+    parser.add_argument("-o", "--output", default="screening_results.jsonl", help="JSON lines output file")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    if not args.directory and not args.manifest:
+        parser.error("provide a directory or --manifest")
+
+    resume_paths = collect_resumes(args.directory, args.manifest)
+    if not resume_paths:
+        print("No resumes found.", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    done, failed = run_batch(resume_paths, args.job_list, args.output, args.workers, args.executor)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Processed {done} resumes ({failed} failed) in {elapsed:.1f}s; results written to {args.output}",
+        file=sys.stderr,
+    )
+    return 0 if failed < done else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Compare the sequential Orchestrator.process_resume path with process_resume_async.
+Response, extraction and profile caches are disabled, so every resume does the full work
+in both modes.
+
+Usage (from the repository root):
+    python -m benchmarks.async_vs_sync --resumes 8 --concurrency 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from agents.cache import set_cache
+from agents.orchestrator import Orchestrator
+from agents.profile_store import set_profile_store
+
+
+def run_sync(orchestrator, resume_paths, job_list_path):
+    """
+    Process resumes one after another on the calling thread.
+    :return: Tuple of (per-resume latencies, total wall time)
+    """
+    latencies = []
+    start = time.perf_counter()
+    for path in resume_paths:
+        t0 = time.perf_counter()
+        orchestrator.process_resume(path, job_list_path)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - start
+
+
+def run_async(orchestrator, resume_paths, job_list_path, concurrency):
+    """
+    Process resumes on one event loop with bounded concurrency.
+    :return: Tuple of (per-resume latencies, total wall time)
+    """
+    async def timed(path, job_list, semaphore):
+        async with semaphore:
+            t0 = time.perf_counter()
+            await orchestrator.process_resume_async(path, job_list_path, job_list)
+            return time.perf_counter() - t0
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(concurrency)
+        job_list = await asyncio.to_thread(orchestrator.matcher_agent.load_job_data, job_list_path)
+        return await asyncio.gather(*(timed(path, job_list, semaphore) for path in resume_paths))
+
+    start = time.perf_counter()
+    latencies = asyncio.run(run_all())
+    return list(latencies), time.perf_counter() - start
+
+
+def summarize(label, latencies, wall_time):
+    """
+    Build a summary row for one run.
+    """
+    return {
+        "mode": label,
+        "resumes": len(latencies),
+        "mean_latency_s": round(statistics.mean(latencies), 4),
+        "max_latency_s": round(max(latencies), 4),
+        "wall_time_s": round(wall_time, 4),
+        "resumes_per_s": round(len(latencies) / wall_time, 3) if wall_time else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resume", default=os.path.join("data", "dummy_resumes", "rama.pdf"))
+    parser.add_argument("--job-list", default=os.path.join("data", "job_list.json"))
+    parser.add_argument("--resumes", type=int, default=4, help="Number of resumes to process per mode")
+    parser.add_argument("--concurrency", type=int, default=4, help="Resumes in flight for the async mode")
+    args = parser.parse_args()
+
+    for variable in ("LLM_CACHE_PATH", "EXTRACTION_CACHE_PATH", "PROFILE_STORE_PATH"):
+        os.environ[variable] = ""
+    set_cache("LLM_CACHE", None)
+    set_cache("EXTRACTION_CACHE", None)
+    set_profile_store(None)
+    orchestrator = Orchestrator()
+    resume_paths = [args.resume] * args.resumes
+
+    rows = [
+        summarize("sync", *run_sync(orchestrator, resume_paths, args.job_list)),
+        summarize("async", *run_async(orchestrator, resume_paths, args.job_list, args.concurrency)),
+    ]
+    for row in rows:
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Deterministic stand-in for OllamaClient, for benchmarking the pipeline without a model.
+
+Every agent prompt gets a canned, well-formed answer (the matcher and ranker answers score
+the jobs and candidates actually listed in the prompt), and latency follows a simple model
+of a local server: prefill time per prompt token, generation time per response token, and
+at most `parallel` generations at once, like OLLAMA_NUM_PARALLEL.
+
+    from agents.ollama_client import set_default_client
+    set_default_client(FakeLLMClient(token_latency=0.01))
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+
+RESPONSES = {
+    "expert resume parser": (
+        "Name: Jordan Lee\n"
+        "Skills: Python, SQL, Machine Learning, Pandas, Docker, AWS, Statistics\n"
+        "Education:\n"
+        "- BSc Computer Science from State University, 2018\n"
+        "Experience:\n"
+        "- Data Scientist at Company 1, 2021 - present\n"
+        "- Data Analyst at Company 2, 2018 - 2021"
+    ),
+    "analyze this candidate": (
+        "Strengths: Python, statistical modelling, stakeholder communication\n"
+        "Weaknesses: cloud architecture, team leadership\n"
+        "Suggestions: earn a cloud certification, mentor junior analysts\n"
+        "Confidence Score: 0.8"
+    ),
+    "provide scores": (
+        "Qualification Alignment Score: 0.75\n"
+        "Experience Relevance Score: 0.7\n"
+        "Skills Match Score: 0.8\n"
+        "Potential Red Flags Score: 0.1"
+    ),
+    "detailed recommendation": (
+        "Recommendation Summary: Strong analytical profile that fits data roles well.\n"
+        "Top Matched Job: {top_job}\n"
+        "Additional Notes: Verify cloud experience during the interview."
+    ),
+    "single JSON object": json.dumps({
+        "analysis": {
+            "strengths": ["Python", "statistical modelling", "communication"],
+            "weaknesses": ["cloud architecture", "leadership"],
+            "suggestions": ["cloud certification", "mentoring"],
+            "confidence_score": 0.8,
+        },
+        "screening": {
+            "qualification_alignment_score": 0.75,
+            "experience_relevance_score": 0.7,
+            "skills_match_score": 0.8,
+            "potential_red_flags_score": 0.1,
+        },
+        "recommendation": {
+            "recommendation_summary": "Strong analytical profile that fits data roles well.",
+            "top_matched_job": "{top_job}",
+            "additional_notes": "Verify cloud experience during the interview.",
+        },
+    }),
+}
+
+
+def _score(*parts):
+    """
+    Stable pseudo-random score in [0.3, 0.95] for a prompt item.
+    """
+    digest = hashlib.sha256("\x00".join(parts).encode("utf-8")).digest()
+    return round(0.3 + 0.65 * digest[0] / 255, 2)
+
+
+def canned_response(prompt):
+    """
+    Well-formed answer for an agent prompt (system prompt included).
+    """
+    if "match the candidate" in prompt:
+        titles = re.findall(r"^Title: (.+)$", prompt, re.M)
+        return "\n".join(
+            f"Job Title: {title}\nMatch Score: {_score(title)}\nReasoning: Relevant skills for {title}."
+            for title in titles
+        )
+    if "rank these candidates" in prompt:
+        count = len(re.findall(r"^Candidate \d+:$", prompt, re.M))
+        return "\n".join(
+            f"Candidate: {i}\nMatch Score: {_score(str(i), prompt[:200])}\nReasoning: Solid overlap."
+            for i in range(1, count + 1)
+        )
+    for key, text in RESPONSES.items():
+        if key in prompt:
+            top_job = re.search(r"Matched Jobs:\n- (.+?) \(", prompt)
+            return text.replace("{top_job}", top_job.group(1) if top_job else "Data Scientist")
+    return ""
+
+
+def count_tokens(text):
+    # Roughly four characters per token, like the extractor's token budget.
+    return max(1, len(text) // 4)
+
+
+class FakeLLMClient:
+    """
+    Drop-in replacement for OllamaClient with canned responses and modelled latency.
+    """
+    def __init__(self, model="fake-llm", token_latency=0.005, prefill_latency=0.0002, parallel=4):
+        """
+        :param model: Model name reported to the agents
+        :param token_latency: Seconds to generate one response token
+        :param prefill_latency: Seconds to evaluate one prompt token
+        :param parallel: Generations served at once; further requests wait for a slot
+        """
+        self.model = model
+        self.token_latency = token_latency
+        self.prefill_latency = prefill_latency
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self._slots = threading.BoundedSemaphore(parallel)
+        self._lock = threading.Lock()
+
+    def _count(self, prompt_tokens, response_tokens):
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.response_tokens += response_tokens
+
+    def reset(self):
+        with self._lock:
+            self.calls = self.prompt_tokens = self.response_tokens = 0
+
+    def generate(self, prompt, model=None, options=None, system=None, **kwargs):
+        text = canned_response((system or "") + prompt)
+        prompt_tokens = count_tokens((system or "") + prompt)
+        eval_count = count_tokens(text)
+        self._count(prompt_tokens, eval_count)
+        with self._slots:
+            prefill = prompt_tokens * self.prefill_latency
+            generation = eval_count * self.token_latency
+            time.sleep(prefill + generation)
+        return {
+            "model": model or self.model,
+            "response": text,
+            "done": True,
+            "load_duration": 0,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prefill * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": int(generation * 1e9),
+        }
+
+    def generate_stream(self, prompt, model=None, options=None, system=None, **kwargs):
+        text = canned_response((system or "") + prompt)
+        prompt_tokens = count_tokens((system or "") + prompt)
+        eval_count = count_tokens(text)
+        self._count(prompt_tokens, eval_count)
+        with self._slots:
+            prefill = prompt_tokens * self.prefill_latency
+            time.sleep(prefill)
+            for line in text.split("\n"):
+                time.sleep(count_tokens(line) * self.token_latency)
+                yield {"response": line + "\n", "done": False}
+        yield {
+            "model": model or self.model,
+            "response": "",
+            "done": True,
+            "load_duration": 0,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prefill * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": int(eval_count * self.token_latency * 1e9),
+        }
+
+    def preload(self, model=None):
+        return {"model": model or self.model, "done": True, "load_duration": 0}
+
+    def loaded_models(self):
+        return {self.model}
+
+    def is_loaded(self, model=None):
+        return True
@@ -0,0 +1,82 @@
+"""
+Measure prompt prefill per MatcherAgent call for the original candidate-first prompt and the
+catalog-first layout, where the job catalog is a stable system prompt the server can reuse.
+Prefill figures are the prompt_eval_count / prompt_eval_duration reported by Ollama.
+The LLM response cache is disabled so every call reaches the model.
+
+Usage (from the repository root, with Ollama running):
+    python -m benchmarks.matcher_prefill --candidates 5
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+
+from agents.cache import set_cache
+from agents.matcher_agent import MatcherAgent
+from agents.ollama_client import get_default_client, set_default_client
+from benchmarks.shortlist_bench import synthetic_profiles
+
+
+class PrefillClient:
+    """
+    Wraps an LLM client and keeps the prefill statistics of every generation.
+    """
+    def __init__(self, client):
+        self.client = client
+        self.model = getattr(client, "model", None)
+        self.stats = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, **kwargs):
+        result = self.client.generate(prompt, **kwargs)
+        with self._lock:
+            self.stats.append((result.get("prompt_eval_count", 0), result.get("prompt_eval_duration", 0) / 1e6))
+        return result
+
+    def generate_stream(self, prompt, **kwargs):
+        return self.client.generate_stream(prompt, **kwargs)
+
+
+def run_layout(layout, client, job_list, profiles):
+    """
+    Match every profile against the catalog with one prompt layout.
+    The first call warms the server, so it is reported separately from the rest.
+    :return: Result row
+    """
+    matcher = MatcherAgent(prompt_layout=layout)
+    client.stats = []
+    for profile in profiles:
+        matcher.process(profile, None, job_list=job_list)
+    first, rest = client.stats[0], client.stats[1:] or client.stats[:1]
+    return {
+        "layout": layout,
+        "calls": len(client.stats),
+        "first_call_prompt_tokens": first[0],
+        "first_call_prefill_ms": round(first[1], 1),
+        "mean_prompt_tokens": round(statistics.mean(tokens for tokens, _ in rest), 1),
+        "mean_prefill_ms": round(statistics.mean(ms for _, ms in rest), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--job-list", default=os.path.join("data", "job_list.json"))
+    parser.add_argument("--candidates", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["LLM_CACHE_PATH"] = ""
+    set_cache("LLM_CACHE", None)
+    client = PrefillClient(get_default_client())
+    set_default_client(client)
+
+    with open(args.job_list) as f:
+        job_list = json.load(f)
+    profiles = synthetic_profiles(args.candidates)
+    for layout in ("candidate_first", "catalog_first"):
+        print(json.dumps(run_layout(layout, client, job_list, profiles)))
+
+
+if __name__ == "__main__":
+    main()
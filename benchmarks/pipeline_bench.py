@@ -0,0 +1,207 @@
+"""
+Benchmark the full resume pipeline against a fake LLM backend (benchmarks/fake_llm.py), so
+results are reproducible and measure this code rather than the model.
+
+Scenarios, each run for every resume size and catalog size:
+- single: resumes processed one after another with process_resume
+- batch: process_resumes_async with --concurrency resumes in flight
+- sessions: --concurrency threads sharing one Orchestrator, like concurrent Streamlit users
+
+Reported per run: p50/p95/p99 and mean latency per resume, throughput, LLM calls, peak
+traced Python memory and process peak RSS. Response, extraction and profile caches are
+disabled so every resume does the full work.
+
+Usage (from the repository root, no Ollama needed):
+    python -m benchmarks.pipeline_bench
+    python -m benchmarks.pipeline_bench --pages 1 5 --catalog-sizes 20 2000 --resumes 20 -o bench.json
+    python -m benchmarks.pipeline_bench --scenarios sessions --concurrency 8 --token-latency 0.02
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from agents.cache import set_cache
+from agents.ollama_client import set_default_client
+from agents.orchestrator import Orchestrator
+from agents.profile_store import set_profile_store
+from benchmarks.fake_llm import FakeLLMClient
+from benchmarks.shortlist_bench import SKILLS, TITLES, WORDS, percentile, synthetic_jobs
+
+
+def synthetic_resume_lines(pages, seed=0, lines_per_page=48):
+    """
+    Generate reproducible resume text, one list of lines per page.
+    """
+    rng = random.Random(seed)
+    lines = [f"Candidate {seed}", f"candidate{seed}@example.com", "", "Skills: " + ", ".join(rng.sample(SKILLS, 8))]
+    while len(lines) < pages * lines_per_page:
+        lines.append(f"{rng.choice(TITLES)} at Company {rng.randint(1, 500)}, {rng.randint(2005, 2024)}")
+        lines.append("  " + " ".join(rng.sample(WORDS, 10)))
+    return [lines[i:i + lines_per_page] for i in range(0, pages * lines_per_page, lines_per_page)]
+
+
+def synthetic_resume_pdf(pages, seed=0):
+    """
+    Build a minimal text PDF of the given number of pages.
+    :return: PDF bytes
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in synthetic_resume_lines(pages, seed):
+        text = " T* ".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj" for line in page_lines
+        )
+        stream = f"BT /F1 10 Tf 14 TL 50 780 Td {text} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def run_single(orchestrator, resumes, job_list_path, concurrency):
+    latencies, errors = [], 0
+    for resume in resumes:
+        start = time.perf_counter()
+        result = orchestrator.process_resume(resume, job_list_path)
+        latencies.append(time.perf_counter() - start)
+        errors += "error" in result
+    return latencies, errors
+
+
+def run_batch(orchestrator, resumes, job_list_path, concurrency):
+    results = asyncio.run(orchestrator.process_resumes_async(resumes, job_list_path, concurrency))
+    return [result["metrics"]["total_s"] for result in results], sum("error" in result for result in results)
+
+
+def run_sessions(orchestrator, resumes, job_list_path, concurrency):
+    def session(resume):
+        start = time.perf_counter()
+        result = orchestrator.process_resume(resume, job_list_path)
+        return time.perf_counter() - start, "error" in result
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(session, resumes))
+    return [latency for latency, _ in outcomes], sum(error for _, error in outcomes)
+
+
+SCENARIOS = {"single": run_single, "batch": run_batch, "sessions": run_sessions}
+
+
+def run_scenario(scenario, client, resumes, job_list_path, concurrency, trace_memory=True):
+    """
+    Run one scenario on a fresh Orchestrator.
+    :return: Result row without the size parameters
+    """
+    orchestrator = Orchestrator()
+    client.reset()
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    latencies, errors = SCENARIOS[scenario](orchestrator, resumes, job_list_path, concurrency)
+    wall = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform != "darwin" else 1024 * 1024)
+    return {
+        "scenario": scenario,
+        "concurrency": 1 if scenario == "single" else concurrency,
+        "resumes": len(resumes),
+        "errors": errors,
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "p99_s": round(percentile(latencies, 99), 4),
+        "mean_s": round(statistics.mean(latencies), 4),
+        "throughput_per_s": round(len(resumes) / wall, 3),
+        "wall_s": round(wall, 3),
+        "llm_calls_per_resume": round(client.calls / len(resumes), 2),
+        "prompt_tokens_per_resume": round(client.prompt_tokens / len(resumes)),
+        "peak_traced_mb": round(peak / 2 ** 20, 2) if peak is not None else None,
+        "max_rss_mb": round(rss, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--pages", nargs="+", type=int, default=[1, 4], help="Resume sizes in pages")
+    parser.add_argument("--catalog-sizes", nargs="+", type=int, default=[20, 1000])
+    parser.add_argument("--resumes", type=int, default=10, help="Resumes per run")
+    parser.add_argument("--concurrency", type=int, default=4, help="Resumes in flight for batch and sessions")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="Seconds per generated token")
+    parser.add_argument("--prefill-latency", type=float, default=0.0002, help="Seconds per prompt token")
+    parser.add_argument("--parallel", type=int, default=4, help="Generations the fake server runs at once")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (it slows Python code down)")
+    parser.add_argument("-o", "--output", help="Also write all results as one JSON document")
+    args = parser.parse_args()
+
+    for variable in ("LLM_CACHE_PATH", "EXTRACTION_CACHE_PATH", "PROFILE_STORE_PATH"):
+        os.environ[variable] = ""
+    set_cache("LLM_CACHE", None)
+    set_cache("EXTRACTION_CACHE", None)
+    set_profile_store(None)
+    client = FakeLLMClient(
+        token_latency=args.token_latency, prefill_latency=args.prefill_latency, parallel=args.parallel
+    )
+    set_default_client(client)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for catalog_size in args.catalog_sizes:
+            job_list_path = os.path.join(directory, f"jobs_{catalog_size}.json")
+            with open(job_list_path, "w", encoding="utf-8") as f:
+                json.dump(synthetic_jobs(catalog_size), f)
+            for pages in args.pages:
+                resumes = [synthetic_resume_pdf(pages, seed) for seed in range(args.resumes)]
+                for scenario in args.scenarios:
+                    row = {"catalog_size": catalog_size, "resume_pages": pages}
+                    row.update(run_scenario(
+                        scenario, client, resumes, job_list_path, args.concurrency, not args.no_memory
+                    ))
+                    rows.append(row)
+                    print(json.dumps(row), flush=True)
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "parameters": vars(args),
+            },
+            "results": rows,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the staged and fused pipeline modes: LLM calls, prompt size and wall time per resume.
+Response caches are disabled so every call reaches the model.
+
+Usage (from the repository root):
+    python -m benchmarks.pipeline_modes --resumes 3
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+
+from agents.cache import set_cache
+from agents.ollama_client import get_default_client, set_default_client
+from agents.orchestrator import Orchestrator
+
+
+class CountingClient:
+    """
+    Wraps an LLM client and counts calls and prompt characters.
+    """
+    def __init__(self, client):
+        self.client = client
+        self.model = getattr(client, "model", None)
+        self.calls = 0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+
+    def _count(self, prompt):
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+
+    def generate(self, prompt, **kwargs):
+        self._count(prompt)
+        return self.client.generate(prompt, **kwargs)
+
+    def generate_stream(self, prompt, **kwargs):
+        self._count(prompt)
+        return self.client.generate_stream(prompt, **kwargs)
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.prompt_chars = 0
+
+
+def run_mode(mode, counter, resume_path, job_list_path, resumes):
+    """
+    Process the same resume several times in one pipeline mode.
+    :return: Result row
+    """
+    orchestrator = Orchestrator(pipeline_mode=mode)
+    latencies, calls, prompt_chars, errors = [], [], [], 0
+    for _ in range(resumes):
+        counter.reset()
+        start = time.perf_counter()
+        result = orchestrator.process_resume(resume_path, job_list_path)
+        latencies.append(time.perf_counter() - start)
+        calls.append(counter.calls)
+        prompt_chars.append(counter.prompt_chars)
+        errors += "error" in result
+    return {
+        "mode": mode,
+        "resumes": resumes,
+        "errors": errors,
+        "llm_calls_per_resume": statistics.mean(calls),
+        "prompt_chars_per_resume": round(statistics.mean(prompt_chars)),
+        "mean_latency_s": round(statistics.mean(latencies), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resume", default=os.path.join("data", "dummy_resumes", "rama.pdf"))
+    parser.add_argument("--job-list", default=os.path.join("data", "job_list.json"))
+    parser.add_argument("--resumes", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ["LLM_CACHE_PATH"] = ""
+    os.environ["EXTRACTION_CACHE_PATH"] = ""
+    set_cache("LLM_CACHE", None)
+    set_cache("EXTRACTION_CACHE", None)
+    counter = CountingClient(get_default_client())
+    set_default_client(counter)
+
+    for mode in ("staged", "fused"):
+        print(json.dumps(run_mode(mode, counter, args.resume, args.job_list, args.resumes)))
+
+
+if __name__ == "__main__":
+    main()
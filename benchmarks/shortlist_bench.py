@@ -0,0 +1,125 @@
+"""
+Benchmark job retrieval build time and shortlisting latency on synthetic job catalogs,
+for both the inverted skill index and the NumPy semantic vector store.
+
+Usage (from the repository root):
+    python -m benchmarks.shortlist_bench --sizes 10000 100000 --queries 200
+    python -m benchmarks.shortlist_bench --retrieval skills semantic
+"""
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+
+from agents.job_index import JobIndex
+
+SKILLS = [
+    "Python", "SQL", "Machine Learning", "TensorFlow", "PyTorch", "Statistics", "Java", "C++", "AWS", "GCP",
+    "Azure", "Git", "Docker", "Kubernetes", "React", "Node.js", "TypeScript", "Go", "Rust", "Spark", "Hadoop",
+    "Tableau", "Excel", "Figma", "Agile", "Scrum", "Linux", "Terraform", "CI/CD", "NLP", "Computer Vision",
+    "Data Visualization", "REST APIs", "GraphQL", "PostgreSQL", "MongoDB", "Kafka", "Airflow", "Pandas", "R",
+]
+WORDS = [
+    "design", "develop", "analyze", "deploy", "maintain", "optimize", "pipelines", "models", "services",
+    "dashboards", "infrastructure", "applications", "research", "customers", "teams", "product", "data",
+    "platform", "security", "testing", "automation", "scalable", "distributed", "cloud", "mobile", "backend",
+]
+TITLES = [
+    "Data Scientist", "Software Engineer", "Data Engineer", "DevOps Engineer", "ML Engineer", "Analyst",
+    "Frontend Developer", "Backend Developer", "Product Manager", "Security Engineer", "QA Engineer",
+]
+
+
+def synthetic_jobs(count, seed=0):
+    """
+    Generate a reproducible synthetic job catalog.
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(SKILLS, rng.randint(4, 8))
+        words = rng.sample(WORDS, 12)
+        jobs.append({
+            "id": i,
+            "title": f"{rng.choice(TITLES)} {i}",
+            "description": " ".join(words) + ". Experience with " + ", ".join(skills[:3]) + " is required.",
+            "required_skills": skills,
+        })
+    return jobs
+
+
+def synthetic_profiles(count, seed=1):
+    """
+    Generate reproducible candidate profiles.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "skills": rng.sample(SKILLS, rng.randint(3, 10)),
+            "experience": [f"{rng.choice(TITLES)} at Company {i}, 3 years"],
+            "strengths": rng.sample(WORDS, 3),
+        }
+        for i in range(count)
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _time_queries(search, queries, top_k):
+    latencies = []
+    for profile in synthetic_profiles(queries):
+        t0 = time.perf_counter()
+        search(profile, top_k)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies
+
+
+def bench(size, queries, top_k, retrieval="skills"):
+    """
+    Build a retriever over `size` jobs and time `queries` shortlist lookups.
+    :return: Result row
+    """
+    jobs = synthetic_jobs(size)
+    start = time.perf_counter()
+    if retrieval == "semantic":
+        from agents.job_vectors import JobVectorStore
+        with tempfile.TemporaryDirectory() as cache_dir:
+            store = JobVectorStore.for_catalog(jobs, cache_dir=cache_dir)
+            build_s = time.perf_counter() - start
+            latencies = _time_queries(store.search, queries, top_k)
+    else:
+        index = JobIndex(jobs)
+        build_s = time.perf_counter() - start
+        latencies = _time_queries(index.shortlist, queries, top_k)
+
+    return {
+        "retrieval": retrieval,
+        "jobs": size,
+        "top_k": top_k,
+        "build_s": round(build_s, 3),
+        "shortlist_mean_ms": round(statistics.mean(latencies), 3),
+        "shortlist_p50_ms": round(percentile(latencies, 50), 3),
+        "shortlist_p95_ms": round(percentile(latencies, 95), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--retrieval", nargs="+", choices=["skills", "semantic"], default=["skills"])
+    args = parser.parse_args()
+
+    for retrieval in args.retrieval:
+        for size in args.sizes:
+            print(json.dumps(bench(size, args.queries, args.top_k, retrieval)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,51 @@
 import streamlit as st
+from agents.job_catalog import get_job_catalog
 from agents.orchestrator import Orchestrator
+from agents.scheduler import llm_priority
 import plotly.express as px
+import collections
+import hashlib
 import os
 import re
+import threading
+import uuid
 
-# Initialize the Orchestrator
-orchestrator = Orchestrator()
+# Number of screening results kept in memory across reruns and sessions
+RESULT_CACHE_SIZE = 32
+
+
+@st.cache_resource
+def get_orchestrator():
+    """Process-wide Orchestrator, built once instead of on every script rerun."""
+    return Orchestrator()
+
+
+@st.cache_resource
+def get_result_cache():
+    """Process-wide LRU of pipeline results keyed by resume hash and job list version."""
+    return collections.OrderedDict(), threading.Lock()
+
+
+def job_list_version(job_list_path):
+    """Version of the job list; results are recomputed when its content changes."""
+    return get_job_catalog(job_list_path).version
+
+
+def get_cached_result(key):
+    results, lock = get_result_cache()
+    with lock:
+        if key in results:
+            results.move_to_end(key)
+        return results.get(key)
+
+
+def store_result(key, result):
+    results, lock = get_result_cache()
+    with lock:
+        results[key] = result
+        results.move_to_end(key)
+        while len(results) > RESULT_CACHE_SIZE:
+            results.popitem(last=False)
 
 # Set Page Configuration
 st.set_page_config(
@@ -106,6 +146,105 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+def render_analysis(analysis):
+    """Render the analysis tab."""
+    strengths = analysis.get("strengths", [])
+    weaknesses = analysis.get("weaknesses", [])
+    suggestions = analysis.get("suggestions", [])
+    confidence_score = analysis.get("confidence_score", 0.0)
+
+    st.write("### Strengths:")
+    if strengths:
+        for strength in strengths:
+            points = re.split(r'\d+\.\s*', strength)
+            for point in points:
+                if point.strip():
+                    st.success(f"{point.strip()}")
+    else:
+        st.success("No strengths identified.")
+
+    st.write("### Weaknesses:")
+    if weaknesses:
+        for weakness in weaknesses:
+            points = re.split(r'\d+\.\s*', weakness)
+            for point in points:
+                if point.strip():
+                    st.warning(f"{point.strip()}")
+    else:
+        st.warning("No weaknesses identified.")
+
+    st.write("### Suggestions:")
+    if suggestions:
+        for suggestion in suggestions:
+            points = re.split(r'\d+\.\s*', suggestion)
+            for point in points:
+                if point.strip():
+                    st.info(f"{point.strip()}")
+    else:
+        st.info("No suggestions available.")
+
+    st.write("### Confidence Score:")
+    st.progress(confidence_score)
+
+
+def render_job_matches(job_matches):
+    """Render the job matches tab."""
+    if job_matches:
+        for job in job_matches:
+            st.markdown(f"**{job['title']}**")
+            st.write(f"Match Score: {job.get('confidence_score', 0.0)}")
+            if job.get('reasoning'):
+                reasoning_points = job['reasoning'].split(". ")
+                for point in reasoning_points:
+                    st.write(f"- {point.strip()}")
+            st.markdown("---")
+    else:
+        st.warning("No job matches found.")
+
+
+def render_screening(screening):
+    """Render the screening tab."""
+    metrics = {
+        "Qualification Alignment": screening.get("qualification_alignment_score", 0.0),
+        "Experience Relevance": screening.get("experience_relevance_score", 0.0),
+        "Skills Match": screening.get("skills_match_score", 0.0),
+        "Red Flags": screening.get("potential_red_flags_score", 0.0),
+    }
+    fig = px.line_polar(
+        r=list(metrics.values()),
+        theta=list(metrics.keys()),
+        line_close=True,
+        range_r=[0, 1],
+        title="Screening Metrics",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_recommendations(recommendations):
+    """Render the final recommendation tab."""
+    st.write("### Summary")
+    summary_points = recommendations.get("recommendation_summary", "No summary available.").split(". ")
+    for point in summary_points:
+        st.write(f"- {point.strip()}")
+
+    st.write("### Top Matched Job")
+    st.success(recommendations.get("top_matched_job", "No top match available."))
+
+    st.write("### Additional Notes")
+    notes_points = recommendations.get("additional_notes", "No additional notes available.").split(". ")
+    for point in notes_points:
+        st.info(f"- {point.strip()}")
+
+
+# Progress message shown while each pipeline stage runs
+STAGE_LABELS = {
+    "extracted_data": "Extracting resume data...",
+    "analysis_results": "Analyzing candidate profile...",
+    "matched_jobs": "Matching jobs...",
+    "screening_results": "Screening candidate...",
+    "recommendations": "Generating recommendations...",
+}
+
 # Main Title
 st.markdown('<div class="title">Welcome to LLM-powered Candidate Screener</div>', unsafe_allow_html=True)
 st.sidebar.image("data/logo.png", use_container_width=True)
@@ -117,121 +256,80 @@ uploaded_file = st.sidebar.file_uploader("Upload Resume (PDF)", type=["pdf"])
 if uploaded_file:
     st.sidebar.success("Resume uploaded successfully! ✅")
 
-    # Process Resume Button
-    if st.sidebar.button("Process Resume"):
-        with st.spinner("Analyzing Resume..."):
-            resume_path = f"temp_{uploaded_file.name}"
-            with open(resume_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+    # Define job_list_path
+    job_list_path = os.path.join("data", "job_list.json")
+    result_key = (hashlib.sha256(uploaded_file.getvalue()).hexdigest(), job_list_version(job_list_path))
 
-            # Define job_list_path
-            job_list_path = os.path.join("data", "job_list.json")
+    # Process Resume Button; results stay on screen across reruns until the file or job list changes
+    process_clicked = st.sidebar.button("Process Resume")
+    result = None
+    if process_clicked or st.session_state.get("result_key") == result_key:
+        result = get_cached_result(result_key)
+        if result is None:
+            # Evicted from the in-memory LRU by other sessions: reload the saved result from
+            # the profile store instead of silently running the pipeline again.
+            result = get_orchestrator().stored_result(result_key[0], job_list_path)
+            if result is not None:
+                store_result(result_key, result)
+        if result is None and not process_clicked:
+            # Nothing saved to show again (e.g. no profile store): only the button reprocesses.
+            del st.session_state["result_key"]
+            st.info("The previous result is no longer available; click Process Resume to screen the resume again.")
 
-            # Orchestrator Call with both parameters
-            result = orchestrator.process_resume(resume_path, job_list_path)
+    if process_clicked or result is not None:
+        status = st.empty()
+
+        # Tab Layout; each tab fills in as soon as its stage produces output
+        tab1, tab2, tab3, tab4 = st.tabs(
+            ["📝 Analysis", "💼 Job Matches", "📊 Screening", "✅ Final Recommendation"]
+        )
+        sections = [
+            (tab1, "analysis_results", "Analysis Results", render_analysis),
+            (tab2, "matched_jobs", "Job Matches", render_job_matches),
+            (tab3, "screening_results", "Screening Results", render_screening),
+            (tab4, "recommendations", "Final Recommendation", render_recommendations),
+        ]
+        slots = {}
+        for tab, stage, title, renderer in sections:
+            with tab:
+                st.markdown(f'<div class="subheader">{title}</div>', unsafe_allow_html=True)
+                slots[stage] = (st.empty(), renderer)
+                slots[stage][0].info("Waiting for results...")
+
+        if result is not None:
+            # Same resume and job list as an earlier run: render the memoized result.
+            for stage, (slot, renderer) in slots.items():
+                with slot.container():
+                    renderer(result[stage])
+        else:
+            # Orchestrator Call with both parameters, streamed stage by stage; the upload is
+            # parsed in memory rather than through a temporary file.
+            result = {}
+            # Interactive priority, queued fairly against other browser sessions.
+            session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+            with llm_priority("interactive", session=session_id):
+                for event in get_orchestrator().process_resume_events(uploaded_file, job_list_path):
+                    stage = event.get("stage")
+                    if event["type"] == "stage_started":
+                        status.info(STAGE_LABELS.get(stage, "Analyzing Resume..."))
+                    elif event["type"] in ("partial", "stage_completed") and stage in slots:
+                        # The radar chart is only drawn once all four scores are known.
+                        if event["type"] == "partial" and stage == "screening_results":
+                            continue
+                        slot, renderer = slots[stage]
+                        with slot.container():
+                            renderer(event["result"])
+                    elif event["type"] == "completed":
+                        result = event["result"]
+            status.empty()
+
+            if "error" not in result:
+                store_result(result_key, result)
 
         if "error" in result:
             st.error(result["error"])
         else:
-            # Tab Layout
-            tab1, tab2, tab3, tab4 = st.tabs(
-                ["📝 Analysis", "💼 Job Matches", "📊 Screening", "✅ Final Recommendation"]
-            )
-
-            with tab1:
-                st.markdown('<div class="subheader">Analysis Results</div>', unsafe_allow_html=True)
-                strengths = result["analysis_results"].get("strengths", [])
-                weaknesses = result["analysis_results"].get("weaknesses", [])
-                suggestions = result["analysis_results"].get("suggestions", [])
-                confidence_score = result["analysis_results"].get("confidence_score", 0.0)
-
-                st.write("### Strengths:")
-                if strengths:
-                    for strength in strengths:
-                        points = re.split(r'\d+\.\s*', strength)
-                        for point in points:
-                            if point.strip():
-                                st.success(f"{point.strip()}")
-                else:
-                    st.success("No strengths identified.")
-
-                st.write("### Weaknesses:")
-                if weaknesses:
-                    for weakness in weaknesses:
-                        points = re.split(r'\d+\.\s*', weakness)
-                        for point in points:
-                            if point.strip():
-                                st.warning(f"{point.strip()}")
-                else:
-                    st.warning("No weaknesses identified.")
-
-                st.write("### Suggestions:")
-                if suggestions:
-                    for suggestion in suggestions:
-                        points = re.split(r'\d+\.\s*', suggestion)
-                        for point in points:
-                            if point.strip():
-                                st.info(f"{point.strip()}")
-                else:
-                    st.info("No suggestions available.")
-
-                st.write("### Confidence Score:")
-                st.progress(confidence_score)
-
-            with tab2:
-                st.markdown('<div class="subheader">Job Matches</div>', unsafe_allow_html=True)
-                job_matches = result["matched_jobs"]
-
-                if job_matches:
-                    for job in job_matches:
-                        st.markdown(f"**{job['title']}**")
-                        st.write(f"Match Score: {job.get('confidence_score', 0.0)}")
-                        if job.get('reasoning'):
-                            reasoning_points = job['reasoning'].split(". ")
-                            for point in reasoning_points:
-                                st.write(f"- {point.strip()}")
-                        st.markdown("---")
-                else:
-                    st.warning("No job matches found.")
-
-            with tab3:
-                st.markdown('<div class="subheader">Screening Results</div>', unsafe_allow_html=True)
-                screening = result["screening_results"]
-
-                metrics = {
-                    "Qualification Alignment": screening.get("qualification_alignment_score", 0.0),
-                    "Experience Relevance": screening.get("experience_relevance_score", 0.0),
-                    "Skills Match": screening.get("skills_match_score", 0.0),
-                    "Red Flags": screening.get("potential_red_flags_score", 0.0),
-                }
-                fig = px.line_polar(
-                    r=list(metrics.values()),
-                    theta=list(metrics.keys()),
-                    line_close=True,
-                    range_r=[0, 1],
-                    title="Screening Metrics",
-                )
-                st.plotly_chart(fig, use_container_width=True)
-
-            with tab4:
-                st.markdown('<div class="subheader">Final Recommendation</div>', unsafe_allow_html=True)
-                recommendations = result["recommendations"]
-                
-                st.write("### Summary")
-                summary_points = recommendations.get("recommendation_summary", "No summary available.").split(". ")
-                for point in summary_points:
-                    st.write(f"- {point.strip()}")
-                
-                st.write("### Top Matched Job")
-                st.success(recommendations.get("top_matched_job", "No top match available."))
-                
-                st.write("### Additional Notes")
-                notes_points = recommendations.get("additional_notes", "No additional notes available.").split(". ")
-                for point in notes_points:
-                    st.info(f"- {point.strip()}")
-
-        # Clean up
-        os.remove(resume_path)
+            st.session_state["result_key"] = result_key
 
 else:
-    st.info("Please upload a resume to begin.")
\ No newline at end of file
+    st.info("Please upload a resume to begin.")
@@ -0,0 +1,117 @@
+"""
+Rank already processed candidates for one job.
+
+Candidates are read from the profile store (every successful pipeline run is saved
+there), or from batch_screen.py output / JSON lines of Orchestrator results, indexed once, and scored against the job with vectorized skill and term matching.
+The index is saved under CANDIDATE_POOL_DIR and rebuilt only when the candidates change.
+Optionally, the LLM re-ranks only the top N.
+
+Usage:
+    python rank_candidates.py "Data Scientist" --top 20
+    python rank_candidates.py "Data Scientist" --candidates screening_results.jsonl
+    python rank_candidates.py "Data Scientist" --candidates a.jsonl b.jsonl --rerank 10
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from agents.candidate_pool import CandidatePool
+from agents.job_catalog import get_job_catalog
+from agents.profile_store import ProfileStore, get_profile_store
+from agents.ranker_agent import RankerAgent
+
+
+def find_job(job_list, query):
+    """
+    Look a job up by its 'id', its exact title (case-insensitive) or its 1-based position.
+    :return: Job dictionary, or None when nothing matches
+    """
+    for job in job_list:
+        if str(job.get("id")) == query or job.get("title", "").strip().lower() == query.strip().lower():
+            return job
+    if query.isdigit() and 1 <= int(query) <= len(job_list):
+        return job_list[int(query) - 1]
+    return None
+
+
+def rank_for_job(pool, job, top_k=20, rerank=0, ranker=None):
+    """
+    Rank a candidate pool for a job.
+    :param pool: CandidatePool
+    :param job: Job dictionary
+    :param top_k: Number of candidates to return
+    :param rerank: Re-rank this many of the top candidates with the LLM (0 disables it)
+    :param ranker: RankerAgent to use for re-ranking
+    :return: List of result dictionaries, best first
+    """
+    ranked = pool.rank(job, top_k)
+    results = [
+        {
+            "candidate": candidate["id"],
+            "name": candidate.get("name"),
+            "score": round(score, 4),
+            "skills_match": round(skills, 4),
+            "relevance": round(relevance, 4),
+        }
+        for candidate, score, skills, relevance in ranked
+    ]
+    rerank = min(rerank, len(results))
+    if rerank:
+        ranker = ranker or RankerAgent()
+        scores = ranker.process(job, [candidate for candidate, _, _, _ in ranked[:rerank]])
+        head = results[:rerank]
+        for position, row in enumerate(head):
+            if position in scores:
+                row["llm_score"] = scores[position]["confidence_score"]
+                row["reasoning"] = scores[position]["reasoning"]
+        # LLM-scored candidates first, by LLM score; the rest keep their index order.
+        head.sort(key=lambda row: -row["llm_score"] if "llm_score" in row else 1.0)
+        results[:rerank] = head
+    for rank, row in enumerate(results, start=1):
+        row["rank"] = rank
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("job", help="Job id, exact title or 1-based position in the job list")
+    parser.add_argument("--candidates", nargs="+", help="JSON lines files of processed candidates")
+    parser.add_argument("--store", help="Profile store to read when no --candidates are given "
+                                        "(default PROFILE_STORE_PATH)")
+    parser.add_argument("--job-list", default=os.path.join("data", "job_list.json"))
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--rerank", type=int, default=0, help="Re-rank the top N with the LLM")
+    args = parser.parse_args()
+
+    job = find_job(get_job_catalog(args.job_list).jobs, args.job)
+    if job is None:
+        print(f"No job matching {args.job!r} in {args.job_list}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    if args.candidates:
+        pool = CandidatePool.for_files(args.candidates)
+    else:
+        store = ProfileStore(args.store) if args.store else get_profile_store()
+        if store is None:
+            print("No profile store configured; pass --candidates or --store", file=sys.stderr)
+            return 1
+        pool = CandidatePool.for_store(store)
+    loaded = time.perf_counter()
+    results = rank_for_job(pool, job, args.top, args.rerank)
+    ranked = time.perf_counter()
+
+    for row in results:
+        print(json.dumps(row))
+    print(
+        f"Index of {len(pool)} candidates {'loaded' if pool.loaded else 'built'} in {loaded - start:.3f}s; "
+        f"ranked for {job.get('title')} in {(ranked - loaded) * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
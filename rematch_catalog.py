@@ -0,0 +1,43 @@
+"""
+Bring stored candidate results up to date after the job list changed.
+
+Only the (candidate, job) pairs whose job was added or edited since a candidate was last
+matched are scored again; extraction and analysis are reused from the profile store, and
+screening and recommendation are rerun only for candidates whose top matches moved.
+
+Usage:
+    python rematch_catalog.py
+    python rematch_catalog.py --job-list data/job_list.jsonl --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from agents.orchestrator import Orchestrator
+from agents.profile_store import ProfileStore, get_profile_store, set_profile_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--job-list", default=os.path.join("data", "job_list.json"))
+    parser.add_argument("--store", help="Profile store to update (default PROFILE_STORE_PATH)")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.store:
+        set_profile_store(ProfileStore(args.store))
+    if get_profile_store() is None:
+        print("No profile store configured; pass --store or set PROFILE_STORE_PATH", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    stats = Orchestrator().rematch_catalog(args.job_list, args.workers)
+    print(json.dumps(stats))
+    print(f"Re-matched in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 0 if not stats["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
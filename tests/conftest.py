@@ -0,0 +1,186 @@
+import json
+import os
+import re
+import sys
+import threading
+import zlib
+
+import pytest
+
+# Make the agents package importable when pytest is run from any directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.cache import set_cache  # noqa: E402
+from agents.ollama_client import set_default_client  # noqa: E402
+from agents.profile_store import ProfileStore, set_profile_store  # noqa: E402
+
+# Canned answers keyed by a phrase of the agent prompt they answer.
+RESPONSES = {
+    "expert resume parser": (
+        "Name: Jordan Lee\n"
+        "Skills: Python, SQL, Machine Learning, Docker\n"
+        "Education:\n"
+        "- BSc Computer Science from State University, 2018\n"
+        "Experience:\n"
+        "- Data Scientist at Company 1, 2021 - 2024\n"
+        "- Data Analyst at Company 2, 2018 - 2021"
+    ),
+    "analyze this candidate": (
+        "Strengths: Python, statistical modelling, communication\n"
+        "Weaknesses: cloud architecture, leadership\n"
+        "Suggestions: earn a cloud certification, mentor junior analysts\n"
+        "Confidence Score: 0.8"
+    ),
+    "provide scores": (
+        "Qualification Alignment Score: 0.75\n"
+        "Experience Relevance Score: 0.7\n"
+        "Skills Match Score: 0.8\n"
+        "Potential Red Flags Score: 0.1"
+    ),
+    "detailed recommendation": (
+        "Recommendation Summary: Strong analytical profile.\n"
+        "Top Matched Job: {top_job}\n"
+        "Additional Notes: Verify cloud experience."
+    ),
+    "single JSON object": json.dumps({
+        "analysis": {
+            "strengths": ["Python", "statistics"], "weaknesses": ["cloud"],
+            "suggestions": ["certification"], "confidence_score": 0.8,
+        },
+        "screening": {
+            "qualification_alignment_score": 0.75, "experience_relevance_score": 0.7,
+            "skills_match_score": 0.8, "potential_red_flags_score": 0.1,
+        },
+        "recommendation": {
+            "recommendation_summary": "Strong analytical profile.", "top_matched_job": "{top_job}",
+            "additional_notes": "Verify cloud experience.",
+        },
+    }),
+}
+
+
+def match_score(title):
+    """
+    Stable score in [0.3, 0.95] that the fake client gives a job title.
+    """
+    return round(0.3 + zlib.crc32(title.encode("utf-8")) % 66 / 100, 2)
+
+
+def canned_response(prompt):
+    """
+    Well-formed answer for an agent prompt; matching prompts score every job they list.
+    """
+    if "with the following jobs" in prompt:
+        return "\n".join(
+            f"Job Title: {title}\nMatch Score: {match_score(title)}\nReasoning: Relevant skills."
+            for title in re.findall(r"^Title: (.+)$", prompt, re.M)
+        )
+    for phrase, text in RESPONSES.items():
+        if phrase in prompt:
+            top_job = re.search(r"Matched Jobs:\n- (.+?) \(", prompt)
+            return text.replace("{top_job}", top_job.group(1) if top_job else "Data Scientist")
+    return ""
+
+
+def make_pdf(pages):
+    """
+    Build a minimal text PDF.
+    :param pages: One list of text lines per page; an empty list makes a blank page
+    :return: PDF bytes
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        text = " T* ".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj" for line in lines
+        )
+        stream = f"BT /F1 10 Tf 14 TL 50 780 Td {text} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+class FakeClient:
+    """
+    OllamaClient stand-in answering with canned_response() and recording every prompt
+    (system prompt included).
+    """
+    model = "fake"
+
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self):
+        return len(self.prompts)
+
+    def respond(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        return canned_response(prompt)
+
+    def generate(self, prompt, system=None, **kwargs):
+        text = self.respond((system or "") + prompt)
+        return {"model": self.model, "response": text, "done": True, "eval_count": len(text.split())}
+
+    def generate_stream(self, prompt, system=None, **kwargs):
+        text = self.respond((system or "") + prompt)
+        for line in text.split("\n"):
+            yield {"response": line + "\n", "done": False}
+        yield {"model": self.model, "response": "", "done": True, "eval_count": len(text.split())}
+
+    def preload(self, model=None):
+        return {"model": model or self.model, "done": True, "load_duration": 0}
+
+    def loaded_models(self):
+        return {self.model}
+
+    def is_loaded(self, model=None):
+        return True
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    FakeClient installed as the default client, with the LLM and extraction caches
+    disabled so every request reaches it, and no default profile store.
+    """
+    monkeypatch.setenv("LLM_CACHE_PATH", "")
+    monkeypatch.setenv("EXTRACTION_CACHE_PATH", "")
+    monkeypatch.setenv("PROFILE_STORE_PATH", "")
+    for prefix in ("LLM_CACHE", "EXTRACTION_CACHE"):
+        set_cache(prefix, None)
+    client = FakeClient()
+    previous = set_default_client(client)
+    yield client
+    set_default_client(previous)
+    for prefix in ("LLM_CACHE", "EXTRACTION_CACHE"):
+        set_cache(prefix, None)
+
+
+@pytest.fixture
+def profile_store(tmp_path):
+    """
+    Empty ProfileStore installed as the process-wide store.
+    """
+    store = ProfileStore(str(tmp_path / "profiles.sqlite3"))
+    previous = set_profile_store(store)
+    yield store
+    set_profile_store(previous)
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from agents.base_agent import BaseAgent, stream_lines_to
+from agents.cache import set_cache
+from agents.ollama_client import OllamaError
+
+
+class ScriptedClient:
+    """
+    Client streaming a fixed response per prompt, optionally failing after some lines.
+    """
+    model = "scripted"
+
+    def __init__(self, responses, fail_after=None):
+        self.responses = responses
+        self.fail_after = fail_after
+
+    def generate(self, prompt, **kwargs):
+        return {"response": self.responses[prompt], "done": True}
+
+    def generate_stream(self, prompt, **kwargs):
+        for i, line in enumerate(self.responses[prompt].split("\n")):
+            if self.fail_after is not None and i == self.fail_after:
+                raise OllamaError("connection lost")
+            yield {"response": line + "\n", "done": False}
+        yield {"response": "", "done": True}
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", "")
+    set_cache("LLM_CACHE", None)
+    yield
+    set_cache("LLM_CACHE", None)
+
+
+def make_agent(client):
+    agent = BaseAgent("TestAgent")
+    agent.client = client
+    return agent
+
+
+def test_streamed_request_returns_full_response():
+    agent = make_agent(ScriptedClient({"p": "a\nb\nc"}))
+    seen = []
+    with stream_lines_to(lambda agent, line, lines: seen.append(line)):
+        response = agent.ollama_request("p")
+    assert response.split("\n")[:3] == ["a", "b", "c"]
+    assert seen[:3] == ["a", "b", "c"]
+
+
+def test_mid_stream_error_fails_the_request():
+    agent = make_agent(ScriptedClient({"p": "a\nb\nc"}, fail_after=2))
+    with stream_lines_to(lambda agent, line, lines: None):
+        assert agent.ollama_request("p") is None
+
+
+def test_stream_generator_ends_early_on_error():
+    agent = make_agent(ScriptedClient({"p": "a\nb\nc"}, fail_after=2))
+    assert list(agent.ollama_request_stream("p")) == ["a", "b"]
+
+
+def test_listener_lines_are_per_request():
+    agent = make_agent(ScriptedClient({"first": "1a\n1b", "second": "2a\n2b"}))
+    buffers = {}
+    barrier = threading.Barrier(2)
+
+    def listener(agent, line, lines):
+        buffers.setdefault(id(lines), lines)
+        if len(lines) == 1:
+            # Make both requests stream at the same time.
+            barrier.wait(timeout=5)
+
+    def request(prompt):
+        with stream_lines_to(listener):
+            agent.ollama_request(prompt)
+
+    threads = [threading.Thread(target=request, args=(prompt,)) for prompt in ("first", "second")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    contents = sorted([line for line in lines if line] for lines in buffers.values())
+    assert contents == [["1a", "1b"], ["2a", "2b"]]
+
+
+def test_agents_with_the_same_name_share_one_log_handler():
+    first = BaseAgent("SharedLoggerAgent")
+    second = BaseAgent("SharedLoggerAgent")
+    assert second.logger is first.logger
+    assert len(second.logger.handlers) == 1
@@ -0,0 +1,78 @@
+import io
+import json
+
+import pytest
+
+import batch_screen
+from conftest import make_pdf
+
+JOBS = [{"title": "Data Scientist", "description": "Build models.", "required_skills": ["Python", "SQL"]}]
+
+
+@pytest.fixture
+def job_list_path(tmp_path):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(JOBS), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def resume_dir(tmp_path, fake_llm, monkeypatch):
+    monkeypatch.setattr(batch_screen, "_orchestrator", None)
+    directory = tmp_path / "resumes"
+    (directory / "nested").mkdir(parents=True)
+    for name in ("b.pdf", "a.PDF", "nested/c.pdf"):
+        (directory / name).write_bytes(make_pdf([[name, "Skills: Python"]]))
+    (directory / "notes.txt").write_text("not a resume")
+    return directory
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_collect_resumes_from_directory_and_manifest(resume_dir, tmp_path):
+    found = batch_screen.collect_resumes(str(resume_dir))
+    assert [path[len(str(resume_dir)) + 1:] for path in found] == ["a.PDF", "b.pdf", "nested/c.pdf"]
+
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text(f"# resumes\nresumes/b.pdf\n\n{json.dumps({'path': found[0]})}\n")
+    assert batch_screen.collect_resumes(manifest=str(manifest)) == [str(tmp_path / "resumes" / "b.pdf"), found[0]]
+
+
+def test_run_batch_streams_one_record_per_resume(resume_dir, job_list_path, tmp_path):
+    paths = batch_screen.collect_resumes(str(resume_dir))
+    output = tmp_path / "results.jsonl"
+    progress = io.StringIO()
+    assert batch_screen.run_batch(paths, job_list_path, str(output), workers=2, progress=progress) == (3, 0)
+    records = read_records(output)
+    assert sorted(record["resume"] for record in records) == paths
+    assert all(record["status"] == "ok" and record["result"]["matched_jobs"] for record in records)
+    assert progress.getvalue().splitlines()[-1].startswith("[3/3] failed=0")
+
+
+def test_failures_are_recorded_against_their_resume(resume_dir, job_list_path, tmp_path, monkeypatch):
+    paths = batch_screen.collect_resumes(str(resume_dir))
+    screen_resume = batch_screen.screen_resume
+
+    def flaky(resume_path, job_list_path):
+        if resume_path == paths[0]:
+            raise RuntimeError("worker died")
+        return screen_resume(resume_path, job_list_path)
+
+    monkeypatch.setattr(batch_screen, "screen_resume", flaky)
+    output = tmp_path / "results.jsonl"
+    assert batch_screen.run_batch(paths, job_list_path, str(output), progress=None) == (3, 1)
+    failed = [record for record in read_records(output) if record["status"] == "error"]
+    assert failed == [{"resume": paths[0], "status": "error", "error": "worker died"}]
+
+
+def test_pipeline_errors_become_error_records(resume_dir, job_list_path, monkeypatch):
+    path = batch_screen.collect_resumes(str(resume_dir))[0]
+    batch_screen._init_worker()
+    monkeypatch.setattr(batch_screen._orchestrator, "process_resume", lambda *args: {"error": "Failed to match jobs"})
+    record = batch_screen.screen_resume(path, job_list_path)
+    assert record["resume"] == path
+    assert (record["status"], record["error"]) == ("error", "Failed to match jobs")
+    assert record["elapsed_s"] >= 0
@@ -0,0 +1,61 @@
+import io
+import json
+import re
+
+import pytest
+
+from agents.extractor_agent import ExtractorAgent
+from agents.ollama_client import set_default_client
+from benchmarks.fake_llm import FakeLLMClient, canned_response, count_tokens
+from benchmarks.pipeline_bench import run_scenario, synthetic_resume_lines, synthetic_resume_pdf
+from benchmarks.shortlist_bench import synthetic_jobs
+
+
+def test_canned_responses_answer_every_agent():
+    for phrase in ("expert resume parser", "analyze this candidate", "provide scores", "detailed recommendation"):
+        assert canned_response(f"... {phrase} ...")
+    assert json.loads(canned_response("Reply with a single JSON object."))["screening"]
+    assert canned_response("Something else") == ""
+
+
+def test_matching_answer_scores_the_listed_jobs():
+    prompt = "match the candidate with the following jobs\nTitle: Data Scientist\n\nTitle: Web Developer\n"
+    response = canned_response(prompt)
+    assert re.findall(r"^Job Title: (.+)$", response, re.M) == ["Data Scientist", "Web Developer"]
+    assert response == canned_response(prompt)
+    recommendation = canned_response("detailed recommendation\nMatched Jobs:\n- Web Developer (0.7)")
+    assert "Top Matched Job: Web Developer" in recommendation
+
+
+def test_fake_client_reports_usage_and_latency():
+    client = FakeLLMClient(token_latency=0.0, prefill_latency=0.0)
+    response = client.generate("provide scores", system="You are a screener. ")
+    assert response["prompt_eval_count"] == count_tokens("You are a screener. provide scores")
+    assert response["eval_count"] == count_tokens(response["response"])
+    chunks = list(client.generate_stream("provide scores"))
+    assert "".join(chunk["response"] for chunk in chunks).strip() == response["response"]
+    assert chunks[-1]["done"] is True
+    assert client.calls == 2
+    client.reset()
+    assert (client.calls, client.prompt_tokens, client.response_tokens) == (0, 0, 0)
+
+
+def test_synthetic_resume_pdf_is_readable():
+    pages = synthetic_resume_lines(2, seed=3)
+    text = ExtractorAgent().extract_text(io.BytesIO(synthetic_resume_pdf(2, seed=3)), char_budget=100_000)
+    assert len(pages) == 2
+    assert text.splitlines()[0] == "Candidate 3"
+    assert pages[1][-1].strip() in text
+
+
+@pytest.mark.parametrize("scenario", ["single", "batch", "sessions"])
+def test_scenarios_run_without_errors(scenario, fake_llm, tmp_path):
+    client = FakeLLMClient(token_latency=0.0, prefill_latency=0.0)
+    set_default_client(client)
+    job_list_path = tmp_path / "jobs.json"
+    job_list_path.write_text(json.dumps(synthetic_jobs(30)), encoding="utf-8")
+    resumes = [synthetic_resume_pdf(1, seed) for seed in range(3)]
+    row = run_scenario(scenario, client, resumes, str(job_list_path), concurrency=2, trace_memory=False)
+    assert (row["scenario"], row["resumes"], row["errors"]) == (scenario, 3, 0)
+    assert row["llm_calls_per_resume"] == 5
+    assert row["p50_s"] <= row["p99_s"]
@@ -0,0 +1,135 @@
+import itertools
+import os
+
+import pytest
+
+from agents import cache as cache_module
+from agents.cache import SQLiteCache, cached_directory, get_llm_cache, llm_cache_key, set_cache
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache" / "llm.sqlite3")
+
+
+def test_set_and_get(path):
+    cache = SQLiteCache(path)
+    assert cache.get("a") is None
+    cache.set("a", "first")
+    cache.set("a", "second")
+    assert cache.get("a") == "second"
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_persist_across_instances(path):
+    SQLiteCache(path).set("a", "value")
+    assert SQLiteCache(path).get("a") == "value"
+
+
+def test_tables_are_independent(path):
+    responses = SQLiteCache(path, table="responses")
+    extractions = SQLiteCache(path, table="extractions")
+    responses.set("a", "response")
+    assert extractions.get("a") is None
+
+
+def test_least_recently_used_entries_are_evicted(path, monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(cache_module.time, "time", lambda: next(clock))
+    cache = SQLiteCache(path, max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = SQLiteCache(path, ttl=60)
+    cache.set("a", "value")
+    now[0] += 59
+    assert cache.get("a") == "value"
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_bypass_misses_but_stores(path):
+    SQLiteCache(path, bypass=True).set("a", "value")
+    assert SQLiteCache(path, bypass=True).get("a") is None
+    assert SQLiteCache(path).get("a") == "value"
+
+
+def test_clear(path):
+    cache = SQLiteCache(path)
+    cache.set("a", "value")
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_llm_cache_key():
+    key = llm_cache_key("llama3", "prompt", {"temperature": 0})
+    assert key == llm_cache_key("llama3", "prompt", {"temperature": 0})
+    assert key == llm_cache_key("llama3", "prompt", {"temperature": 0}, system=None)
+    assert key != llm_cache_key("llama3", "prompt", {"temperature": 0.5})
+    assert key != llm_cache_key("mistral", "prompt", {"temperature": 0})
+    assert key != llm_cache_key("llama3", "prompt", {"temperature": 0}, system="You are a recruiter.")
+    assert key != llm_cache_key("llama3", "prompt", {"temperature": 0}, format="json")
+
+
+class Saved:
+    def __init__(self, value):
+        self.value = value
+
+    def save(self, directory):
+        os.makedirs(directory)
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            f.write(self.value)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "meta.json")) as f:
+            return cls(f"loaded {f.read()}")
+
+
+def test_cached_directory_builds_once_and_prunes_old_versions(tmp_path):
+    cache_dir = str(tmp_path)
+    builds = []
+
+    def build(value):
+        builds.append(value)
+        return Saved(value)
+
+    assert cached_directory(cache_dir, "src", "v1", lambda: build("one"), Saved.load).value == "one"
+    assert cached_directory(cache_dir, "src", "v1", lambda: build("again"), Saved.load).value == "loaded one"
+    cached_directory(cache_dir, "other", "v1", lambda: build("other"), Saved.load)
+    cached_directory(cache_dir, None, "v1", lambda: build("unsourced"), Saved.load)
+    assert cached_directory(cache_dir, "src", "v2", lambda: build("two"), Saved.load).value == "two"
+    assert builds == ["one", "other", "unsourced", "two"]
+    # Only the older version of the same source is removed.
+    assert sorted(os.listdir(cache_dir)) == ["other-v1", "src-v2", "v1"]
+
+
+def test_cache_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "env.sqlite3"))
+    monkeypatch.setenv("LLM_CACHE_MAX_ENTRIES", "5")
+    set_cache("LLM_CACHE", None)
+    try:
+        cache = get_llm_cache()
+        assert cache.path == str(tmp_path / "env.sqlite3")
+        assert cache.max_entries == 5
+        assert get_llm_cache() is cache
+
+        monkeypatch.setenv("LLM_CACHE_PATH", "")
+        set_cache("LLM_CACHE", None)
+        assert get_llm_cache() is None
+    finally:
+        set_cache("LLM_CACHE", None)
+    assert os.path.exists(tmp_path / "env.sqlite3")
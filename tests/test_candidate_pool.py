@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agents.candidate_pool import (  # noqa: E402
+    CandidatePool, SavedCandidates, candidate_from_result, load_candidates,
+)
+
+CANDIDATES = [
+    {"id": "ada", "name": "Ada", "skills": ["Python", "Machine Learning", "SQL"],
+     "experience": ["Trained forecasting models"], "strengths": ["statistics"]},
+    {"id": "bob", "name": "Bob", "skills": ["JavaScript", "React"],
+     "experience": ["Built web applications"], "strengths": []},
+    {"id": "cy", "name": "Cy", "skills": ["Python 3"],
+     "experience": ["Wrote data pipelines"], "strengths": ["machine learning"]},
+]
+
+JOB = {"title": "Data Scientist", "description": "Build machine learning models.",
+       "required_skills": ["Python", "Machine Learning"]}
+
+
+def test_rank_scores_skills_and_terms():
+    ranked = CandidatePool(CANDIDATES).rank(JOB, top_k=3)
+    assert [candidate["id"] for candidate, _, _, _ in ranked] == ["ada", "cy", "bob"]
+    _, score, skills, terms = ranked[0]
+    assert skills == 1.0
+    assert score == pytest.approx(CandidatePool.SKILL_WEIGHT * skills + CandidatePool.TERM_WEIGHT * terms)
+    # 'python 3' earns partial credit for 'python'.
+    assert ranked[1][2] == pytest.approx(CandidatePool.PARTIAL_CREDIT / 2)
+    assert CandidatePool([]).rank(JOB) == []
+
+
+def test_saved_pool_ranks_the_same_and_reads_candidates_lazily(tmp_path):
+    pool = CandidatePool(CANDIDATES)
+    directory = str(tmp_path / "pool")
+    pool.save(directory)
+    with open(os.path.join(directory, "meta.json")) as f:
+        assert "candidates" not in json.load(f)
+
+    loaded = CandidatePool.load(directory)
+    assert loaded.loaded and not pool.loaded
+    assert isinstance(loaded.candidates, SavedCandidates)
+    assert len(loaded) == 3
+    assert loaded.rank(JOB, top_k=2) == pool.rank(JOB, top_k=2)
+    assert loaded.candidates[-1] == CANDIDATES[-1]
+    assert loaded.candidates[1:] == CANDIDATES[1:]
+    assert list(loaded.candidates) == CANDIDATES
+    with pytest.raises(IndexError):
+        loaded.candidates[3]
+
+
+def test_empty_pool_round_trips(tmp_path):
+    CandidatePool([]).save(str(tmp_path / "empty"))
+    loaded = CandidatePool.load(str(tmp_path / "empty"))
+    assert len(loaded) == 0
+    assert loaded.rank(JOB) == []
+
+
+def test_cached_pool_is_reused_until_the_version_changes(tmp_path):
+    cache_dir = str(tmp_path / "pools")
+    builds = []
+
+    def candidates():
+        builds.append(1)
+        return CANDIDATES
+
+    first = CandidatePool.cached("src", "v1", candidates, cache_dir)
+    second = CandidatePool.cached("src", "v1", candidates, cache_dir)
+    assert not first.loaded and second.loaded
+    assert len(builds) == 1
+    third = CandidatePool.cached("src", "v2", candidates, cache_dir)
+    assert not third.loaded and len(builds) == 2
+    assert sorted(os.listdir(cache_dir)) == ["src-v2"]
+    # An empty cache directory disables saving.
+    assert not CandidatePool.cached("src", "v2", candidates, "").loaded
+
+
+def test_for_files_rebuilds_when_a_file_changes(tmp_path):
+    path = tmp_path / "screened.jsonl"
+    records = [
+        {"status": "ok", "resume": "ada.pdf",
+         "result": {"extracted_data": {"name": "Ada", "skills": ["Python"]}, "analysis_results": {}}},
+        {"status": "error", "resume": "broken.pdf"},
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+    cache_dir = str(tmp_path / "pools")
+    pool = CandidatePool.for_files([str(path)], cache_dir)
+    assert [candidate["id"] for candidate in pool.candidates] == ["ada.pdf"]
+    assert CandidatePool.for_files([str(path)], cache_dir).loaded
+
+    result = {"extracted_data": {"name": "Bob", "skills": ["SQL"]}, "analysis_results": {"strengths": ["x"]}}
+    with open(path, "a") as f:
+        f.write(json.dumps(result) + "\n")
+    os.utime(path, ns=(0, 10 ** 18))
+    pool = CandidatePool.for_files([str(path)], cache_dir)
+    assert not pool.loaded
+    assert [candidate["name"] for candidate in pool.candidates] == ["Ada", "Bob"]
+    assert load_candidates([str(path)])[1] == candidate_from_result(result, f"{path}:3")
@@ -0,0 +1,128 @@
+import gzip
+import json
+
+import pytest
+
+from agents.base_agent import BaseAgent
+from agents.cache import set_cache
+from agents.cassette import CassetteClient, cassette_from_env
+from agents.ollama_client import OllamaError
+
+
+class CountingClient:
+    """
+    Client answering every prompt with a numbered response.
+    """
+    model = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, **kwargs):
+        self.calls += 1
+        return {"response": f"{prompt} #{self.calls}", "done": True, "eval_count": 3, "total_duration": 9}
+
+    def generate_stream(self, prompt, **kwargs):
+        self.calls += 1
+        yield {"response": f"{prompt}\n", "done": False}
+        yield {"response": f"#{self.calls}", "done": False}
+        yield {"response": "", "done": True, "eval_count": 2}
+
+
+@pytest.fixture(params=["cassette.jsonl", "cassette.jsonl.gz"])
+def path(tmp_path, request):
+    return str(tmp_path / "cassettes" / request.param)
+
+
+def record(path, client=None):
+    recorder = CassetteClient(path, "record", client or CountingClient())
+    recorder.generate("hello", system="sys")
+    recorder.generate("hello", system="sys")
+    list(recorder.generate_stream("stream"))
+    recorder.close()
+
+
+def test_record_writes_one_line_per_request(path):
+    record(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry["response"] for entry in entries] == ["hello #1", "hello #2", "stream\n#3"]
+    assert entries[0]["prompt_chars"] == len("hello") + len("sys")
+    # Only known server statistics are kept, and prompts are stored as their hash.
+    assert entries[0]["stats"] == {"eval_count": 3}
+    assert "hello" not in entries[0]["key"]
+    assert entries[0]["key"] == entries[1]["key"]
+
+
+def test_replay_returns_recordings_in_order(path):
+    record(path)
+    replay = CassetteClient(path, "replay")
+    assert len(replay) == 3
+    assert replay.generate("hello", system="sys")["response"] == "hello #1"
+    assert replay.generate("hello", system="sys")["response"] == "hello #2"
+    assert replay.generate("hello", system="sys")["response"] == "hello #1"
+    assert replay.generate("hello", system="sys")["eval_count"] == 3
+    assert replay.hits == 4
+
+
+def test_replay_stream(path):
+    record(path)
+    chunks = list(CassetteClient(path, "replay").generate_stream("stream"))
+    assert "".join(chunk["response"] for chunk in chunks) == "stream\n#3"
+    assert chunks[-1]["done"] is True
+    assert chunks[-1]["eval_count"] == 2
+
+
+def test_replay_miss_raises(path):
+    record(path)
+    replay = CassetteClient(path, "replay")
+    with pytest.raises(OllamaError):
+        replay.generate("hello", system="another system prompt")
+    assert replay.misses == 1
+
+
+def test_recording_needs_a_client(path):
+    with pytest.raises(ValueError):
+        CassetteClient(path, "record")
+    with pytest.raises(ValueError):
+        CassetteClient(path, "rewind", CountingClient())
+
+
+def test_cassette_from_env(tmp_path, monkeypatch):
+    client = CountingClient()
+    monkeypatch.delenv("LLM_CASSETTE_MODE", raising=False)
+    assert cassette_from_env(client) is client
+
+    path = str(tmp_path / "env.jsonl")
+    monkeypatch.setenv("LLM_CASSETTE_MODE", "record")
+    monkeypatch.setenv("LLM_CASSETTE_PATH", path)
+    recorder = cassette_from_env(client)
+    assert recorder.recording and recorder.client is client
+
+    recorder.generate("hello")
+    recorder.close()
+    monkeypatch.setenv("LLM_CASSETTE_MODE", "replay")
+    monkeypatch.setenv("LLM_CASSETTE_REALTIME", "1")
+    replay = cassette_from_env(client)
+    assert replay.mode == "replay" and replay.realtime and not replay.recording
+
+
+def test_recording_bypasses_cache_lookups(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    set_cache("LLM_CACHE", None)
+    try:
+        client = CountingClient()
+        agent = BaseAgent("CassetteTestAgent")
+        agent.client = client
+        assert agent.ollama_request("hello") == "hello #1"
+        assert agent.ollama_request("hello") == "hello #1"
+        assert client.calls == 1
+
+        path = str(tmp_path / "recorded.jsonl")
+        agent.client = CassetteClient(path, "record", client)
+        assert agent.ollama_request("hello") == "hello #2"
+        agent.client.close()
+        assert len(CassetteClient(path, "replay")) == 1
+    finally:
+        set_cache("LLM_CACHE", None)
@@ -0,0 +1,131 @@
+import io
+
+import pytest
+
+from agents.cache import set_cache
+from agents.extractor_agent import ExtractorAgent
+from conftest import make_pdf
+
+PDF = make_pdf([["Jordan Lee", "Skills: Python, SQL"], [], ["Data Scientist at Company 1"]])
+
+EXTRACTED = {
+    "name": "Jordan Lee",
+    "skills": ["Python", "SQL", "Machine Learning", "Docker"],
+    "education": ["BSc Computer Science from State University, 2018"],
+    "experience": ["Data Scientist at Company 1, 2021 - 2024", "Data Analyst at Company 2, 2018 - 2021"],
+}
+
+
+@pytest.fixture
+def extraction_cache(fake_llm, tmp_path, monkeypatch):
+    monkeypatch.setenv("EXTRACTION_CACHE_PATH", str(tmp_path / "extractions.sqlite3"))
+    set_cache("EXTRACTION_CACHE", None)
+    return fake_llm
+
+
+@pytest.fixture
+def resume(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(PDF)
+    return str(path)
+
+
+def test_repeated_resume_is_served_from_the_extraction_cache(extraction_cache, resume):
+    assert ExtractorAgent().process(resume) == EXTRACTED
+    assert extraction_cache.calls == 1
+    # A new agent with the same version finds the stored extraction by content hash.
+    assert ExtractorAgent().process(resume) == EXTRACTED
+    assert extraction_cache.calls == 1
+
+
+def test_extraction_cache_is_keyed_by_content_and_version(extraction_cache, resume, tmp_path):
+    ExtractorAgent().process(resume)
+    other = tmp_path / "other.pdf"
+    other.write_bytes(make_pdf([["Someone else"]]))
+    ExtractorAgent().process(str(other))
+    assert extraction_cache.calls == 2
+    agent = ExtractorAgent()
+    agent._version = "another-extractor"
+    agent.process(resume)
+    assert extraction_cache.calls == 3
+
+
+def test_failed_extraction_is_not_cached(extraction_cache, resume, monkeypatch):
+    agent = ExtractorAgent()
+    monkeypatch.setattr(extraction_cache, "respond", lambda prompt: "")
+    assert agent.process(resume)["name"] is None
+    monkeypatch.undo()
+    extraction_cache.prompts.clear()
+    assert ExtractorAgent().process(resume) == EXTRACTED
+
+
+def test_pages_are_read_lazily_skipping_empty_ones(fake_llm):
+    agent = ExtractorAgent()
+    pages = [(number, text) for number, text, _ in agent.iter_page_text(io.BytesIO(PDF))]
+    assert pages == [(1, "Jordan Lee\nSkills: Python, SQL"), (3, "Data Scientist at Company 1")]
+
+
+def test_extract_text_stops_at_the_character_budget(fake_llm, monkeypatch):
+    agent = ExtractorAgent()
+    parsed = []
+    iter_page_text = agent.iter_page_text
+
+    def recording(pdf_source):
+        for page in iter_page_text(pdf_source):
+            parsed.append(page[0])
+            yield page
+
+    monkeypatch.setattr(agent, "iter_page_text", recording)
+    assert agent.extract_text(io.BytesIO(PDF), char_budget=5) == "Jorda"
+    assert parsed == [1]
+    assert agent.extract_text(io.BytesIO(PDF)) == "Jordan Lee\nSkills: Python, SQL\nData Scientist at Company 1"
+
+
+def test_budget_in_tokens(monkeypatch):
+    monkeypatch.setenv("EXTRACTOR_TOKEN_BUDGET", "100")
+    assert ExtractorAgent().char_budget == 400
+    monkeypatch.delenv("EXTRACTOR_TOKEN_BUDGET")
+    assert ExtractorAgent().char_budget == 2000
+    assert ExtractorAgent(chunk_size=1000).char_budget == 16000
+
+
+def test_split_chunks_overlap_and_prefer_line_breaks():
+    agent = ExtractorAgent(chunk_size=10, chunk_overlap=3)
+    text = "aaaa\nbbbbbbbb\ncccc"
+    chunks = agent.split_chunks(text)
+    assert chunks == ["aaaa\nbbbbb", "bbbbbb", "bbb\ncccc"]
+    assert all(len(chunk) <= 10 for chunk in chunks)
+    assert ExtractorAgent(chunk_size=100).split_chunks(text) == [text]
+    assert agent.split_chunks("") == []
+
+
+def test_merge_extractions_keeps_first_name_and_deduplicates():
+    merged = ExtractorAgent().merge_extractions([
+        {"name": None, "skills": ["Python", "SQL"], "education": [], "experience": ["Analyst at A"]},
+        {"name": "Jordan", "skills": ["sql", "Docker"], "education": ["BSc"], "experience": ["analyst  at a"]},
+        {"name": "Other", "skills": [], "education": [], "experience": []},
+    ])
+    assert merged == {
+        "name": "Jordan", "skills": ["Python", "SQL", "Docker"], "education": ["BSc"], "experience": ["Analyst at A"],
+    }
+
+
+def test_long_resume_is_extracted_in_chunks(fake_llm, tmp_path):
+    path = tmp_path / "long.pdf"
+    path.write_bytes(make_pdf([[f"Line {i} of the resume with some filler text" for i in range(40)]]))
+    agent = ExtractorAgent(chunk_size=400, chunk_overlap=50)
+    assert agent.process(str(path)) == EXTRACTED
+    assert fake_llm.calls == len(agent.split_chunks(agent.extract_text(str(path)))) > 1
+    assert all(len(prompt.split("Resume text:\n", 1)[1]) <= 400 for prompt in fake_llm.prompts)
+
+
+@pytest.mark.parametrize("make_input", [
+    bytes, bytearray, memoryview, io.BytesIO,
+    lambda data: io.BufferedReader(io.BytesIO(data)),
+])
+def test_in_memory_inputs_match_the_file(make_input, fake_llm, resume):
+    agent = ExtractorAgent()
+    digest, stream = agent.open_pdf(make_input(PDF))
+    assert digest == agent.open_pdf(resume)[0]
+    assert stream.read() == PDF
+    assert agent.process(make_input(PDF)) == agent.process(resume) == EXTRACTED
@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from agents.fused_agent import FUSED_SCHEMA, FusedAgent, validate_section
+from agents.orchestrator import Orchestrator
+
+ANALYSIS = {"strengths": [" Python ", ""], "weaknesses": ["cloud"], "suggestions": [], "confidence_score": 1}
+SCREENING = {
+    "qualification_alignment_score": 0.7,
+    "experience_relevance_score": 0.6,
+    "skills_match_score": 0.8,
+    "potential_red_flags_score": 0.1,
+}
+RECOMMENDATION = {"recommendation_summary": " Good fit. ", "top_matched_job": "Data Scientist", "additional_notes": "-"}
+
+EXTRACTED = {"name": "Ada", "skills": ["Python"], "education": ["BSc"], "experience": ["Analyst, 2019 - 2023"]}
+MATCHED = [{"title": "Data Scientist", "confidence_score": 0.9, "reasoning": "Python"}]
+
+
+def test_validate_section_normalizes_valid_sections():
+    assert validate_section("analysis_results", ANALYSIS) == {
+        "strengths": ["Python"], "weaknesses": ["cloud"], "suggestions": [], "confidence_score": 1.0,
+    }
+    assert validate_section("screening_results", SCREENING) == SCREENING
+    assert validate_section("recommendations", RECOMMENDATION)["recommendation_summary"] == "Good fit."
+
+
+@pytest.mark.parametrize("section, data", [
+    ("screening_results", {**SCREENING, "skills_match_score": 1.5}),
+    ("screening_results", {**SCREENING, "skills_match_score": True}),
+    ("screening_results", {**SCREENING, "skills_match_score": "0.8"}),
+    ("screening_results", {key: value for key, value in SCREENING.items() if key != "skills_match_score"}),
+    ("analysis_results", {**ANALYSIS, "strengths": ["Python", 3]}),
+    ("analysis_results", {**ANALYSIS, "weaknesses": "cloud"}),
+    ("recommendations", {**RECOMMENDATION, "top_matched_job": "  "}),
+    ("recommendations", ["not", "a", "dict"]),
+    ("recommendations", None),
+])
+def test_validate_section_rejects_schema_violations(section, data):
+    assert validate_section(section, data) is None
+
+
+def test_parse_partially_valid_response():
+    response = "Here you go:\n" + json.dumps({
+        "analysis": ANALYSIS,
+        "screening": {**SCREENING, "potential_red_flags_score": -1},
+        "recommendation": RECOMMENDATION,
+    }) + "\nThanks!"
+    sections = FusedAgent().parse_llama_response(response)
+    assert set(sections) == set(FUSED_SCHEMA)
+    assert sections["screening_results"] is None
+    assert sections["analysis_results"]["strengths"] == ["Python"]
+    assert sections["recommendations"]["top_matched_job"] == "Data Scientist"
+
+
+@pytest.mark.parametrize("response", ["No JSON here.", "{not json}", json.dumps({"analysis": []})])
+def test_parse_fully_invalid_response(response):
+    assert FusedAgent().parse_llama_response(response) == FusedAgent().default_response()
+
+
+@pytest.fixture
+def orchestrator(fake_llm, monkeypatch):
+    monkeypatch.delenv("SCREENER_MODE", raising=False)
+    orchestrator = Orchestrator(pipeline_mode="fused")
+    calls = []
+    for agent in (orchestrator.analyzer_agent, orchestrator.screener_agent, orchestrator.recommender_agent):
+        method = "recommend" if agent is orchestrator.recommender_agent else "process"
+
+        def wrap(original, name=agent.name):
+            def call(*args, **kwargs):
+                calls.append(name)
+                return original(*args, **kwargs)
+            return call
+
+        monkeypatch.setattr(agent, method, wrap(getattr(agent, method)))
+    orchestrator.fallback_calls = calls
+    return orchestrator
+
+
+def resolve(orchestrator, fused):
+    events = []
+    results = orchestrator._resolve_fused(
+        fused, EXTRACTED, MATCHED, [], lambda *event: events.append(event[:2])
+    )
+    return results, events
+
+
+def test_resolve_partially_valid_output_reruns_only_invalid_sections(orchestrator):
+    fused = FusedAgent().parse_llama_response(json.dumps(
+        {"analysis": ANALYSIS, "screening": {}, "recommendation": RECOMMENDATION}
+    ))
+    (analysis, screening, recommendations), events = resolve(orchestrator, fused)
+    assert orchestrator.fallback_calls == ["ScreenerAgent"]
+    assert analysis == fused["analysis_results"]
+    assert screening["skills_match_score"] == 0.8
+    assert recommendations == fused["recommendations"]
+    assert events == [
+        ("stage_completed", "analysis_results"),
+        ("stage_completed", "screening_results"),
+        ("stage_completed", "recommendations"),
+    ]
+
+
+def test_resolve_fully_invalid_output_reruns_every_section(orchestrator):
+    (analysis, screening, recommendations), events = resolve(orchestrator, FusedAgent().default_response())
+    assert orchestrator.fallback_calls == ["AnalyzerAgent", "ScreenerAgent", "RecommenderAgent"]
+    assert analysis and screening and recommendations
+    assert [stage for _, stage in events] == ["analysis_results", "screening_results", "recommendations"]
+
+
+def test_resolve_stops_at_the_first_missing_section(orchestrator, monkeypatch):
+    monkeypatch.setattr(orchestrator.screener_agent, "process", lambda *args: {})
+    fused = {**FusedAgent().default_response(), "analysis_results": validate_section("analysis_results", ANALYSIS)}
+    (analysis, screening, recommendations), events = resolve(orchestrator, fused)
+    assert analysis and not screening and recommendations is None
+    assert events == [("stage_completed", "analysis_results")]
+    assert "RecommenderAgent" not in orchestrator.fallback_calls
+
+
+def test_fused_pipeline_events(orchestrator, tmp_path, fake_llm):
+    job_list_path = str(tmp_path / "jobs.json")
+    with open(job_list_path, "w", encoding="utf-8") as f:
+        json.dump([{"title": "Data Scientist", "description": "Build models.", "required_skills": ["Python"]}], f)
+    events = []
+    result = orchestrator._process_fused(EXTRACTED, job_list_path, lambda *event: events.append(event[:2]))
+    assert "error" not in result
+    assert orchestrator.fallback_calls == []
+    # One matching call and one fused call.
+    assert fake_llm.calls == 2
+    assert events == [
+        ("stage_started", "matched_jobs"),
+        ("stage_completed", "matched_jobs"),
+        ("stage_started", "analysis_results"),
+        ("stage_completed", "analysis_results"),
+        ("stage_completed", "screening_results"),
+        ("stage_completed", "recommendations"),
+    ]
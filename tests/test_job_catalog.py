@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+
+from agents.job_catalog import JobCatalog, get_job_catalog, job_version, render_job
+
+JOBS = [
+    {"title": "Data Scientist", "description": "Build models.", "required_skills": ["Python", "Machine Learning"]},
+    {"title": "Data Analyst", "description": "Report on data.", "required_skills": ["SQL", " Excel "]},
+]
+
+
+def write_json(path, jobs, mtime=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(jobs, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "jobs.json")
+    write_json(path, JOBS, mtime=1_000_000)
+    return path
+
+
+def test_load_json(path):
+    catalog = JobCatalog(path)
+    assert len(catalog) == 2
+    assert [job["title"] for job in catalog.jobs] == ["Data Scientist", "Data Analyst"]
+    assert catalog.skills[1] == frozenset({"sql", "excel"})
+    assert catalog.version
+
+
+def test_load_jsonl_matches_json(tmp_path, path):
+    jsonl = str(tmp_path / "jobs.jsonl")
+    with open(jsonl, "w", encoding="utf-8") as f:
+        f.write("\n".join(json.dumps(job) for job in JOBS) + "\n\n")
+    assert JobCatalog(jsonl).jobs == JobCatalog(path).jobs
+
+
+def test_unchanged_file_is_not_reloaded(path):
+    catalog = JobCatalog(path)
+    jobs, version = catalog.jobs, catalog.version
+    assert catalog.refresh() is False
+    # Touching the file without editing it keeps the version and the job list object.
+    os.utime(path, (2_000_000, 2_000_000))
+    assert catalog.refresh() is False
+    assert catalog.jobs is jobs
+    assert catalog.version == version
+
+
+def test_edited_file_is_reloaded(path):
+    catalog = JobCatalog(path)
+    jobs, version = catalog.jobs, catalog.version
+    write_json(path, JOBS + [{"title": "ML Engineer", "description": "Ship models.", "required_skills": []}],
+               mtime=3_000_000)
+    assert catalog.refresh() is True
+    assert catalog.jobs is not jobs
+    assert catalog.version != version
+    assert len(catalog) == 3
+
+
+def test_job_versions_follow_job_content(path):
+    catalog = JobCatalog(path)
+    before = catalog.job_versions()
+    assert before == {job["title"]: job_version(job) for job in catalog.jobs}
+    edited = [dict(JOBS[0], description="Build and deploy models."), JOBS[1]]
+    write_json(path, edited, mtime=3_000_000)
+    catalog.refresh()
+    after = catalog.job_versions()
+    assert after["Data Scientist"] != before["Data Scientist"]
+    assert after["Data Analyst"] == before["Data Analyst"]
+
+
+def test_fragments_and_positions(path):
+    catalog = JobCatalog(path)
+    job = catalog.jobs[1]
+    assert catalog.position(job) == 1
+    assert catalog.fragment(job) == render_job(job)
+    assert catalog.fragment(job) is catalog.fragment(job)
+    outsider = dict(job)
+    assert catalog.position(outsider) is None
+    assert catalog.fragment(outsider) == render_job(job)
+
+
+def test_get_job_catalog_is_shared_and_refreshed(path):
+    catalog = get_job_catalog(path)
+    assert get_job_catalog(path) is catalog
+    write_json(path, JOBS[:1], mtime=4_000_000)
+    assert len(get_job_catalog(path)) == 1
+
+
+def test_snapshot_is_replaced_as_a_whole(path):
+    catalog = JobCatalog(path)
+    before = catalog.snapshot
+    jobs, skills, version = before
+    assert (catalog.jobs, catalog.skills, catalog.version) == (jobs, skills, version)
+    write_json(path, JOBS[:1], mtime=3_000_000)
+    catalog.refresh()
+    # The previous snapshot is left untouched for readers still holding it.
+    assert catalog.snapshot is not before
+    assert before == (jobs, skills, version) and len(before[0]) == len(before[1]) == 2
+    assert len(catalog.jobs) == len(catalog.skills) == 1
+    assert catalog.job_versions(before) == {job["title"]: job_version(job) for job in jobs}
@@ -0,0 +1,52 @@
+import re
+
+from agents.job_index import JobIndex, normalize_skill, tokenize
+from agents.matcher_agent import MatcherAgent
+
+JOBS = [
+    {"title": "Web Developer", "description": "Build web applications.", "required_skills": ["JavaScript", "CSS"]},
+    {"title": "Data Scientist", "description": "Build machine learning models.",
+     "required_skills": ["Python", "Machine-Learning"]},
+    {"title": "Data Engineer", "description": "Maintain data pipelines.", "required_skills": ["Python", "SQL"]},
+    {"id": "ops-1", "title": "Site Reliability Engineer", "description": "Keep services running.",
+     "required_skills": ["Kubernetes"]},
+]
+
+PROFILE = {
+    "name": "Ada",
+    "skills": ["Python", "machine learning"],
+    "experience": ["Built machine learning models"],
+    "strengths": [],
+}
+
+
+def test_normalize_and_tokenize():
+    assert normalize_skill("  Machine-Learning ") == "machine learning"
+    assert normalize_skill("CI/CD") == "ci cd"
+    assert tokenize("Build the C++ and C# services.") == ["c++", "c#", "services"]
+
+
+def test_shortlist_ranks_skill_matches_first():
+    index = JobIndex(JOBS)
+    assert len(index) == 4
+    assert [job_id for job_id, _ in index.shortlist(PROFILE, top_k=2)] == [1, 2]
+    assert [job["title"] for job in index.shortlist_jobs(PROFILE, top_k=1)] == ["Data Scientist"]
+    assert index.shortlist({"skills": ["Kubernetes"]}) == [("ops-1", index.score({"skills": ["Kubernetes"]})["ops-1"])]
+    assert index.shortlist({"skills": ["Cobol"]}) == []
+
+
+def test_common_terms_are_dropped_on_large_catalogs():
+    jobs = [{"title": f"Engineer {i}", "description": "Python services.", "required_skills": []} for i in range(200)]
+    index = JobIndex(jobs)
+    assert "services" not in index.term_postings
+    assert len(index.skill_postings) == 0
+
+
+def test_matcher_sends_only_the_shortlist(fake_llm):
+    matcher = MatcherAgent(shortlist_size=2)
+    matches = matcher.process(PROFILE, None, job_list=JOBS)
+    assert {match["title"] for match in matches} == {"Data Scientist", "Data Engineer"}
+    # The shortlist keeps catalog order.
+    assert re.findall(r"^Title: (.+)$", fake_llm.prompts[0], re.M) == ["Data Scientist", "Data Engineer"]
+    assert MatcherAgent(shortlist_size=10).shortlist_jobs(PROFILE, JOBS) is JOBS
+    assert MatcherAgent(shortlist_size=2).shortlist_jobs({"skills": ["Cobol"]}, JOBS) == JOBS[:2]
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agents.job_vectors import JobVectorStore, catalog_fingerprint  # noqa: E402
+
+JOBS = [
+    {"id": "ds", "title": "Data Scientist", "description": "Build machine learning models in Python."},
+    {"id": "web", "title": "Web Developer", "description": "Build React web applications."},
+    {"id": "ops", "title": "DevOps Engineer", "description": "Run Kubernetes clusters and CI pipelines."},
+]
+
+PROFILE = {"skills": ["Python", "Machine Learning"], "experience": ["Trained models"], "strengths": []}
+
+
+def test_search_ranks_the_closest_job_first():
+    store = JobVectorStore.build(JOBS, dim=64)
+    ranked = store.search(PROFILE, top_k=2)
+    assert [job_id for job_id, _ in ranked][0] == "ds"
+    assert len(ranked) == 2
+    assert JobVectorStore.build([], dim=64).search(PROFILE) == []
+
+
+def test_saved_store_is_memory_mapped(tmp_path):
+    store = JobVectorStore.build(JOBS, dim=64)
+    store.save(str(tmp_path / "store"))
+    loaded = JobVectorStore.load(str(tmp_path / "store"))
+    assert isinstance(loaded.matrix, np.memmap)
+    assert loaded.search(PROFILE) == store.search(PROFILE)
+
+
+def test_for_catalog_replaces_older_versions_of_a_source(tmp_path):
+    cache_dir = str(tmp_path / "vectors")
+    source = str(tmp_path / "jobs.json")
+    JobVectorStore.for_catalog(JOBS, cache_dir=cache_dir, dim=64, source=source)
+    JobVectorStore.for_catalog(JOBS[1:], cache_dir=cache_dir, dim=64, source=str(tmp_path / "other.json"))
+    assert len(os.listdir(cache_dir)) == 2
+    reloaded = JobVectorStore.for_catalog(JOBS, cache_dir=cache_dir, dim=64, source=source)
+    assert isinstance(reloaded.matrix, np.memmap)
+    JobVectorStore.for_catalog(JOBS[:2], cache_dir=cache_dir, dim=64, source=source)
+    entries = sorted(os.listdir(cache_dir))
+    assert len(entries) == 2
+    assert any(entry.endswith(f"-{catalog_fingerprint(JOBS[:2])}-64") for entry in entries)
+    assert not any(entry.endswith(f"-{catalog_fingerprint(JOBS)}-64") for entry in entries)
+    # Stores without a source are kept under the catalog fingerprint.
+    JobVectorStore.for_catalog(JOBS, cache_dir=cache_dir, dim=64)
+    assert f"{catalog_fingerprint(JOBS)}-64" in os.listdir(cache_dir)
+
+
+def test_for_catalog_uses_a_known_catalog_version(tmp_path):
+    cache_dir = str(tmp_path / "vectors")
+    JobVectorStore.for_catalog(JOBS, cache_dir=cache_dir, dim=64, fingerprint="v1", source="jobs.json")
+    assert [entry.split("-", 1)[1] for entry in os.listdir(cache_dir)] == ["v1-64"]
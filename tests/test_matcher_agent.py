@@ -0,0 +1,161 @@
+import collections
+import re
+import threading
+
+import pytest
+
+from agents.matcher_agent import MatcherAgent
+from conftest import canned_response
+
+JOBS = [
+    {"title": f"Job {i}", "description": f"Role number {i}.", "required_skills": ["Python"]}
+    for i in range(1, 11)
+]
+
+PROFILE = {"name": "Ada", "skills": ["Python"], "education": [], "experience": [], "strengths": []}
+
+
+def recorded_requests(matcher):
+    """
+    Record the (system, prompt) pair of every request the matcher makes.
+    """
+    requests = []
+
+    def ollama_request(prompt, options=None, format=None, system=None):
+        requests.append((system, prompt))
+        return canned_response((system or "") + prompt)
+
+    matcher.ollama_request = ollama_request
+    return requests
+
+
+def test_catalog_first_layout_shares_the_system_prompt():
+    matcher = MatcherAgent(prompt_layout="catalog_first")
+    requests = recorded_requests(matcher)
+    first = matcher.request_matches(PROFILE, JOBS)
+    matcher.request_matches({**PROFILE, "name": "Grace"}, JOBS)
+    (system_a, prompt_a), (system_b, prompt_b) = requests
+    assert system_a == system_b == matcher.catalog_block(JOBS)
+    assert "Title: Job 10" in system_a and "Title:" not in prompt_a
+    assert prompt_a.startswith("Candidate Profile:\n- Name: Ada") and "Grace" in prompt_b
+    assert len(first) == len(JOBS)
+
+
+def test_candidate_first_layout_sends_one_prompt():
+    matcher = MatcherAgent(prompt_layout="candidate_first")
+    requests = recorded_requests(matcher)
+    matches = matcher.request_matches(PROFILE, JOBS)
+    system, prompt = requests[0]
+    assert system is None
+    assert prompt == matcher.candidate_block(PROFILE) + matcher.catalog_block(JOBS)
+    assert matches == MatcherAgent(prompt_layout="catalog_first").parse_llama_response(canned_response(prompt))
+
+
+def test_catalog_block_is_rendered_once_per_job_list():
+    matcher = MatcherAgent()
+    block = matcher.catalog_block(JOBS)
+    assert matcher.catalog_block(JOBS) is block
+    # Another matcher renders the same bytes, so the server can reuse the evaluated prefix.
+    assert MatcherAgent().catalog_block(list(JOBS)) == block
+    assert matcher.catalog_block(JOBS[:2]) != block
+    assert block.index("Job 1:\nTitle: Job 1\n") < block.index("Job 2:\nTitle: Job 2\n")
+
+
+def score(title):
+    return int(title.split()[-1]) / 100
+
+
+class FlakyClient:
+    """
+    Matching client that misbehaves on a job's first request: 'Job 3' gets a malformed
+    response for its whole batch, the last job of every other batch is left out, and every
+    response also scores a job that was not asked for and repeats its first match.
+    """
+    model = "flaky"
+
+    def __init__(self):
+        self.requests = []
+        self.scored = collections.Counter()
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, system=None, **kwargs):
+        titles = re.findall(r"^Title: (.+)$", (system or "") + prompt, re.M)
+        with self._lock:
+            self.requests.append(titles)
+            first = [title for title in titles if title not in self._seen]
+            self._seen.update(titles)
+        if "Job 3" in first:
+            return {"response": "Sorry, I cannot score these jobs.", "done": True}
+        answered = titles[:-1] if first and len(titles) > 1 else titles
+        lines = [f"Job Title: {title.upper()}\nMatch Score: {score(title)}\nReasoning: ok" for title in answered]
+        lines.append("Job Title: Job 99\nMatch Score: 0.99\nReasoning: not in this batch")
+        if answered:
+            lines.append(f"Job Title: {answered[0]}\nMatch Score: 0.01\nReasoning: duplicate")
+        with self._lock:
+            self.scored.update(answered)
+        return {"response": "\n".join(lines), "done": True}
+
+
+@pytest.fixture
+def matcher(fake_llm):
+    matcher = MatcherAgent(batch_size=3, max_in_flight=2, retries=1)
+    matcher.client = FlakyClient()
+    return matcher
+
+
+def test_assign_matches_names_and_deduplicates():
+    matcher = MatcherAgent()
+    batch = [{"title": "Data Scientist"}, {"title": "Web Developer"}, {"title": "ML Engineer"}]
+    matches = [
+        {"title": "data scientist", "confidence_score": 0.9},
+        {"title": "Senior Web Developer (remote)", "confidence_score": 0.7},
+        {"title": "Data Scientist", "confidence_score": 0.1},
+        {"title": "Astronaut", "confidence_score": 0.8},
+    ]
+    assigned, left_out = matcher.assign_matches(matches, batch)
+    assert assigned == [
+        {"title": "Data Scientist", "confidence_score": 0.9},
+        {"title": "Web Developer", "confidence_score": 0.7},
+    ]
+    assert left_out == [{"title": "ML Engineer"}]
+    assert matcher.assign_matches([], batch) == ([], batch)
+
+
+def test_assign_matches_needs_whole_words():
+    batch = [{"title": "Job 9"}, {"title": "Job 1"}]
+    assigned, left_out = MatcherAgent().assign_matches([{"title": "Job 99"}, {"title": "Job 10"}], batch)
+    assert assigned == [] and left_out == batch
+
+
+def test_match_batched_scores_every_job_exactly_once(matcher):
+    matches = matcher.match_batched(PROFILE, JOBS)
+    titles = [match["title"] for match in matches]
+    assert sorted(titles, key=score) == [job["title"] for job in JOBS]
+    assert [match["confidence_score"] for match in matches] == sorted((score(t) for t in titles), reverse=True)
+    # Four batches of at most three jobs, then one retry round for the jobs left out.
+    assert len(matcher.client.requests) > 4
+    assert all(len(batch) <= 3 for batch in matcher.client.requests)
+    assert "Job 99" not in titles
+
+
+def test_match_batched_keeps_top_k(matcher):
+    matches = matcher.match_batched(PROFILE, JOBS, top_k=2)
+    assert [match["title"] for match in matches] == ["Job 10", "Job 9"]
+
+
+def test_match_batched_reports_jobs_never_scored(fake_llm):
+    matcher = MatcherAgent(batch_size=3, max_in_flight=2, retries=0)
+    matcher.client = FlakyClient()
+    matches = matcher.match_batched(PROFILE, JOBS)
+    titles = [match["title"] for match in matches]
+    # Without retries the malformed batch and every dropped job stay unscored, but nothing is scored twice.
+    assert len(titles) == len(set(titles)) < len(JOBS)
+    assert not {"Job 1", "Job 2", "Job 3"} & set(titles)
+
+
+def test_score_jobs_batches_long_lists(matcher):
+    matcher.shortlist_size = 100
+    matches = matcher.score_jobs(PROFILE, JOBS)
+    assert sorted(match["title"] for match in matches) == sorted(job["title"] for job in JOBS)
+    assert all(len(batch) <= 3 for batch in matcher.client.requests)
@@ -0,0 +1,109 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from agents.metrics import (
+    SIZE_BUCKETS, Histogram, MetricsRegistry, get_metrics, record_llm_request, start_metrics_server, track_run,
+)
+from agents.orchestrator import Orchestrator
+from conftest import make_pdf
+
+JOBS = [{"title": "Data Scientist", "description": "Build models.", "required_skills": ["Python", "SQL"]}]
+
+
+@pytest.fixture
+def registry():
+    registry = get_metrics()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+@pytest.fixture
+def paths(tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(make_pdf([["Ada", "Skills: Python"]]))
+    job_list = tmp_path / "jobs.json"
+    job_list.write_text(json.dumps(JOBS), encoding="utf-8")
+    return str(resume), str(job_list)
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    assert histogram.quantile(0.5) == 0.0
+    for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == pytest.approx(1.75)
+    # Values above the last bound are reported at that bound.
+    assert histogram.quantile(0.99) == 4.0
+
+
+def test_prometheus_text_and_snapshot():
+    registry = MetricsRegistry()
+    registry.inc("llm_requests_total", agent="Matcher")
+    registry.inc("llm_requests_total", 2, agent="Matcher")
+    registry.set_gauge("llm_in_flight", 1)
+    registry.observe("llm_prompt_chars", 300, SIZE_BUCKETS, agent='say "hi"')
+    text = registry.render_prometheus()
+    assert "# TYPE llm_requests_total counter" in text
+    assert 'llm_requests_total{agent="Matcher"} 3' in text
+    assert "llm_in_flight 1" in text
+    assert 'llm_prompt_chars_bucket{agent="say \\"hi\\"",le="256"} 0' in text
+    assert 'llm_prompt_chars_bucket{agent="say \\"hi\\"",le="1024"} 1' in text
+    assert 'llm_prompt_chars_count{agent="say \\"hi\\""} 1' in text
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"]["llm_requests_total"] == [{"labels": {"agent": "Matcher"}, "value": 3}]
+    assert snapshot["histograms"]["llm_prompt_chars"][0]["count"] == 1
+    json.dumps(snapshot)
+
+
+def test_llm_requests_are_added_to_the_current_run(registry):
+    stats = {"prompt_eval_count": 120, "prompt_eval_duration": 2e8, "eval_duration": 5e8}
+    with track_run() as run:
+        record_llm_request("MatcherAgent", 0.8, 500, 40, stats)
+        record_llm_request("MatcherAgent", 0.01, 500, 40, cache_hit=True)
+    record_llm_request("MatcherAgent", 0.5, 10)
+    totals = run.summary()["llm"]["MatcherAgent"]
+    assert (totals["requests"], totals["cache_hits"], totals["prompt_tokens"]) == (2, 1, 120)
+    assert totals["prefill_s"] == pytest.approx(0.2)
+    counters = registry.snapshot()["counters"]
+    assert counters["llm_requests_total"][0]["value"] == 3
+    assert counters["pipeline_runs_total"] == [{"labels": {"status": "ok"}, "value": 1}]
+
+
+def test_pipeline_result_carries_its_metrics(fake_llm, registry, paths):
+    result = Orchestrator().process_resume(*paths)
+    metrics = result["metrics"]
+    assert set(metrics["stages"]) >= {
+        "extracted_data", "analysis_results", "matched_jobs", "screening_results", "recommendations", "pdf_parse",
+    }
+    assert metrics["llm"]["ExtractorAgent"]["requests"] == 1
+    assert "failed_stage" not in metrics
+    assert registry.snapshot()["histograms"]["pipeline_stage_seconds"]
+
+
+def test_failed_stage_is_reported(fake_llm, registry, paths, monkeypatch):
+    respond = fake_llm.respond
+    monkeypatch.setattr(
+        fake_llm, "respond", lambda prompt: "" if "with the following jobs" in prompt else respond(prompt)
+    )
+    result = Orchestrator().process_resume(*paths)
+    assert result["error"] == "Failed to match jobs"
+    assert result["metrics"]["failed_stage"] == "matched_jobs"
+    assert registry.snapshot()["counters"]["pipeline_runs_total"] == [{"labels": {"status": "error"}, "value": 1}]
+
+
+def test_metrics_server(registry):
+    registry.inc("llm_requests_total", agent="AnalyzerAgent")
+    server = start_metrics_server(port=0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    with urllib.request.urlopen(f"{base}/metrics") as response:
+        assert 'llm_requests_total{agent="AnalyzerAgent"} 1' in response.read().decode("utf-8")
+    with urllib.request.urlopen(f"{base}/metrics.json") as response:
+        assert json.load(response)["counters"]["llm_requests_total"][0]["value"] == 1
+    with pytest.raises(urllib.error.HTTPError):
+        urllib.request.urlopen(f"{base}/other")
@@ -0,0 +1,154 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agents.ollama_client import OllamaClient, OllamaError
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal /api/generate: echoes the prompt, streams it word by word as chunked NDJSON,
+    and fails for the prompts 'fail' (HTTP 500) and 'stream-error' (error chunk).
+    """
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        prompt = payload["prompt"]
+        if prompt == "fail":
+            body = b'{"error": "model not found"}'
+            self.send_response(500)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif payload.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunks = [{"response": word + " ", "done": False} for word in prompt.split()]
+            if prompt == "stream-error":
+                chunks.append({"error": "out of memory"})
+            chunks.append({"response": "", "done": True, "eval_count": len(chunks)})
+            for chunk in chunks:
+                line = json.dumps(chunk).encode("utf-8") + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            body = json.dumps({"response": f"echo: {prompt}", "done": True, "eval_count": 2}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        self.wfile.flush()
+        # Drop the keep-alive socket without telling the client, like a server idle timeout.
+        if self.server.drop_connections:
+            self.close_connection = True
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.connections = 0
+    httpd.payloads = []
+    httpd.drop_connections = False
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server):
+    client = OllamaClient(host=f"http://127.0.0.1:{server.server_address[1]}", model="stub", keep_alive="5m")
+    yield client
+    client.close()
+
+
+def test_generate(client, server):
+    result = client.generate("hello", options={"temperature": 0}, system="Be brief.")
+    assert result["response"] == "echo: hello"
+    payload = server.payloads[0]
+    assert payload["model"] == "stub"
+    assert payload["stream"] is False
+    assert payload["keep_alive"] == "5m"
+    assert payload["options"] == {"temperature": 0}
+    assert payload["system"] == "Be brief."
+
+
+def test_generate_reuses_connection(client, server):
+    for i in range(5):
+        assert client.generate(f"prompt {i}")["response"] == f"echo: prompt {i}"
+    assert server.connections == 1
+
+
+def test_generate_stream(client):
+    chunks = list(client.generate_stream("one two three"))
+    assert "".join(chunk["response"] for chunk in chunks) == "one two three "
+    assert chunks[-1]["done"] is True
+    assert not any(chunk["done"] for chunk in chunks[:-1])
+
+
+def test_finished_stream_releases_connection(client, server):
+    list(client.generate_stream("one two"))
+    list(client.generate_stream("three four"))
+    assert client.generate("after")["response"] == "echo: after"
+    assert server.connections == 1
+
+
+def test_abandoned_stream_closes_connection(client, server):
+    stream = client.generate_stream("one two three")
+    assert next(stream)["response"] == "one "
+    stream.close()
+    # The half-read socket is not returned to the pool; the next request opens a new one.
+    assert client.generate("after")["response"] == "echo: after"
+    assert server.connections == 2
+
+
+def test_stale_socket_is_retried(client, server):
+    server.drop_connections = True
+    assert client.generate("first")["response"] == "echo: first"
+    assert client.generate("second")["response"] == "echo: second"
+    assert server.connections == 2
+
+
+def test_http_error_raises(client):
+    with pytest.raises(OllamaError, match="HTTP 500"):
+        client.generate("fail")
+    # The failed request does not leave the client unusable.
+    assert client.generate("ok")["response"] == "echo: ok"
+
+
+def test_stream_error_chunk_raises(client):
+    with pytest.raises(OllamaError, match="out of memory"):
+        list(client.generate_stream("stream-error"))
+
+
+def test_unreachable_server_raises():
+    client = OllamaClient(host="http://127.0.0.1:1", connect_timeout=1)
+    with pytest.raises(OllamaError, match="Cannot reach Ollama"):
+        client.generate("hello")
+
+
+def test_latency_stats(client):
+    client.generate("hello")
+    list(client.generate_stream("one two"))
+    stats = client.latency_stats()
+    assert stats["warm"]["count"] == 2
+    assert stats["cold"]["count"] == 0
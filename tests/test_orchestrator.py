@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from agents.orchestrator import Orchestrator
+from agents.profile_store import set_profile_store
+from conftest import make_pdf
+
+JOBS = [
+    {"title": "Data Scientist", "description": "Build models.", "required_skills": ["Python", "SQL"]},
+    {"title": "Web Developer", "description": "Build web apps.", "required_skills": ["JavaScript"]},
+]
+
+RESULT = {
+    "extracted_data": {"name": "Ada", "skills": ["Python"], "education": [], "experience": []},
+    "analysis_results": {"strengths": ["Python"], "weaknesses": [], "confidence_score": 0.8},
+    "matched_jobs": [{"title": "Data Scientist", "confidence_score": 0.9}],
+    "screening_results": {"skills_match_score": 0.5},
+    "recommendations": {"top_matched_job": "Data Scientist"},
+}
+
+
+def write_jobs(path, jobs, mtime):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(jobs, f)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def resumes(tmp_path):
+    paths = []
+    for name in ("Ada", "Grace", "Alan"):
+        path = tmp_path / f"{name}.pdf"
+        path.write_bytes(make_pdf([[name, "Skills: Python, SQL"]]))
+        paths.append(str(path))
+    return paths
+
+
+def without_metrics(result):
+    return {key: value for key, value in result.items() if key != "metrics"}
+
+
+def test_async_pipeline_matches_the_sync_pipeline(fake_llm, tmp_path, resumes):
+    job_list_path = str(tmp_path / "jobs.json")
+    write_jobs(job_list_path, JOBS, 1_000_000)
+    orchestrator = Orchestrator()
+    expected = orchestrator.process_resume(resumes[0], job_list_path)
+    assert "error" not in expected
+    result = asyncio.run(orchestrator.process_resume_async(resumes[0], job_list_path))
+    assert without_metrics(result) == without_metrics(expected)
+
+
+def test_async_batch_keeps_input_order_and_isolates_failures(fake_llm, tmp_path, resumes):
+    job_list_path = str(tmp_path / "jobs.json")
+    write_jobs(job_list_path, JOBS, 1_000_000)
+    orchestrator = Orchestrator()
+    process = orchestrator.extractor_agent.process
+    # The second resume cannot be extracted.
+    orchestrator.extractor_agent.process = lambda path: {} if path == resumes[1] else process(path)
+    results = asyncio.run(orchestrator.process_resumes_async(resumes, job_list_path, max_concurrency=2))
+    assert [result.get("error") for result in results] == [None, "Failed to extract data from resume", None]
+    assert [result["extracted_data"] for result in results[::2]] == [process(path) for path in resumes[::2]]
+
+
+def test_async_pipeline_reports_the_failed_stage(fake_llm, tmp_path, resumes, monkeypatch):
+    job_list_path = str(tmp_path / "jobs.json")
+    write_jobs(job_list_path, JOBS, 1_000_000)
+    respond = fake_llm.respond
+    monkeypatch.setattr(
+        fake_llm, "respond", lambda prompt: "" if "with the following jobs" in prompt else respond(prompt)
+    )
+    result = asyncio.run(Orchestrator().process_resume_async(resumes[0], job_list_path))
+    assert result["error"] == "Failed to match jobs"
+
+
+class ColdClient:
+    """
+    Client whose model is only loaded once preload() was called.
+    """
+    model = "cold"
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.loaded = set()
+
+    def preload(self, model=None):
+        if self.fail:
+            raise ConnectionError("server unreachable")
+        self.loaded.add(model)
+        return {"model": model, "done": True, "load_duration": 1_500_000_000}
+
+    def is_loaded(self, model=None):
+        if self.fail:
+            raise ConnectionError("server unreachable")
+        return model in self.loaded
+
+
+def use_client(orchestrator, client):
+    for agent in orchestrator.agents():
+        agent.client = client
+
+
+def test_warm_up_loads_every_model_once(fake_llm):
+    orchestrator = Orchestrator()
+    client = ColdClient()
+    use_client(orchestrator, client)
+    assert orchestrator.warmup_status == "disabled"
+    assert orchestrator.readiness()["ready"] is False
+
+    assert orchestrator.warm_up() is True
+    assert client.loaded == {"cold"}
+    report = orchestrator.readiness()
+    assert report["ready"] is True
+    assert report["models"] == {"cold": True}
+    assert report["warmup"] == "done"
+    assert report["warmup_load_s"] == {"cold": 1.5}
+
+
+def test_warm_up_in_the_background(fake_llm, monkeypatch):
+    monkeypatch.setenv("OLLAMA_WARMUP", "1")
+    orchestrator = Orchestrator()
+    orchestrator._warmup_thread.join(5)
+    assert orchestrator.warmup_status == "done"
+    assert orchestrator.readiness()["ready"] is True
+    assert Orchestrator(warmup=False).warmup_status == "disabled"
+
+
+def test_unreachable_server_is_not_ready(fake_llm):
+    orchestrator = Orchestrator()
+    use_client(orchestrator, ColdClient(fail=True))
+    assert orchestrator.warm_up() is False
+    assert orchestrator.warmup_status == "failed"
+    report = orchestrator.readiness()
+    assert report["ready"] is False
+    assert "server unreachable" in report["error"]
+
+
+def test_stored_result_is_reused_only_while_current(tmp_path, profile_store):
+    job_list_path = str(tmp_path / "jobs.json")
+    write_jobs(job_list_path, JOBS, 1_000_000)
+    orchestrator = Orchestrator()
+    assert orchestrator.stored_result("abc", job_list_path) is None
+
+    orchestrator.save_profile("abc", RESULT, job_list_path)
+    assert orchestrator.stored_result("abc", job_list_path) == RESULT
+
+    # A newer extractor invalidates the stored extraction.
+    orchestrator.extractor_agent._version = "another-extractor"
+    assert orchestrator.stored_result("abc", job_list_path) is None
+    orchestrator = Orchestrator()
+
+    # So does a new version of the job list.
+    write_jobs(job_list_path, JOBS[:1], 2_000_000)
+    assert orchestrator.stored_result("abc", job_list_path) is None
+
+
+def test_stored_result_without_a_store(tmp_path, profile_store, monkeypatch):
+    job_list_path = str(tmp_path / "jobs.json")
+    write_jobs(job_list_path, JOBS, 1_000_000)
+    orchestrator = Orchestrator()
+    orchestrator.save_profile("abc", RESULT, job_list_path)
+    monkeypatch.setenv("PROFILE_STORE_PATH", "")
+    set_profile_store(None)
+    assert orchestrator.stored_result("abc", job_list_path) is None
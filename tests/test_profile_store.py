@@ -0,0 +1,133 @@
+import sqlite3
+
+import pytest
+
+from agents.profile_store import ProfileStore, get_profile_store, set_profile_store
+
+
+def result(name, skills, top_job, skills_match, red_flags=0.1):
+    return {
+        "extracted_data": {"name": name, "skills": skills, "education": [], "experience": []},
+        "analysis_results": {"strengths": [], "confidence_score": 0.8},
+        "matched_jobs": [{"title": top_job, "confidence_score": 0.9}],
+        "screening_results": {
+            "qualification_alignment_score": 0.7,
+            "experience_relevance_score": 0.6,
+            "skills_match_score": skills_match,
+            "potential_red_flags_score": red_flags,
+        },
+        "recommendations": {"top_matched_job": top_job},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProfileStore(str(tmp_path / "store" / "profiles.sqlite3"))
+    store.save("h1", result("Ada", ["Python", "SQL", "Machine Learning"], "Data Scientist", 0.9))
+    store.save("h2", result("Bob", ["python", "Docker"], "DevOps Engineer", 0.5, red_flags=0.6))
+    store.save("h3", result("Cy", ["SQL", "Excel"], "Data Analyst", 0.7))
+    return store
+
+
+def test_save_and_get(store):
+    assert len(store) == 3
+    assert store.get("h1")["extracted_data"]["name"] == "Ada"
+    assert store.get("missing") is None
+
+
+def test_save_replaces_result_and_skills(store):
+    store.save("h1", result("Ada", ["Rust"], "Systems Engineer", 0.4))
+    assert len(store) == 3
+    assert store.get("h1")["matched_jobs"][0]["title"] == "Systems Engineer"
+    assert [row["resume_hash"] for row in store.query(skills=["Rust"])] == ["h1"]
+    assert "h1" not in [row["resume_hash"] for row in store.query(skills=["SQL"])]
+
+
+def test_delete(store):
+    store.delete("h2")
+    assert store.get("h2") is None
+    assert store.query(skills=["Docker"]) == []
+    assert len(store) == 2
+
+
+def test_query_by_skills_requires_all(store):
+    assert [row["resume_hash"] for row in store.query(skills=["PYTHON"])] == ["h1", "h2"]
+    assert [row["resume_hash"] for row in store.query(skills=["Python", "SQL"])] == ["h1"]
+    assert store.query(skills=["Python", "Excel"]) == []
+
+
+def test_query_by_job_and_scores(store):
+    assert [row["resume_hash"] for row in store.query(top_matched_job="data scientist")] == ["h1"]
+    rows = store.query(min_scores={"skills_match_score": 0.6}, max_scores={"potential_red_flags_score": 0.5})
+    assert [row["resume_hash"] for row in rows] == ["h1", "h3"]
+    assert rows[0]["name"] == "Ada"
+    assert "result" not in rows[0]
+
+
+def test_query_limit_and_results(store):
+    rows = store.query(limit=1, include_results=True)
+    assert len(rows) == 1
+    assert rows[0]["resume_hash"] == "h1"
+    assert rows[0]["result"]["extracted_data"]["name"] == "Ada"
+
+
+def test_iter_profiles_in_batches(store):
+    store.save("h4", result("Di", ["Go"], "Backend Engineer", 0.3), deps={"catalog_version": "v1"})
+    profiles = list(store.iter_profiles(batch_size=2))
+    assert [resume_hash for resume_hash, _, _ in profiles] == ["h1", "h2", "h3", "h4"]
+    assert profiles[0][2] == {}
+    assert profiles[3][2] == {"catalog_version": "v1"}
+    assert [resume_hash for resume_hash, _ in store.iter_results()] == ["h1", "h2", "h3", "h4"]
+
+
+def test_catalog_snapshots(store):
+    assert store.get_catalog_snapshot("v1") is None
+    store.save_catalog_snapshot("v1", {"Data Scientist": "a1"})
+    store.save_catalog_snapshot("v1", {"Data Scientist": "changed"})
+    assert store.get_catalog_snapshot("v1") == {"Data Scientist": "a1"}
+
+
+def test_version_changes_on_save_and_delete(store):
+    version = store.version()
+    assert store.version() == version
+    store.delete("h3")
+    after_delete = store.version()
+    assert after_delete != version
+    store.save("h5", result("Ed", ["Java"], "Backend Engineer", 0.5))
+    assert store.version() != after_delete
+
+
+@pytest.mark.skipif(sqlite3.sqlite_version_info < (3, 35), reason="DROP COLUMN needs SQLite 3.35")
+def test_stores_without_deps_column_are_migrated(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    store = ProfileStore(path)
+    store.save("h1", result("Ada", ["Python"], "Data Scientist", 0.9))
+    store._conn.close()
+    conn = sqlite3.connect(path)
+    conn.execute("ALTER TABLE candidates DROP COLUMN deps")
+    conn.commit()
+    conn.close()
+
+    reopened = ProfileStore(path)
+    assert reopened.get("h1")["extracted_data"]["name"] == "Ada"
+    reopened.save("h1", result("Ada", ["Python"], "Data Scientist", 0.9), deps={"extractor": "v2"})
+    assert list(reopened.iter_profiles())[0][2] == {"extractor": "v2"}
+
+
+def test_process_wide_store_from_environment(tmp_path, monkeypatch):
+    previous = set_profile_store(None)
+    try:
+        monkeypatch.setenv("PROFILE_STORE_PATH", "")
+        assert get_profile_store() is None
+        # A disabled store is remembered until it is reset.
+        monkeypatch.setenv("PROFILE_STORE_PATH", str(tmp_path / "profiles.sqlite3"))
+        assert get_profile_store() is None
+        set_profile_store(None)
+        store = get_profile_store()
+        assert store.path == str(tmp_path / "profiles.sqlite3")
+        assert get_profile_store() is store
+        replacement = ProfileStore(str(tmp_path / "other.sqlite3"))
+        assert set_profile_store(replacement) is store
+        assert get_profile_store() is replacement
+    finally:
+        set_profile_store(previous)
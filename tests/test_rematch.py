@@ -0,0 +1,157 @@
+import json
+import os
+
+import pytest
+
+from agents.job_catalog import get_job_catalog
+from agents.orchestrator import Orchestrator
+from conftest import match_score
+
+JOBS = [
+    {"title": "Data Scientist", "description": "Build models.", "required_skills": ["Python", "Statistics"]},
+    {"title": "Data Analyst", "description": "Report on data.", "required_skills": ["SQL", "Excel"]},
+    {"title": "ML Engineer", "description": "Ship models.", "required_skills": ["Python", "Docker"]},
+    {"title": "Web Developer", "description": "Build web apps.", "required_skills": ["JavaScript"]},
+]
+
+# Stored scores are above anything the fake client returns (at most 0.95), so re-scored
+# jobs only enter the top matches when a stored top job goes away.
+RESULT = {
+    "extracted_data": {"name": "Ada", "skills": ["Python", "SQL"], "education": ["BSc"], "experience": ["Analyst"]},
+    "analysis_results": {"strengths": ["Python"], "weaknesses": [], "suggestions": [], "confidence_score": 0.8},
+    "matched_jobs": [
+        {"title": "Data Scientist", "confidence_score": 0.99, "reasoning": "stored"},
+        {"title": "Data Analyst", "confidence_score": 0.98, "reasoning": "stored"},
+        {"title": "ML Engineer", "confidence_score": 0.97, "reasoning": "stored"},
+        {"title": "Web Developer", "confidence_score": 0.1, "reasoning": "stored"},
+    ],
+    "screening_results": {"skills_match_score": 0.5},
+    "recommendations": {"top_matched_job": "Data Scientist"},
+}
+
+
+def write_jobs(path, jobs, mtime):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(jobs, f)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def prompts(fake_llm, monkeypatch):
+    """
+    Every prompt (system prompt included) sent to the fake client.
+    """
+    monkeypatch.delenv("SCREENER_MODE", raising=False)
+    monkeypatch.delenv("PIPELINE_MODE", raising=False)
+    return fake_llm.prompts
+
+
+@pytest.fixture
+def job_list_path(tmp_path):
+    path = str(tmp_path / "jobs.json")
+    write_jobs(path, JOBS, 1_000_000)
+    return path
+
+
+@pytest.fixture
+def orchestrator(job_list_path, profile_store, prompts):
+    orchestrator = Orchestrator()
+    orchestrator.save_profile("ada", RESULT, job_list_path)
+    return orchestrator
+
+
+def matching_prompts(prompts):
+    return [prompt for prompt in prompts if "with the following jobs" in prompt]
+
+
+def test_catalog_diff(orchestrator, job_list_path):
+    old_version = get_job_catalog(job_list_path).version
+    edited = [JOBS[0], dict(JOBS[1], description="Report on data and dashboards."), JOBS[2],
+              {"title": "Data Engineer", "description": "Build pipelines.", "required_skills": ["Spark"]}]
+    write_jobs(job_list_path, edited, 2_000_000)
+    catalog = get_job_catalog(job_list_path)
+
+    changed, stale = orchestrator.catalog_diff(old_version, catalog)
+    assert [job["title"] for job in changed] == ["Data Analyst", "Data Engineer"]
+    # The removed job's old matches are stale too, although there is nothing to re-score.
+    assert stale == {"data analyst", "data engineer", "web developer"}
+
+    for unknown in ("no-such-version", None):
+        changed, stale = orchestrator.catalog_diff(unknown, catalog)
+        assert changed == catalog.jobs and changed is not catalog.jobs
+        assert stale is None
+
+
+def test_unchanged_catalog_makes_no_llm_calls(orchestrator, job_list_path, prompts):
+    stats = orchestrator.rematch_catalog(job_list_path)
+    assert stats["candidates"] == 1 and stats["unchanged"] == 1
+    assert stats["pairs_scored"] == 0
+    assert prompts == []
+
+
+def test_edited_job_is_rescored_without_rescreening(orchestrator, job_list_path, profile_store, prompts):
+    write_jobs(job_list_path, JOBS[:3] + [dict(JOBS[3], description="Build React apps.")], 2_000_000)
+    stats = orchestrator.rematch_catalog(job_list_path)
+    assert (stats["rescored"], stats["rescreened"], stats["failed"], stats["pairs_scored"]) == (1, 0, 0, 1)
+
+    # Only the edited job was sent to the model, and screening was not repeated.
+    assert len(prompts) == 1
+    assert "Title: Web Developer" in prompts[0] and "Title: Data Scientist" not in prompts[0]
+    result = profile_store.get("ada")
+    assert [match["title"] for match in result["matched_jobs"]] == [
+        "Data Scientist", "Data Analyst", "ML Engineer", "Web Developer",
+    ]
+    assert result["matched_jobs"][3]["confidence_score"] == match_score("Web Developer")
+    assert result["screening_results"] == RESULT["screening_results"]
+
+    # The result is now recorded against the new catalog version.
+    prompts.clear()
+    assert orchestrator.rematch_catalog(job_list_path)["unchanged"] == 1
+    assert prompts == []
+
+
+def test_added_job_is_scored_alone(orchestrator, job_list_path, profile_store, prompts):
+    added = {"title": "Data Engineer", "description": "Build pipelines.", "required_skills": ["Spark"]}
+    write_jobs(job_list_path, JOBS + [added], 2_000_000)
+    stats = orchestrator.rematch_catalog(job_list_path)
+    assert (stats["rescored"], stats["pairs_scored"]) == (1, 1)
+    assert len(matching_prompts(prompts)) == len(prompts) == 1
+    titles = [match["title"] for match in profile_store.get("ada")["matched_jobs"]]
+    assert titles[:3] == ["Data Scientist", "Data Analyst", "ML Engineer"]
+    assert set(titles) == {job["title"] for job in JOBS} | {"Data Engineer"}
+
+
+def test_removed_top_job_triggers_rescreening(orchestrator, job_list_path, profile_store, prompts):
+    write_jobs(job_list_path, JOBS[1:], 2_000_000)
+    stats = orchestrator.rematch_catalog(job_list_path)
+    assert (stats["rescored"], stats["rescreened"], stats["pairs_scored"]) == (0, 1, 0)
+
+    # Nothing needed re-scoring, but screening and recommendation follow the new top matches.
+    assert matching_prompts(prompts) == []
+    assert len(prompts) == 2
+    result = profile_store.get("ada")
+    assert [match["title"] for match in result["matched_jobs"]] == ["Data Analyst", "ML Engineer", "Web Developer"]
+    assert result["screening_results"] != RESULT["screening_results"]
+    assert result["recommendations"]["top_matched_job"] == "Data Analyst"
+
+
+def test_unknown_catalog_version_matches_every_job(orchestrator, job_list_path, profile_store, prompts):
+    profile_store.save("ada", RESULT, {"extraction": orchestrator.extractor_agent.version,
+                                       "matching": {"catalog": "forgotten"}})
+    stats = orchestrator.rematch_catalog(job_list_path)
+    assert (stats["rescreened"], stats["pairs_scored"]) == (1, len(JOBS))
+    assert len(matching_prompts(prompts)) == 1
+    result = profile_store.get("ada")
+    # Every stored match was replaced by a fresh score.
+    assert {match["reasoning"] for match in result["matched_jobs"]} != {"stored"}
+    assert [match["title"] for match in result["matched_jobs"]] == sorted(
+        (job["title"] for job in JOBS), key=match_score, reverse=True
+    )
+
+
+def test_failed_rescoring_keeps_the_stored_result(orchestrator, job_list_path, profile_store, fake_llm, monkeypatch):
+    monkeypatch.setattr(fake_llm, "generate", lambda prompt, **kwargs: {"response": "", "done": True})
+    write_jobs(job_list_path, JOBS[:3] + [dict(JOBS[3], description="Build React apps.")], 2_000_000)
+    stats = orchestrator.rematch_catalog(job_list_path)
+    assert stats["failed"] == 1
+    assert profile_store.get("ada") == RESULT
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from agents.scheduler import LLMScheduler, _priority, _session, llm_priority
+
+
+def wait_queued(scheduler, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while sum(scheduler.queued().values()) < count:
+        if time.monotonic() > deadline:
+            raise AssertionError(f"expected {count} queued requests, have {scheduler.queued()}")
+        time.sleep(0.001)
+
+
+def run_queued(scheduler, requests):
+    """
+    Hold the only slot, queue (name, priority, session) requests one by one, then release
+    the slot and return the order in which the queued requests were served.
+    """
+    order = []
+
+    def request(name, priority, session):
+        with llm_priority(priority, session=session):
+            with scheduler.slot():
+                order.append(name)
+
+    threads = []
+    with scheduler.slot():
+        for count, (name, priority, session) in enumerate(requests, start=1):
+            thread = threading.Thread(target=request, args=(name, priority, session))
+            thread.start()
+            threads.append(thread)
+            wait_queued(scheduler, count)
+    for thread in threads:
+        thread.join(timeout=5)
+    return order
+
+
+def test_limits_requests_in_flight():
+    scheduler = LLMScheduler(max_in_flight=2)
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def request():
+        with scheduler.slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert peak[0] == 2
+    assert scheduler.in_flight == 0
+    assert scheduler.queued() == {"interactive": 0, "batch": 0, "background": 0}
+
+
+def test_unlimited_never_waits():
+    scheduler = LLMScheduler(max_in_flight=0)
+    with scheduler.slot() as first, scheduler.slot() as second:
+        assert first == second == 0.0
+    assert scheduler.in_flight == 0
+
+
+def test_higher_priority_is_served_first():
+    order = run_queued(LLMScheduler(max_in_flight=1), [
+        ("background", "background", None),
+        ("batch", "batch", None),
+        ("interactive", "interactive", None),
+    ])
+    assert order == ["interactive", "batch", "background"]
+
+
+def test_sessions_take_turns_within_a_priority():
+    order = run_queued(LLMScheduler(max_in_flight=1), [
+        ("a1", "batch", "a"),
+        ("a2", "batch", "a"),
+        ("a3", "batch", "a"),
+        ("b1", "batch", "b"),
+        ("c1", "batch", "c"),
+    ])
+    assert order == ["a1", "b1", "c1", "a2", "a3"]
+
+
+def test_slot_reports_wait_time():
+    scheduler = LLMScheduler(max_in_flight=1)
+    waits = []
+
+    def request():
+        with scheduler.slot() as wait:
+            waits.append(wait)
+
+    with scheduler.slot():
+        thread = threading.Thread(target=request)
+        thread.start()
+        wait_queued(scheduler, 1)
+        time.sleep(0.05)
+    thread.join(timeout=5)
+    assert waits[0] >= 0.05
+
+
+def test_default_priority_from_environment(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_IN_FLIGHT", "3")
+    monkeypatch.setenv("LLM_DEFAULT_PRIORITY", "batch")
+    scheduler = LLMScheduler()
+    assert scheduler.max_in_flight == 3
+    assert scheduler.default_priority == "batch"
+    monkeypatch.setenv("LLM_DEFAULT_PRIORITY", "urgent")
+    with pytest.raises(ValueError):
+        LLMScheduler()
+
+
+def test_llm_priority_is_scoped():
+    with llm_priority("batch", session="job-1"):
+        assert (_priority.get(), _session.get()) == ("batch", "job-1")
+        with llm_priority("interactive"):
+            # The session is inherited when none is given.
+            assert (_priority.get(), _session.get()) == ("interactive", "job-1")
+        assert _priority.get() == "batch"
+    assert (_priority.get(), _session.get()) == (None, None)
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
@@ -0,0 +1,153 @@
+import pytest
+
+from agents.scoring import (
+    DEFAULT_WEIGHTS, ScoringEngine, degree_level, skill_overlap, term_relevance, years_of_experience,
+)
+from agents.screener_agent import ScreenerAgent
+
+JOBS = [
+    {"title": "Data Scientist", "description": "Build machine learning models with Python.",
+     "required_skills": ["Python", "Machine Learning", "SQL", "Statistics"]},
+    {"title": "Web Developer", "description": "Build web applications.",
+     "required_skills": ["JavaScript", "React", "CSS"]},
+]
+
+CANDIDATE = {
+    "name": "Ada",
+    "skills": ["Python 3", "Machine Learning", "SQL", "Docker"],
+    "education": ["MSc Statistics from State University"],
+    "experience": ["Data Scientist building machine learning models, 2019 - 2023"],
+}
+
+ANALYSIS = {"strengths": ["modelling"], "weaknesses": ["cloud"], "confidence_score": 0.8}
+
+MATCHES = [{"title": "Data Scientist", "confidence_score": 0.9}]
+
+
+def test_skill_overlap_gives_partial_credit():
+    # 'python 3' only partially covers 'python': 2 exact + 0.5 partial of 4 required skills.
+    assert skill_overlap(CANDIDATE["skills"], JOBS[0]["required_skills"]) == pytest.approx(2.5 / 4)
+    assert skill_overlap(["Go"], JOBS[0]["required_skills"]) == 0.0
+    assert skill_overlap(["Go"], []) == 0.0
+
+
+def test_degree_level_and_years():
+    assert degree_level(["PhD in Physics", "BSc Maths"]) == 1.0
+    assert degree_level(["Self taught"]) == 0.0
+    assert years_of_experience(["Analyst, 2015 - 2018", "Engineer for 2 years", "Intern, 6 months"]) == 5.5
+    assert years_of_experience(["Lead, 2020 - present"], current_year=2024) == 4
+
+
+def test_term_relevance():
+    assert term_relevance(CANDIDATE["experience"], JOBS[0]) > term_relevance(CANDIDATE["experience"], JOBS[1])
+    assert term_relevance([], JOBS[0]) == 0.0
+
+
+def test_score_is_deterministic_and_bounded():
+    engine = ScoringEngine()
+    scores = engine.score(CANDIDATE, ANALYSIS, MATCHES, JOBS)
+    assert scores == engine.score(CANDIDATE, ANALYSIS, MATCHES, JOBS)
+    assert set(scores) == {
+        "qualification_alignment_score", "experience_relevance_score",
+        "skills_match_score", "potential_red_flags_score",
+    }
+    assert all(0.0 <= value <= 1.0 for value in scores.values())
+    assert scores["skills_match_score"] == 0.625
+
+
+def test_weaker_profile_scores_lower():
+    engine = ScoringEngine()
+    strong = engine.score(CANDIDATE, ANALYSIS, MATCHES, JOBS)
+    weak = engine.score({"name": None, "skills": ["Excel"], "education": [], "experience": []},
+                        {"weaknesses": ["a", "b", "c", "d"], "confidence_score": 0.1}, MATCHES, JOBS)
+    assert weak["skills_match_score"] < strong["skills_match_score"]
+    assert weak["qualification_alignment_score"] < strong["qualification_alignment_score"]
+    assert weak["potential_red_flags_score"] > strong["potential_red_flags_score"]
+
+
+def test_red_flag_weights_are_configurable():
+    profile = {"name": "Ada", "skills": ["Python"], "education": ["BSc"], "experience": ["Analyst"]}
+    analysis = {"weaknesses": ["a", "b"], "confidence_score": 1.0}
+    default = ScoringEngine().score(profile, analysis, MATCHES, JOBS)["potential_red_flags_score"]
+    # One of four sections is missing (too few skills) and two of four weaknesses are recorded.
+    assert default == pytest.approx(0.6 * 1 / 4 + 0.2 * 2 / 4)
+    relaxed = ScoringEngine({"min_skills": 1, "weakness_cap": 2, "red_flag_weaknesses": 0.5})
+    assert relaxed.score(profile, analysis, MATCHES, JOBS)["potential_red_flags_score"] == 0.5
+    assert set(DEFAULT_WEIGHTS) >= {"red_flag_missing", "red_flag_weaknesses", "red_flag_confidence",
+                                    "weakness_cap", "min_skills"}
+
+
+def test_resolve_jobs_by_exact_and_partial_title():
+    engine = ScoringEngine()
+    resolved = engine.resolve_jobs([
+        {"title": "data scientist", "confidence_score": 0.9},
+        {"job_title": "Senior Web Developer", "confidence_score": 0.4},
+        {"title": "Astronaut", "confidence_score": 0.3},
+    ], JOBS)
+    assert [(job["title"], confidence) for job, confidence in resolved] == [
+        ("Data Scientist", 0.9), ("Web Developer", 0.4),
+    ]
+
+
+def test_resolve_jobs_skips_untitled_matches():
+    engine = ScoringEngine()
+    assert engine.resolve_jobs([{"title": "", "confidence_score": 0.9}, {"confidence_score": 0.5}], JOBS) == []
+    scores = engine.score(CANDIDATE, ANALYSIS, [{"title": " ", "confidence_score": 0.9}], JOBS)
+    assert scores["skills_match_score"] == 0.0
+
+
+class ScriptedScreener(ScreenerAgent):
+    """
+    ScreenerAgent answering LLM requests with a fixed response instead of a model.
+    """
+    def __init__(self, response, **kwargs):
+        super().__init__(mode="hybrid", **kwargs)
+        self.response = response
+        self.requests = 0
+
+    def ollama_request(self, prompt, options=None, format=None, system=None):
+        self.requests += 1
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+def test_hybrid_skips_llm_outside_borderline_band():
+    screener = ScriptedScreener("Qualification Alignment Score: 0.0", borderline=(0.0, 0.01))
+    computed = ScoringEngine().score(CANDIDATE, ANALYSIS, MATCHES, JOBS)
+    assert screener.process(ANALYSIS, MATCHES, CANDIDATE, JOBS) == computed
+    assert screener.requests == 0
+
+
+def test_hybrid_averages_returned_scores():
+    screener = ScriptedScreener(
+        "Qualification Alignment Score: 1.0\nExperience Relevance Score: 0.0\nSkills Match Score: 0.0",
+        borderline=(0.0, 1.0),
+    )
+    computed = ScoringEngine().score(CANDIDATE, ANALYSIS, MATCHES, JOBS)
+    blended = screener.process(ANALYSIS, MATCHES, CANDIDATE, JOBS)
+    assert screener.requests == 1
+    assert blended["qualification_alignment_score"] == round((computed["qualification_alignment_score"] + 1.0) / 2, 3)
+    assert blended["experience_relevance_score"] == round(computed["experience_relevance_score"] / 2, 3)
+    # Skills match is exact and never blended; red flags were not returned and are kept.
+    assert blended["skills_match_score"] == computed["skills_match_score"]
+    assert blended["potential_red_flags_score"] == computed["potential_red_flags_score"]
+
+
+@pytest.mark.parametrize("response", [None, "", "I cannot score this candidate.", RuntimeError("model crashed")])
+def test_hybrid_keeps_computed_scores_when_llm_fails(response):
+    screener = ScriptedScreener(response, borderline=(0.0, 1.0))
+    computed = ScoringEngine().score(CANDIDATE, ANALYSIS, MATCHES, JOBS)
+    assert screener.process(ANALYSIS, MATCHES, CANDIDATE, JOBS) == computed
+    assert screener.requests == 1
+
+
+def test_llm_mode_parses_scores_with_defaults():
+    screener = ScriptedScreener("Skills Match Score: 0.7\nPotential Red Flags Score: high")
+    screener.mode = "llm"
+    assert screener.process(ANALYSIS, MATCHES) == {
+        "qualification_alignment_score": 0.0,
+        "experience_relevance_score": 0.0,
+        "skills_match_score": 0.7,
+        "potential_red_flags_score": 0.0,
+    }